@@ -20,6 +20,7 @@ class Config:
     # File Uploads
     UPLOAD_FOLDER = os.getenv("UPLOAD_FOLDER", "./uploads")
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
+    UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(256 * 1024)))  # bytes read per upload chunk
     ALLOWED_EXTENSIONS = {"pdf", "docx", "doc"}
     
     # Embedding Model
@@ -28,6 +29,76 @@ class Config:
         "sentence-transformers/all-MiniLM-L6-v2"
     )
     
+    # Model registry: total bytes of model weights kept resident, 0 for no limit
+    MODEL_MEMORY_BUDGET_BYTES = int(os.getenv("MODEL_MEMORY_BUDGET_MB", "0")) * 1024 * 1024
+    
+    # Batch size for the gpt2 and qwen embedding backends
+    EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "16"))
+    
+    # Cross-request micro-batching of embedding inference
+    EMBEDDING_BATCH_MAX_SIZE = int(os.getenv("EMBEDDING_BATCH_MAX_SIZE", "32"))
+    EMBEDDING_BATCH_MAX_WAIT_MS = float(os.getenv("EMBEDDING_BATCH_MAX_WAIT_MS", "5"))
+    
+    # Embedding cache
+    EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "True").lower() == "true"
+    EMBEDDING_CACHE_MAX_BYTES = int(os.getenv("EMBEDDING_CACHE_MAX_MB", "256")) * 1024 * 1024
+    EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", "")  # empty disables the disk tier
+    
+    # Vector index for candidate retrieval
+    VECTOR_INDEX_TYPE = os.getenv("VECTOR_INDEX_TYPE", "flat")  # flat, ivf or hnsw
+    VECTOR_INDEX_NLIST = int(os.getenv("VECTOR_INDEX_NLIST", "100"))
+    VECTOR_INDEX_NPROBE = int(os.getenv("VECTOR_INDEX_NPROBE", "10"))
+    VECTOR_INDEX_HNSW_M = int(os.getenv("VECTOR_INDEX_HNSW_M", "32"))
+    VECTOR_INDEX_EF_SEARCH = int(os.getenv("VECTOR_INDEX_EF_SEARCH", "64"))
+    
+    # Staged matching: retrieve a shortlist, score it fully, explain the best few
+    MATCH_SHORTLIST_SIZE = int(os.getenv("MATCH_SHORTLIST_SIZE", "0"))  # 0 scores every resume
+    MATCH_EXPLAIN_TOP_K = int(os.getenv("MATCH_EXPLAIN_TOP_K", "10"))
+    MATCH_RETRIEVAL_MULTIPLIER = int(os.getenv("MATCH_RETRIEVAL_MULTIPLIER", "4"))
+    
+    # Background LLM explanation workers
+    EXPLANATION_WORKERS = int(os.getenv("EXPLANATION_WORKERS", "1"))
+    
+    # Batched LLM generation: rows per generate() call are capped by count and by
+    # rows * (longest prompt + new tokens)
+    GENERATION_MAX_BATCH_SIZE = int(os.getenv("GENERATION_MAX_BATCH_SIZE", "16"))
+    GENERATION_TOKEN_BUDGET = int(os.getenv("GENERATION_TOKEN_BUDGET", "8192"))
+    
+    # Reuse of prefilled attention states for the shared instruction preamble of LLM prompts
+    QWEN_PREFIX_CACHE_ENABLED = os.getenv("QWEN_PREFIX_CACHE_ENABLED", "True").lower() == "true"
+    QWEN_PREFIX_CACHE_MAX_BYTES = int(os.getenv("QWEN_PREFIX_CACHE_MAX_MB", "256")) * 1024 * 1024
+    
+    # Persistent cache of generated explanations; decoding is greedy while it is enabled
+    EXPLANATION_CACHE_ENABLED = os.getenv("EXPLANATION_CACHE_ENABLED", "True").lower() == "true"
+    EXPLANATION_CACHE_PATH = os.getenv("EXPLANATION_CACHE_PATH", "./cache/explanations.sqlite3")
+    EXPLANATION_CACHE_MAX_ENTRIES = int(os.getenv("EXPLANATION_CACHE_MAX_ENTRIES", "100000"))
+    EXPLANATION_CACHE_TTL = float(os.getenv("EXPLANATION_CACHE_TTL", str(30 * 24 * 3600)))  # seconds, 0 disables
+    
+    # Near-duplicate resume clustering (MinHash LSH over word shingles)
+    NEAR_DUPLICATE_ENABLED = os.getenv("NEAR_DUPLICATE_ENABLED", "True").lower() == "true"
+    NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.85"))  # estimated Jaccard
+    NEAR_DUPLICATE_NUM_PERM = int(os.getenv("NEAR_DUPLICATE_NUM_PERM", "128"))
+    NEAR_DUPLICATE_SHINGLE_SIZE = int(os.getenv("NEAR_DUPLICATE_SHINGLE_SIZE", "5"))  # words
+    
+    # Bulk resume ingestion
+    BULK_INGEST_WORKERS = int(os.getenv("BULK_INGEST_WORKERS", str(os.cpu_count() or 1)))
+    BULK_EMBEDDING_BATCH_SIZE = int(os.getenv("BULK_EMBEDDING_BATCH_SIZE", "64"))
+    # Files each worker analyzes together so spaCy parses them in one nlp.pipe run
+    BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "16"))
+    BULK_MAX_FILES = int(os.getenv("BULK_MAX_FILES", "1000"))
+    BULK_MAX_ARCHIVE_SIZE = int(os.getenv("BULK_MAX_ARCHIVE_MB", "256")) * 1024 * 1024
+    
+    # Skill taxonomy (empty path uses the bundled nlp/skill_taxonomy.json)
+    SKILL_TAXONOMY_PATH = os.getenv("SKILL_TAXONOMY_PATH", "")
+    SKILL_TAXONOMY_RELOAD_INTERVAL = float(os.getenv("SKILL_TAXONOMY_RELOAD_INTERVAL", "30"))  # seconds, 0 disables
+    # Minimum cosine similarity between skill embeddings for a skill to count as transferable
+    TRANSFERABLE_SKILL_THRESHOLD = float(os.getenv("TRANSFERABLE_SKILL_THRESHOLD", "0.75"))
+    
+    # spaCy processing
+    SPACY_DOC_CACHE_SIZE = int(os.getenv("SPACY_DOC_CACHE_SIZE", "512"))
+    SPACY_BATCH_SIZE = int(os.getenv("SPACY_BATCH_SIZE", "64"))
+    SPACY_N_PROCESS = int(os.getenv("SPACY_N_PROCESS", "1"))
+    
     # Similarity Threshold
     SIMILARITY_THRESHOLD = float(os.getenv("SIMILARITY_THRESHOLD", "0.5"))
     
@@ -1,21 +1,74 @@
 from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List
+from fastapi.responses import StreamingResponse
+from typing import List, Optional, Tuple
+import asyncio
+import json
+import logging
+import threading
 import uuid
-import os
 from datetime import datetime
-import shutil
 
 from models.resume import Resume, ResumeResponse
 from models.job import Job, JobRequest, JobResponse
 from models.candidate import CandidateResponse
 from services.parsing_service import ParsingService
 from services.matching_service import MatchingService
+from services.vector_index import VectorIndex
+from services.skill_matrix import SkillMatrix
+from services.embedding_batcher import EmbeddingBatcher
+from services.match_pipeline import MatchPipeline
+from services.explanation_worker import ExplanationWorker, EXPLANATION_PENDING, EXPLANATION_READY, EXPLANATION_FAILED
+from services.resume_analyzer import ResumeAnalyzer
+from services.bulk_ingestion import BulkIngestionService
+from services.dedup_index import DuplicateIndex, DUPLICATE_BYTES
+from services.near_duplicate_index import NearDuplicateIndex
+from services.model_registry import model_registry
 from config import config
 
+logger = logging.getLogger(__name__)
+
 # Initialize services
 parsing_service = ParsingService()
 matching_service = MatchingService(model_type="sentence_transformer")
+resume_index = VectorIndex(
+    index_type=config.VECTOR_INDEX_TYPE,
+    nlist=config.VECTOR_INDEX_NLIST,
+    nprobe=config.VECTOR_INDEX_NPROBE,
+    hnsw_m=config.VECTOR_INDEX_HNSW_M,
+    ef_search=config.VECTOR_INDEX_EF_SEARCH
+)
+skill_matrix = SkillMatrix()
+duplicate_index = DuplicateIndex()
+near_duplicate_index = NearDuplicateIndex(
+    threshold=config.NEAR_DUPLICATE_THRESHOLD,
+    num_perm=config.NEAR_DUPLICATE_NUM_PERM,
+    shingle_size=config.NEAR_DUPLICATE_SHINGLE_SIZE
+) if config.NEAR_DUPLICATE_ENABLED else None
+resume_analyzer = ResumeAnalyzer(
+    parsing_service,
+    matching_service.skill_extractor,
+    matching_service.profile_extractor,
+    matching_service.bonus_signals
+)
+bulk_ingestion = BulkIngestionService(
+    parsing_service,
+    max_workers=config.BULK_INGEST_WORKERS,
+    max_file_size=config.MAX_CONTENT_LENGTH,
+    max_files=config.BULK_MAX_FILES,
+    chunk_size=config.BULK_CHUNK_SIZE
+)
+explanation_worker = ExplanationWorker(
+    matching_service, num_workers=config.EXPLANATION_WORKERS, batch_size=config.GENERATION_MAX_BATCH_SIZE
+)
+match_pipeline = MatchPipeline(
+    matching_service, resume_index, skill_matrix, explanation_worker, near_duplicate_index
+)
+embedding_batcher = EmbeddingBatcher(
+    matching_service.embedding_service,
+    max_batch_size=config.EMBEDDING_BATCH_MAX_SIZE,
+    max_wait_ms=config.EMBEDDING_BATCH_MAX_WAIT_MS
+)
 
 # Store for demonstration purposes (in production, use a database)
 current_jobs = {}
@@ -33,12 +86,142 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+async def start_embedding_batcher():
+    await embedding_batcher.start()
+
+@app.on_event("startup")
+def build_skill_similarity_table():
+    # Built in the background; transferable skills use the string heuristic until it is ready
+    matching_service.skill_similarity.maybe_rebuild()
+
+@app.on_event("shutdown")
+async def stop_embedding_batcher():
+    await embedding_batcher.stop()
+
+@app.on_event("shutdown")
+def stop_explanation_worker():
+    explanation_worker.stop()
+
+@app.on_event("shutdown")
+def stop_bulk_ingestion():
+    bulk_ingestion.shutdown()
+
 @app.get("/")
 async def root():
     return {"message": "AI Resume Matcher API", "version": "1.0.0"}
 
+async def embed_resume(resume_id: str):
+    """
+    Compute and store the embedding of an uploaded resume
+    """
+    resume = current_resumes.get(resume_id)
+    if resume is None or resume.embedding is not None:
+        return
+    
+    embedding = await embedding_batcher.encode(resume.content)
+    # Index before publishing the vector so a stored embedding always implies an indexed resume
+    resume_index.add(resume_id, embedding)
+    resume.embedding = embedding
+
+async def embed_job(job_id: str):
+    """
+    Compute and store the embedding and compiled scoring profile of a job description
+    """
+    job = current_jobs.get(job_id)
+    if job is None or job.profile is not None:
+        return
+    
+    if job.embedding is None:
+        job.embedding = await embedding_batcher.encode(job.description)
+    
+    job.profile = matching_service.compile_job_profile(
+        job.description,
+        job.required_skills,
+        job.preferred_skills,
+        experience_required=job.experience_required,
+        job_embedding=job.embedding
+    )
+
+async def read_upload_limited(file: UploadFile, max_size: int) -> bytes:
+    """
+    Read an upload in chunks, failing once it grows past max_size instead of after buffering it all
+    """
+    chunks = []
+    total = 0
+    while True:
+        chunk = await file.read(config.UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        total += len(chunk)
+        if total > max_size:
+            raise HTTPException(
+                status_code=400,
+                detail=f"File size exceeds maximum allowed size ({max_size // (1024 * 1024)}MB)"
+            )
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+def store_resume(analysis: dict, byte_hash: str = None) -> Tuple[Resume, bool]:
+    """
+    Create and register a resume from a ResumeAnalyzer result. If the same file or text is
+    already stored, the upload is recorded as a duplicate and (existing resume, True) is returned.
+    """
+    resume_id = str(uuid.uuid4())
+    existing_id, matched_on = duplicate_index.register(resume_id, byte_hash, analysis["content_hash"])
+    if matched_on is not None and existing_id in current_resumes:
+        duplicate_index.record_duplicate(existing_id, analysis["filename"], matched_on)
+        return current_resumes[existing_id], True
+    
+    resume = Resume(
+        id=resume_id,
+        filename=analysis["filename"],
+        original_filename=analysis["filename"],
+        content=analysis["content"],
+        extracted_skills=analysis["extracted_skills"],
+        extracted_experience=analysis["extracted_experience"],
+        extracted_education=analysis["extracted_education"],
+        extracted_certifications=analysis["extracted_certifications"],
+        extracted_keywords=analysis["extracted_keywords"],
+        extracted_organizations=analysis["extracted_organizations"],
+        file_hash=byte_hash,
+        content_hash=analysis["content_hash"],
+        bonus_signal_mask=analysis["bonus_signal_mask"],
+        upload_date=datetime.utcnow()
+    )
+    
+    # Store resume (in production, save to database)
+    current_resumes[resume.id] = resume
+    skill_matrix.set_skills(resume.id, resume.extracted_skills)
+    if near_duplicate_index is not None:
+        near_duplicate_index.add(resume.id, signature=analysis["minhash_signature"])
+    return resume, False
+
+def find_duplicate_upload(byte_hash: str, filename: str) -> Optional[Resume]:
+    """
+    Get the stored resume for a byte-identical file, recording the upload as its duplicate
+    """
+    existing_id = duplicate_index.find_by_bytes(byte_hash)
+    if existing_id is None or existing_id not in current_resumes:
+        return None
+    duplicate_index.record_duplicate(existing_id, filename, DUPLICATE_BYTES)
+    return current_resumes[existing_id]
+
+async def embed_resumes(resumes: List[Resume]) -> None:
+    """
+    Compute and store the embeddings of many resumes in one batch
+    """
+    resumes = [resume for resume in resumes if resume.embedding is None]
+    if not resumes:
+        return
+    
+    embeddings = await embedding_batcher.encode_many([resume.content for resume in resumes])
+    resume_index.add_many([resume.id for resume in resumes], embeddings)
+    for resume, embedding in zip(resumes, embeddings):
+        resume.embedding = embedding
+
 @app.post("/upload-resume/")
-async def upload_resume(file: UploadFile = File(...)):
+async def upload_resume(background_tasks: BackgroundTasks, file: UploadFile = File(...)):
     """
     Upload a resume file (PDF or DOCX) and parse its content
     """
@@ -46,59 +229,155 @@ async def upload_resume(file: UploadFile = File(...)):
     if not parsing_service.validate_file_type(file.filename):
         raise HTTPException(status_code=400, detail="Invalid file type. Only PDF and DOCX files are allowed.")
     
-    # Validate file size
-    file_location = f"temp_{uuid.uuid4()}_{file.filename}"
-    try:
-        with open(file_location, "wb+") as file_object:
-            shutil.copyfileobj(file.file, file_object)
-        
-        if not parsing_service.is_file_size_valid(file_location):
-            raise HTTPException(status_code=400, detail="File size exceeds maximum allowed size (16MB)")
-        
-        # Parse the resume
-        parsed_data = parsing_service.parse_resume_from_bytes(
-            open(file_location, "rb").read(), file.filename
-        )
-        
-        # Extract skills using NLP
-        skills_data = matching_service.skill_extractor.extract_skills_from_text(parsed_data["content"])
-        all_skills = skills_data["technical_skills"] + skills_data["soft_skills"]
-        
-        # Generate resume ID
-        resume_id = str(uuid.uuid4())
-        
-        # Create resume object
-        resume = Resume(
-            id=resume_id,
-            filename=file_location,
-            original_filename=file.filename,
-            content=parsed_data["content"],
-            extracted_skills=all_skills,
-            upload_date=datetime.utcnow()
-        )
-        
-        # Store resume (in production, save to database)
-        current_resumes[resume_id] = resume
+    # Read the upload into memory, rejecting it as soon as it exceeds the size limit
+    file_bytes = await read_upload_limited(file, config.MAX_CONTENT_LENGTH)
+    
+    # A file seen before is not parsed or embedded again
+    byte_hash = duplicate_index.hash_bytes(file_bytes)
+    resume = find_duplicate_upload(byte_hash, file.filename)
+    duplicate = resume is not None
+    
+    if resume is None:
+        # Parse the resume straight from memory and analyze it
+        analysis = resume_analyzer.analyze(file_bytes, file.filename)
+        resume, duplicate = store_resume(analysis, byte_hash)
+    
+    if not duplicate:
+        # Embed once at ingest, off the request path
+        background_tasks.add_task(embed_resume, resume.id)
+    
+    # Create response
+    resume_response = ResumeResponse(
+        id=resume.id,
+        filename=resume.filename,
+        original_filename=resume.original_filename,
+        extracted_skills=resume.extracted_skills,
+        extracted_experience=resume.extracted_experience,
+        extracted_education=resume.extracted_education,
+        extracted_certifications=resume.extracted_certifications,
+        upload_date=resume.upload_date
+    )
+    
+    return {"success": True, "data": resume_response, "duplicate": duplicate}
+
+@app.post("/upload-resumes/bulk")
+async def upload_resumes_bulk(files: List[UploadFile] = File(...)):
+    """
+    Upload many resumes as PDF/DOCX files and/or ZIP archives of them. Files are parsed in a
+    process pool and embedded in batches; one JSON line per file is streamed back as it finishes.
+    """
+    # (filename, bytes) pairs to analyze, and per-file errors found while reading the upload
+    documents = []
+    rejected = []
+    for file in files:
+        # Files past the limit are rejected without being read, so memory stays bounded
+        if len(documents) >= config.BULK_MAX_FILES:
+            rejected.append({"filename": file.filename, "error": f"More than {config.BULK_MAX_FILES} files"})
+        elif file.filename.lower().endswith(".zip"):
+            archive_bytes = await read_upload_limited(file, config.BULK_MAX_ARCHIVE_SIZE)
+            try:
+                archive_documents, archive_errors = bulk_ingestion.expand_archive(
+                    archive_bytes, max_files=config.BULK_MAX_FILES - len(documents)
+                )
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=f"{file.filename}: {str(e)}")
+            documents.extend(archive_documents)
+            rejected.extend(archive_errors)
+        elif not parsing_service.validate_file_type(file.filename):
+            rejected.append({"filename": file.filename, "error": "Invalid file type"})
+        else:
+            try:
+                documents.append((file.filename, await read_upload_limited(file, config.MAX_CONTENT_LENGTH)))
+            except HTTPException as e:
+                rejected.append({"filename": file.filename, "error": e.detail})
+    
+    # Files are read before streaming starts, since uploads are closed once the handler returns
+    return StreamingResponse(stream_bulk_ingestion(documents, rejected), media_type="application/x-ndjson")
+
+def duplicate_line(filename: str, resume_id: str) -> str:
+    return json.dumps({"filename": filename, "success": True, "resume_id": resume_id, "duplicate": True}) + "\n"
+
+async def stream_bulk_ingestion(documents: List[tuple], rejected: List[dict]):
+    """
+    Analyze documents in the process pool and embed them in batches, yielding one JSON line
+    per file and a final summary line
+    """
+    succeeded = 0
+    duplicates = 0
+    failed = len(rejected)
+    for error in rejected:
+        yield json.dumps({"filename": error["filename"], "success": False, "error": error["error"]}) + "\n"
+    
+    # Known files are answered without parsing; repeats within this upload wait for the first copy
+    unique_documents = []
+    repeated = []
+    seen_hashes = set()
+    for filename, file_bytes in documents:
+        byte_hash = duplicate_index.hash_bytes(file_bytes)
+        existing = find_duplicate_upload(byte_hash, filename)
+        if existing is not None:
+            duplicates += 1
+            yield duplicate_line(filename, existing.id)
+        elif byte_hash in seen_hashes:
+            repeated.append((filename, byte_hash))
+        else:
+            seen_hashes.add(byte_hash)
+            unique_documents.append((filename, file_bytes, byte_hash))
+    
+    pending = []
+    
+    async def flush():
+        # Resumes are already stored; a failed batch leaves them to be embedded on demand at match time
+        try:
+            await embed_resumes(pending)
+            embedded = True
+        except Exception as e:
+            logger.error(f"Error embedding bulk batch: {str(e)}")
+            embedded = False
+        lines = [
+            json.dumps({"filename": resume.filename, "success": True, "resume_id": resume.id,
+                        "extracted_skills": resume.extracted_skills, "embedded": embedded,
+                        "duplicate": False}) + "\n"
+            for resume in pending
+        ]
+        pending.clear()
+        return lines
+    
+    async for analysis in bulk_ingestion.analyze_documents(unique_documents):
+        if "error" in analysis:
+            failed += 1
+            yield json.dumps({"filename": analysis["filename"], "success": False, "error": analysis["error"]}) + "\n"
+            continue
         
-        # Create response
-        resume_response = ResumeResponse(
-            id=resume.id,
-            filename=resume.filename,
-            original_filename=resume.original_filename,
-            extracted_skills=resume.extracted_skills,
-            extracted_experience=resume.extracted_experience,
-            extracted_education=resume.extracted_education,
-            upload_date=resume.upload_date
-        )
+        resume, duplicate = store_resume(analysis, analysis["byte_hash"])
+        if duplicate:
+            duplicates += 1
+            yield duplicate_line(analysis["filename"], resume.id)
+            continue
         
-        return {"success": True, "data": resume_response}
-    finally:
-        # Clean up temporary file
-        if os.path.exists(file_location):
-            os.remove(file_location)
+        succeeded += 1
+        pending.append(resume)
+        if len(pending) >= config.BULK_EMBEDDING_BATCH_SIZE:
+            for line in await flush():
+                yield line
+    
+    if pending:
+        for line in await flush():
+            yield line
+    
+    for filename, byte_hash in repeated:
+        existing = find_duplicate_upload(byte_hash, filename)
+        if existing is not None:
+            duplicates += 1
+            yield duplicate_line(filename, existing.id)
+        else:
+            failed += 1
+            yield json.dumps({"filename": filename, "success": False, "error": "Identical file in this upload failed"}) + "\n"
+    
+    yield json.dumps({"summary": {"succeeded": succeeded, "duplicates": duplicates, "failed": failed}}) + "\n"
 
 @app.post("/jobs/")
-async def create_job(job_request: JobRequest):
+async def create_job(job_request: JobRequest, background_tasks: BackgroundTasks):
     """
     Create a new job posting
     """
@@ -118,6 +397,9 @@ async def create_job(job_request: JobRequest):
     # Store job (in production, save to database)
     current_jobs[job_id] = job
     
+    # Embed once at ingest, off the request path
+    background_tasks.add_task(embed_job, job_id)
+    
     job_response = JobResponse(
         id=job.id,
         title=job.title,
@@ -154,9 +436,12 @@ async def get_job(job_id: str):
     return {"success": True, "data": job_response}
 
 @app.post("/match/{job_id}")
-async def match_candidates(job_id: str):
+async def match_candidates(job_id: str, shortlist_size: Optional[int] = None,
+                           explain_top_k: Optional[int] = None):
     """
-    Match all uploaded resumes to a specific job
+    Match uploaded resumes to a specific job. A cheap first stage keeps the
+    shortlist_size best resumes, only those are fully scored, and only the
+    explain_top_k best get an LLM explanation.
     """
     if job_id not in current_jobs:
         raise HTTPException(status_code=404, detail="Job not found")
@@ -164,17 +449,20 @@ async def match_candidates(job_id: str):
     job = current_jobs[job_id]
     matches = []
     
-    for resume_id, resume in current_resumes.items():
-        # Calculate match score
-        match_analysis = matching_service.calculate_match_score(
-            resume_content=resume.content,
-            job_description=job.description,
-            resume_skills=resume.extracted_skills,
-            job_required_skills=job.required_skills,
-            job_preferred_skills=job.preferred_skills,
-            resume_experience=resume.extracted_experience
-        )
-        
+    # Use stored vectors; only documents whose background embedding has not finished are encoded here
+    await asyncio.gather(
+        embed_job(job_id),
+        *(embed_resume(resume_id) for resume_id in list(current_resumes.keys()))
+    )
+    
+    scored, stages = match_pipeline.run(
+        job,
+        dict(current_resumes),
+        shortlist_size=shortlist_size if shortlist_size is not None else config.MATCH_SHORTLIST_SIZE,
+        explain_top_k=explain_top_k if explain_top_k is not None else config.MATCH_EXPLAIN_TOP_K
+    )
+    
+    for resume_id, match_analysis in scored:
         # Create candidate record
         candidate_id = str(uuid.uuid4())
         candidate = {
@@ -189,10 +477,7 @@ async def match_candidates(job_id: str):
         current_matches[candidate_id] = candidate
         matches.append(candidate)
     
-    # Sort matches by overall score
-    matches.sort(key=lambda x: x["match_analysis"].match_score.overall_score, reverse=True)
-    
-    # Prepare response
+    # Prepare response (the pipeline returns matches sorted by overall score)
     match_responses = []
     for match in matches:
         match_response = {
@@ -204,7 +489,7 @@ async def match_candidates(job_id: str):
         }
         match_responses.append(match_response)
     
-    return {"success": True, "data": match_responses}
+    return {"success": True, "data": match_responses, "stages": stages}
 
 @app.get("/matches/{job_id}")
 async def get_matches(job_id: str):
@@ -224,6 +509,183 @@ async def get_matches(job_id: str):
     
     return {"success": True, "data": matches_for_job}
 
+def get_candidate_or_404(job_id: str, candidate_id: str) -> dict:
+    """
+    Look up a stored match for a job
+    """
+    candidate = current_matches.get(candidate_id)
+    if candidate is None or candidate["job_id"] != job_id:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    return candidate
+
+@app.get("/matches/{job_id}/candidates/{candidate_id}/explanation")
+async def get_explanation(job_id: str, candidate_id: str):
+    """
+    Get (or poll) the explanation of a match
+    """
+    candidate = get_candidate_or_404(job_id, candidate_id)
+    match_analysis = candidate["match_analysis"]
+    
+    return {
+        "success": True,
+        "data": {
+            "candidate_id": candidate_id,
+            "status": match_analysis.explanation_status,
+            "explanation": match_analysis.explanation
+        }
+    }
+
+@app.post("/matches/{job_id}/candidates/{candidate_id}/explanation")
+async def request_explanation(job_id: str, candidate_id: str):
+    """
+    Queue an LLM explanation for a match that was not among the explained top candidates
+    """
+    candidate = get_candidate_or_404(job_id, candidate_id)
+    match_analysis = candidate["match_analysis"]
+    
+    resume = current_resumes.get(candidate["resume_id"])
+    job = current_jobs.get(job_id)
+    if resume is None or job is None:
+        raise HTTPException(status_code=404, detail="Resume or job no longer available")
+    
+    # Pending explanations are already queued and ready ones are returned as they are;
+    # only matches without an LLM explanation, or whose generation failed, are queued
+    if match_analysis.explanation_status not in (EXPLANATION_PENDING, EXPLANATION_READY):
+        explanation_worker.submit(match_analysis, resume.content, job.description)
+    
+    data = {
+        "candidate_id": candidate_id,
+        "status": match_analysis.explanation_status
+    }
+    if match_analysis.explanation_status == EXPLANATION_READY:
+        data["explanation"] = match_analysis.explanation
+    
+    return {"success": True, "data": data}
+
+@app.get("/matches/{job_id}/candidates/{candidate_id}/explanation/stream")
+async def stream_explanation(job_id: str, candidate_id: str):
+    """
+    Stream an LLM explanation of a match as Server-Sent Events: "token" events while text
+    is generated, then a "done" event with the final explanation
+    """
+    candidate = get_candidate_or_404(job_id, candidate_id)
+    match_analysis = candidate["match_analysis"]
+    
+    resume = current_resumes.get(candidate["resume_id"])
+    job = current_jobs.get(job_id)
+    if resume is None or job is None:
+        raise HTTPException(status_code=404, detail="Resume or job no longer available")
+    
+    return StreamingResponse(
+        stream_explanation_events(match_analysis, resume.content, job.description),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def stream_explanation_events(match_analysis, resume_content: str, job_description: str):
+    """
+    Bridge the blocking sentence stream of the generation thread to an asyncio SSE stream
+    """
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+    # Set when the client goes away, so generation stops instead of running to completion
+    stop = threading.Event()
+    
+    def produce():
+        try:
+            for event in matching_service.qwen_service.stream_match_explanation(
+                resume_content, job_description, match_analysis.match_score.overall_score, cancel=stop
+            ):
+                if stop.is_set():
+                    break
+                loop.call_soon_threadsafe(events.put_nowait, event)
+        finally:
+            loop.call_soon_threadsafe(events.put_nowait, None)
+    
+    producer = loop.run_in_executor(None, produce)
+    try:
+        while True:
+            event = await events.get()
+            if event is None:
+                break
+            if event["event"] == "done":
+                match_analysis.explanation = event["explanation"]
+                match_analysis.explanation_status = EXPLANATION_READY
+                yield f"event: done\ndata: {json.dumps({'explanation': event['explanation']})}\n\n"
+            elif event["event"] == "error":
+                # The rule-based explanation set at scoring time stays in place
+                match_analysis.explanation_status = EXPLANATION_FAILED
+                yield f"event: error\ndata: {json.dumps({'error': 'Explanation generation failed'})}\n\n"
+            else:
+                yield f"event: token\ndata: {json.dumps({'text': event['text']})}\n\n"
+    finally:
+        # On disconnect the generation thread stops at its next token once stop is set;
+        # waiting for it keeps the executor thread from outliving the response
+        stop.set()
+        try:
+            await producer
+        except Exception as e:
+            logger.error(f"Error streaming explanation: {str(e)}")
+
+@app.get("/resumes/{resume_id}/duplicates")
+async def get_resume_duplicates(resume_id: str):
+    """
+    Get the uploads that were recognised as copies of a resume
+    """
+    if resume_id not in current_resumes:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    
+    return {"success": True, "data": duplicate_index.duplicates_of(resume_id)}
+
+@app.get("/stats/duplicates")
+async def get_duplicate_stats():
+    """
+    Get exact and near-duplicate statistics
+    """
+    stats = {
+        "exact": duplicate_index.stats(),
+        "near": near_duplicate_index.stats() if near_duplicate_index is not None else {"enabled": False}
+    }
+    
+    return {"success": True, "data": stats}
+
+@app.get("/stats/embeddings")
+async def get_embedding_stats():
+    """
+    Get embedding cache and batching statistics
+    """
+    cache = matching_service.embedding_service.cache
+    stats = {
+        "cache": cache.stats() if cache is not None else {"enabled": False},
+        "batcher": embedding_batcher.stats()
+    }
+    
+    return {"success": True, "data": stats}
+
+@app.get("/stats/explanations")
+async def get_explanation_stats():
+    """
+    Get background explanation queue and prompt prefix cache statistics
+    """
+    # Read the service without creating it; caches only exist once an explanation was requested
+    qwen_service = matching_service._qwen_service
+    prefix_cache = qwen_service.prefix_cache if qwen_service is not None else None
+    explanation_cache = qwen_service.explanation_cache if qwen_service is not None else None
+    stats = {
+        **explanation_worker.stats(),
+        "prefix_cache": prefix_cache.stats() if prefix_cache is not None else {"enabled": False},
+        "cache": explanation_cache.stats() if explanation_cache is not None else {"enabled": False}
+    }
+    
+    return {"success": True, "data": stats}
+
+@app.get("/stats/models")
+async def get_model_stats():
+    """
+    Get resident memory, reference counts and load counts of shared models
+    """
+    return {"success": True, "data": model_registry.report()}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -22,6 +22,8 @@ class MatchAnalysis(BaseModel):
     experience_summary: str
     role_recommendation: str
     explanation: str
+    explanation_status: str = "ready"  # pending, ready or failed
+    near_duplicate_of: Optional[str] = None  # resume whose scoring and explanation this reuses
     
     class Config:
         from_attributes = True
@@ -1,6 +1,24 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Optional, Set
 from datetime import datetime
+import numpy as np
+
+class JobProfile(BaseModel):
+    # Everything the scorers need from a job, computed once per job and reused for every resume
+    normalized_description: str
+    required_skills: List[str] = []  # lowercased, in job order
+    preferred_skills: List[str] = []
+    required_skill_set: Set[str] = set()
+    preferred_skill_set: Set[str] = set()
+    certification_keywords: Set[str] = set()  # certification keywords mentioned in the job
+    certification_mask: int = 0  # the same keywords as a BonusSignalEngine bitmask
+    experience_years: Optional[float] = None  # parsed from experience_required
+    embedding: Optional[np.ndarray] = None
+    
+    class Config:
+        from_attributes = True
+        arbitrary_types_allowed = True
+
 
 class Job(BaseModel):
     id: Optional[str] = None
@@ -10,11 +28,13 @@ class Job(BaseModel):
     preferred_skills: List[str] = []
     experience_required: str  # e.g., "3+ years", "Entry level"
     role_responsibilities: List[str] = []
-    embedding: Optional[List[float]] = None
+    embedding: Optional[np.ndarray] = None  # float32 vector computed at ingest
+    profile: Optional[JobProfile] = None  # compiled once the embedding is available
     created_at: Optional[datetime] = None
     
     class Config:
         from_attributes = True
+        arbitrary_types_allowed = True
 
 
 class JobRequest(BaseModel):
@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
+import numpy as np
 
 class Resume(BaseModel):
     id: Optional[str] = None
@@ -11,11 +12,17 @@ class Resume(BaseModel):
     extracted_experience: List[dict] = []  # List of jobs with company, role, duration
     extracted_education: List[dict] = []   # List of education entries
     extracted_certifications: List[str] = []
-    embedding: Optional[List[float]] = None
+    extracted_keywords: List[str] = []  # spaCy noun/adjective keywords
+    extracted_organizations: List[str] = []  # spaCy ORG/NORP entities
+    embedding: Optional[np.ndarray] = None  # float32 vector computed at ingest
+    file_hash: Optional[str] = None  # SHA-256 of the uploaded bytes
+    content_hash: Optional[str] = None  # SHA-256 of the normalized parsed text
+    bonus_signal_mask: Optional[int] = None  # BonusSignalEngine keyword bitmask computed at ingest
     upload_date: Optional[datetime] = None
     
     class Config:
         from_attributes = True
+        arbitrary_types_allowed = True
 
 
 class ResumeResponse(BaseModel):
@@ -25,6 +32,7 @@ class ResumeResponse(BaseModel):
     extracted_skills: List[str]
     extracted_experience: List[dict]
     extracted_education: List[dict]
+    extracted_certifications: List[str] = []
     upload_date: datetime
     
     class Config:
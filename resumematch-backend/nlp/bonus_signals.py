@@ -0,0 +1,55 @@
+from typing import Dict, Iterable, List
+from nlp.keyword_automaton import KeywordAutomaton
+
+# Keyword groups behind the bonus signals; matched as lowercase substrings
+CERTIFICATION_KEYWORDS = ['certified', 'certification', 'certificate', 'aws', 'azure', 'gcp', 'ccna', 'pmp', 'scrum', 'saas']
+COMPANY_EXPERIENCE_KEYWORDS = ['experience']
+COMPANY_INDICATOR_KEYWORDS = ['previous company', 'worked at']
+ADVANCED_EDUCATION_KEYWORDS = ['master', 'phd', 'doctorate', 'mba', 'advanced degree']
+LEADERSHIP_KEYWORDS = ['lead', 'managed', 'manager', 'supervisor', 'director', 'head of', 'team lead', 'senior']
+ACHIEVEMENT_KEYWORDS = ['achieved', 'improved', 'increased', 'reduced', 'saved', 'generated', 'awarded', 'recognized']
+
+class BonusSignalEngine:
+    def __init__(self):
+        # One bit per distinct keyword, so job-specific subsets (certifications) are masks too
+        self.keyword_bits: Dict[str, int] = {}
+        for keywords in (CERTIFICATION_KEYWORDS, COMPANY_EXPERIENCE_KEYWORDS, COMPANY_INDICATOR_KEYWORDS,
+                         ADVANCED_EDUCATION_KEYWORDS, LEADERSHIP_KEYWORDS, ACHIEVEMENT_KEYWORDS):
+            for keyword in keywords:
+                self.keyword_bits.setdefault(keyword, 1 << len(self.keyword_bits))
+
+        self.certification_mask = self.mask_of(CERTIFICATION_KEYWORDS)
+        self.company_experience_mask = self.mask_of(COMPANY_EXPERIENCE_KEYWORDS)
+        self.company_indicator_mask = self.mask_of(COMPANY_INDICATOR_KEYWORDS)
+        self.advanced_education_mask = self.mask_of(ADVANCED_EDUCATION_KEYWORDS)
+        self.leadership_mask = self.mask_of(LEADERSHIP_KEYWORDS)
+        self.achievement_mask = self.mask_of(ACHIEVEMENT_KEYWORDS)
+
+        self.automaton = KeywordAutomaton(self.keyword_bits)
+
+    def mask_of(self, keywords: Iterable[str]) -> int:
+        """
+        Get the bitmask of a set of known keywords
+        """
+        mask = 0
+        for keyword in keywords:
+            mask |= self.keyword_bits[keyword]
+        return mask
+
+    def keywords_in(self, mask: int) -> List[str]:
+        """
+        Get the keywords whose bits are set in a mask
+        """
+        return [keyword for keyword, bit in self.keyword_bits.items() if mask & bit]
+
+    def scan(self, text: str) -> int:
+        """
+        Lowercase the text once and get the bitmask of every signal keyword it contains
+        """
+        return self.automaton.scan(text.lower())
+
+    def job_certification_mask(self, normalized_description: str) -> int:
+        """
+        Get the mask of certification keywords a (lowercased) job description mentions
+        """
+        return self.automaton.scan(normalized_description) & self.certification_mask
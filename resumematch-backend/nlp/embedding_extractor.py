@@ -1,5 +1,6 @@
 from typing import List, Dict, Any
 from services.embedding_service import EmbeddingService
+from services.similarity_engine import SimilarityEngine
 import logging
 
 logger = logging.getLogger(__name__)
@@ -49,26 +50,39 @@ class EmbeddingExtractor:
             logger.error(f"Error computing similarity: {str(e)}")
             raise
     
-    def rank_candidates(self, query_embedding: List[float], 
-                       candidate_embeddings: List[List[float]]) -> List[Dict[str, Any]]:
+    def rank_candidates(self, query_embedding: List[float], engine: SimilarityEngine,
+                       top_k: int = None) -> List[Dict[str, Any]]:
         """
-        Rank candidates based on similarity to query
+        Rank candidates based on similarity to query. The engine is kept by the caller and
+        updated as candidates arrive, so candidates are not converted or normalized per call.
         """
         try:
-            similarities = self.embedding_service.calculate_similarity_matrix(
-                query_embedding, candidate_embeddings
-            )
-            
-            # Create ranked results
-            ranked_results = [
-                {"index": i, "similarity": sim} 
-                for i, sim in enumerate(similarities)
+            # Create ranked results, sorted by similarity in descending order
+            return [
+                {"candidate_id": candidate_id, "similarity": similarity}
+                for candidate_id, similarity in engine.top_k(query_embedding, top_k)
             ]
+        except Exception as e:
+            logger.error(f"Error ranking candidates: {str(e)}")
+            raise
+    
+    def rank_candidates_for_queries(self, query_embeddings: List[List[float]], engine: SimilarityEngine,
+                                    top_k: int = None) -> List[List[Dict[str, Any]]]:
+        """
+        Rank the engine's candidates for several queries at once, scoring all pairs in one matrix product
+        """
+        try:
+            scores = engine.score_many(query_embeddings)
+            candidate_ids = engine.candidate_ids
             
-            # Sort by similarity in descending order
-            ranked_results.sort(key=lambda x: x["similarity"], reverse=True)
-            
-            return ranked_results
+            rankings = []
+            for query_scores in scores:
+                order = SimilarityEngine.top_indices(query_scores, top_k)
+                rankings.append([
+                    {"candidate_id": candidate_ids[index], "similarity": float(query_scores[index])}
+                    for index in order
+                ])
+            return rankings
         except Exception as e:
             logger.error(f"Error ranking candidates: {str(e)}")
             raise
\ No newline at end of file
@@ -0,0 +1,60 @@
+from collections import deque
+from typing import Dict, List
+
+class KeywordAutomaton:
+    # Aho-Corasick automaton over characters: finds every keyword as a substring in one pass,
+    # the same as running `keyword in text` for each keyword
+    def __init__(self, keywords: Dict[str, int]):
+        # Per node: character -> next node, failure link, and OR of the bits of keywords ending here
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[int] = [0]
+
+        for keyword, bits in keywords.items():
+            if keyword:
+                self._add(keyword, bits)
+        self._build_failure_links()
+
+    def _add(self, keyword: str, bits: int) -> None:
+        node = 0
+        for char in keyword:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(0)
+                self._goto[node][char] = next_node
+            node = next_node
+        self._output[node] |= bits
+
+    def _build_failure_links(self) -> None:
+        """
+        Breadth-first pass that links each node to its longest proper suffix in the trie and
+        folds the suffix's output into it, so a scan never has to walk output chains
+        """
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                suffix = self._goto[fallback].get(char, 0)
+                self._fail[child] = suffix if suffix != child else 0
+                self._output[child] |= self._output[self._fail[child]]
+
+    def scan(self, text: str) -> int:
+        """
+        Get the OR of the bits of every keyword occurring in the text
+        """
+        goto, fail, output = self._goto, self._fail, self._output
+        node = 0
+        found = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            found |= output[node]
+        return found
@@ -0,0 +1,60 @@
+from typing import Set
+import hashlib
+import numpy as np
+from nlp.skill_matcher import normalize_skill_text
+
+# Mersenne prime modulus of the universal hash family
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+class MinHasher:
+    def __init__(self, num_perm: int = 128, shingle_size: int = 5, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        # Fixed seed: signatures from different processes (bulk ingestion workers) must be comparable
+        generator = np.random.RandomState(seed)
+        self._a = generator.randint(1, (1 << 61) - 1, size=num_perm, dtype=np.uint64)
+        self._b = generator.randint(0, (1 << 61) - 1, size=num_perm, dtype=np.uint64)
+
+    def shingles(self, text: str) -> Set[bytes]:
+        """
+        Get the word n-grams of the normalized text, so layout and punctuation changes do not matter
+        """
+        tokens = normalize_skill_text(text).split()
+        if len(tokens) <= self.shingle_size:
+            return {' '.join(tokens).encode("utf-8")} if tokens else set()
+        return {
+            ' '.join(tokens[i:i + self.shingle_size]).encode("utf-8")
+            for i in range(len(tokens) - self.shingle_size + 1)
+        }
+
+    def signature(self, text: str) -> np.ndarray:
+        """
+        Compute the MinHash signature of a text: for each permutation, the minimum hash over its shingles
+        """
+        shingles = self.shingles(text)
+        if not shingles:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+
+        hashes = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(shingle, digest_size=4).digest(), "little") for shingle in shingles),
+            dtype=np.uint64, count=len(shingles)
+        )
+        # (a * h + b) mod p, truncated to 32 bits, for every shingle and permutation at once
+        with np.errstate(over="ignore"):
+            permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0)
+
+    @staticmethod
+    def is_empty(signature: np.ndarray) -> bool:
+        """
+        Check whether a signature is that of a text without shingles
+        """
+        return bool(np.all(signature == _MAX_HASH))
+
+    @staticmethod
+    def jaccard(signature1: np.ndarray, signature2: np.ndarray) -> float:
+        """
+        Estimate the Jaccard similarity of two texts from their signatures
+        """
+        return float(np.mean(signature1 == signature2))
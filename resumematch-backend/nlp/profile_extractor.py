@@ -0,0 +1,226 @@
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# Heading text (lowercase, without trailing colon) -> section name
+SECTION_HEADINGS = {
+    "experience": ["experience", "work experience", "professional experience", "relevant experience",
+                   "employment", "employment history", "work history", "career history"],
+    "education": ["education", "academic background", "academic qualifications", "education and training",
+                  "qualifications"],
+    "certifications": ["certifications", "certification", "certificates", "professional certifications",
+                       "licenses and certifications", "licenses & certifications", "licences & certifications"],
+    "skills": ["skills", "technical skills", "key skills", "core competencies"],
+    "projects": ["projects", "personal projects", "selected projects"],
+    "summary": ["summary", "professional summary", "profile", "objective", "about me"],
+    "other": ["awards", "honors", "publications", "languages", "interests", "volunteer experience",
+              "volunteering", "references"],
+}
+HEADING_LOOKUP = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+# Headings are short; longer lines are never looked up
+MAX_HEADING_LENGTH = 40
+
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+_MONTH = r'(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?'
+
+def _date(name: str) -> str:
+    return (rf'(?:(?P<{name}_month>{_MONTH})\s+|(?P<{name}_month_number>\d{{1,2}})\s*/\s*)?'
+            rf'(?P<{name}_year>(?:19|20)\d{{2}})')
+
+# Precompiled field patterns
+DATE_RANGE_PATTERN = re.compile(
+    _date("start") + r'\s*(?:-|–|—|to)\s*(?:' + _date("end") + r'|(?P<present>present|current|now|today))',
+    re.IGNORECASE
+)
+YEARS_DURATION_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*(?:years?|yrs?)', re.IGNORECASE)
+MONTHS_DURATION_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*(?:months?|mos?)\b', re.IGNORECASE)
+BULLET_PATTERN = re.compile(r'^\s*[-*•·▪◦‣]\s*')
+HEADING_CLEANUP_PATTERN = re.compile(r'[#:=_*]+')
+ROLE_COMPANY_SEPARATOR_PATTERN = re.compile(r'\s+(?:at|@)\s+|\s*[|•·,]\s*|\s+[-–—]\s+', re.IGNORECASE)
+DEGREE_PATTERN = re.compile(
+    r"\b(?P<degree>ph\.?\s?d|doctorate|mba|m\.?\s?sc|b\.?\s?sc|m\.?\s?eng|b\.?\s?eng|b\.?\s?tech|m\.?\s?tech|"
+    r"master(?:'?s)?|bachelor(?:'?s)?|associate(?:'?s)? degree|b\.a|m\.a|b\.s|m\.s)\b\.?"
+    r"(?:\s+of\s+(?:science|arts|engineering|technology|philosophy|business administration))?",
+    re.IGNORECASE
+)
+DEGREE_FIELD_PATTERN = re.compile(r'\b(?:in|of)\s+(?P<field>[A-Za-z&][A-Za-z&\s]{1,60}?)(?=\s*(?:[,|(\-–—]|\bat\b|\bfrom\b|$))')
+INSTITUTION_PATTERN = re.compile(
+    r"(?P<institution>[A-Z][\w.'&\s]*?(?:University|College|Institute|School|Academy)(?:\s+of\s+[A-Z][\w.'&\s]*?)?)(?=\s*(?:[,|(\-–—]|\d|$))"
+)
+YEAR_PATTERN = re.compile(r'\b(?:19|20)\d{2}\b')
+CERTIFICATION_LINE_PATTERN = re.compile(r'\bcertifi(?:ed|cation|cate)\b', re.IGNORECASE)
+
+# Degree spellings -> canonical degree level
+DEGREE_LEVELS = [
+    (re.compile(r'ph\.?\s?d|doctorate', re.IGNORECASE), "PhD"),
+    (re.compile(r'mba', re.IGNORECASE), "MBA"),
+    (re.compile(r'master|m\.?\s?sc|m\.?\s?eng|m\.?\s?tech|m\.a|m\.s', re.IGNORECASE), "Master"),
+    (re.compile(r'bachelor|b\.?\s?sc|b\.?\s?eng|b\.?\s?tech|b\.a|b\.s', re.IGNORECASE), "Bachelor"),
+    (re.compile(r'associate', re.IGNORECASE), "Associate"),
+]
+
+def parse_duration_years(duration: str, today: datetime = None) -> float:
+    """
+    Parse a duration such as "2 years 6 months", "18 months" or "Jan 2019 - Present" into years
+    """
+    if not duration:
+        return 0.0
+
+    date_range = DATE_RANGE_PATTERN.search(duration)
+    if date_range:
+        return _date_range_years(date_range, today or datetime.utcnow())
+
+    years = YEARS_DURATION_PATTERN.search(duration)
+    months = MONTHS_DURATION_PATTERN.search(duration)
+    total = 0.0
+    if years:
+        total += float(years.group(1))
+    if months:
+        total += float(months.group(1)) / 12.0  # Convert months to years
+    return total
+
+def _month_of(match: re.Match, name: str, default: int) -> int:
+    month = match.group(f"{name}_month")
+    if month:
+        return MONTHS[month[:3].lower()]
+    number = match.group(f"{name}_month_number")
+    if number and 1 <= int(number) <= 12:
+        return int(number)
+    return default
+
+def _date_range_years(match: re.Match, today: datetime) -> float:
+    start = int(match.group("start_year")) * 12 + _month_of(match, "start", 1)
+    if match.group("present"):
+        end = today.year * 12 + today.month
+    else:
+        end = int(match.group("end_year")) * 12 + _month_of(match, "end", 1)
+    return max(end - start, 0) / 12.0
+
+class ProfileExtractor:
+    def extract(self, text: str, today: datetime = None) -> Dict[str, Any]:
+        """
+        Extract experience, education and certifications from resume text in one pass over its lines
+        """
+        try:
+            sections = self.segment(text)
+            today = today or datetime.utcnow()
+
+            education_lines = sections.get("education") or sections.get("_preamble", [])
+            certification_lines = sections.get("certifications")
+
+            return {
+                "experience": self._extract_experience(sections.get("experience", []), today),
+                "education": self._extract_education(education_lines),
+                "certifications": (self._extract_certifications(certification_lines) if certification_lines
+                                   else self._find_certification_lines(text)),
+            }
+        except Exception as e:
+            logger.error(f"Error extracting resume profile: {str(e)}")
+            return {"experience": [], "education": [], "certifications": []}
+
+    def segment(self, text: str) -> Dict[str, List[str]]:
+        """
+        Split resume text into sections by their headings. Non-empty lines before the first
+        heading go to "_preamble"; repeated sections are concatenated.
+        """
+        sections: Dict[str, List[str]] = {}
+        current = "_preamble"
+        for line in text.splitlines():
+            stripped = line.strip()
+            if not stripped:
+                continue
+            section = self._heading_of(stripped)
+            if section:
+                current = section
+                sections.setdefault(current, [])
+                continue
+            sections.setdefault(current, []).append(stripped)
+        return sections
+
+    def _heading_of(self, line: str) -> Optional[str]:
+        if len(line) > MAX_HEADING_LENGTH:
+            return None
+        key = ' '.join(HEADING_CLEANUP_PATTERN.sub(' ', line).lower().split())
+        return HEADING_LOOKUP.get(key)
+
+    def _extract_experience(self, lines: List[str], today: datetime) -> List[Dict[str, Any]]:
+        """
+        Turn an experience section into entries, starting a new entry at each date range.
+        The role and company come from the date line and, when that is not enough, the line before it.
+        """
+        entries = []
+        previous_header = None
+        for line in lines:
+            is_bullet = bool(BULLET_PATTERN.match(line))
+            date_range = None if is_bullet else DATE_RANGE_PATTERN.search(line)
+            if not date_range:
+                # A non-bullet line without dates may be the "Role at Company" line of the next entry
+                previous_header = None if is_bullet else line
+                continue
+
+            header = (line[:date_range.start()] + ' ' + line[date_range.end():]).strip(' ,|-–—()')
+            role, company = self._split_role_company(header)
+            if previous_header and not company:
+                previous_role, previous_company = self._split_role_company(previous_header)
+                if previous_company:
+                    # "Role at Company" line followed by a date line
+                    role, company = previous_role, previous_company
+                else:
+                    # Role line followed by "Company, dates" (or by the dates alone)
+                    role, company = previous_role, role
+
+            entries.append({
+                "role": role,
+                "company": company,
+                "duration": date_range.group(0),
+                "years": round(_date_range_years(date_range, today), 2),
+            })
+            previous_header = None
+        return entries
+
+    def _split_role_company(self, header: str) -> Tuple[str, str]:
+        parts = [part.strip() for part in ROLE_COMPANY_SEPARATOR_PATTERN.split(header) if part and part.strip()]
+        if not parts:
+            return "", ""
+        return parts[0], parts[1] if len(parts) > 1 else ""
+
+    def _extract_education(self, lines: List[str]) -> List[Dict[str, Any]]:
+        """
+        Get the degree, field, institution and year from each line that names a degree
+        """
+        education = []
+        for line in lines:
+            degree_match = DEGREE_PATTERN.search(line)
+            if not degree_match:
+                continue
+
+            level = next((name for pattern, name in DEGREE_LEVELS if pattern.match(degree_match.group("degree"))), None)
+            field = DEGREE_FIELD_PATTERN.search(line, degree_match.end())
+            institution = INSTITUTION_PATTERN.search(line)
+            years = YEAR_PATTERN.findall(line)
+            education.append({
+                "degree": level or degree_match.group("degree"),
+                "field": field.group("field").strip() if field else "",
+                "institution": institution.group("institution").strip() if institution else "",
+                "year": int(years[-1]) if years else None,
+            })
+        return education
+
+    def _extract_certifications(self, lines: List[str]) -> List[str]:
+        return [BULLET_PATTERN.sub('', line).strip() for line in lines if BULLET_PATTERN.sub('', line).strip()]
+
+    def _find_certification_lines(self, text: str) -> List[str]:
+        """
+        Fallback when there is no certifications section: lines that mention a certification
+        """
+        certifications = []
+        for line in text.splitlines():
+            if CERTIFICATION_LINE_PATTERN.search(line):
+                certifications.append(BULLET_PATTERN.sub('', line).strip()[:120])
+        return certifications
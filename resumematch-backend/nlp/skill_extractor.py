@@ -3,11 +3,15 @@ from typing import List, Dict, Set
 import spacy
 from collections import Counter
 import logging
+from nlp.skill_matcher import normalize_skill_text
+from nlp.skill_taxonomy import SkillTaxonomy
+from nlp.spacy_pipeline import SpacyPipeline
+from config import config
 
 logger = logging.getLogger(__name__)
 
 class SkillExtractor:
-    def __init__(self):
+    def __init__(self, taxonomy: SkillTaxonomy = None):
         # Load spaCy model
         try:
             self.nlp = spacy.load("en_core_web_sm")
@@ -15,39 +19,27 @@ class SkillExtractor:
             logger.warning("spaCy model 'en_core_web_sm' not found. Please install it with: python -m spacy download en_core_web_sm")
             self.nlp = None
         
-        # Define common technical skills
-        self.technical_skills = {
-            # Programming languages
-            "python", "java", "javascript", "typescript", "c++", "c#", "ruby", "php", "go", "rust", "scala",
-            "swift", "kotlin", "dart", "r", "matlab", "perl", "sql", "html", "css", "sass", "less",
-            
-            # Frameworks and Libraries
-            "react", "angular", "vue", "node.js", "express", "django", "flask", "spring", "spring boot",
-            "laravel", "rails", "tensorflow", "pytorch", "keras", "pandas", "numpy", "scikit-learn",
-            "bootstrap", "jquery", "redux", "graphql", "rest", "soap",
-            
-            # Databases
-            "mysql", "postgresql", "mongodb", "redis", "oracle", "sqlite", "mssql", "cassandra", "elasticsearch",
-            
-            # Cloud Platforms
-            "aws", "azure", "google cloud", "gcp", "docker", "kubernetes", "terraform", "jenkins", "git", "github",
-            "gitlab", "bitbucket", "ci/cd", "devops",
-            
-            # Other Technical Skills
-            "linux", "unix", "bash", "powershell", "agile", "scrum", "kanban", "jira", "salesforce", "sap",
-            "adobe", "figma", "sketch", "invision", "illustrator", "photoshop", "excel", "tableau", "power bi",
-            "hadoop", "spark", "hive", "pig", "kafka", "airflow",
-        }
+        # Parses each document once and caches the Doc, running only the components callers need
+        self.spacy_pipeline = SpacyPipeline(
+            self.nlp,
+            cache_size=config.SPACY_DOC_CACHE_SIZE,
+            batch_size=config.SPACY_BATCH_SIZE,
+            n_process=config.SPACY_N_PROCESS
+        ) if self.nlp else None
         
-        # Define soft skills
-        self.soft_skills = {
-            "communication", "leadership", "teamwork", "problem-solving", "adaptability", "creativity",
-            "critical thinking", "time management", "decision making", "negotiation", "conflict resolution",
-            "emotional intelligence", "interpersonal skills", "collaboration", "attention to detail",
-            "organizational skills", "analytical thinking", "customer service", "presentation skills",
-            "project management", "strategic thinking", "innovation", "accountability", "integrity",
-            "punctuality", "reliability", "flexibility", "resilience", "patience", "empathy",
-        }
+        # Skill vocabulary with aliases, compiled into a matcher and hot-reloaded when the file changes
+        self.taxonomy = taxonomy or SkillTaxonomy(
+            config.SKILL_TAXONOMY_PATH or None,
+            reload_interval=config.SKILL_TAXONOMY_RELOAD_INTERVAL
+        )
+    
+    @property
+    def technical_skills(self) -> Set[str]:
+        return self.taxonomy.compiled.technical_skills
+    
+    @property
+    def soft_skills(self) -> Set[str]:
+        return self.taxonomy.compiled.soft_skills
     
     def extract_skills_from_text(self, text: str) -> Dict[str, List[str]]:
         """
@@ -56,39 +48,27 @@ class SkillExtractor:
         # Preprocess text
         processed_text = self._preprocess_text(text.lower())
         
-        # Extract skills
-        technical_skills_found = self._find_skills(processed_text, self.technical_skills)
-        soft_skills_found = self._find_skills(processed_text, self.soft_skills)
+        # Extract skills in one pass; aliases are reported under their canonical name
+        compiled = self.taxonomy.compiled
+        technical_skills_found = set()
+        soft_skills_found = set()
+        for skill, category in compiled.matcher.find_values(processed_text):
+            if category == "technical":
+                technical_skills_found.add(skill)
+            else:
+                soft_skills_found.add(skill)
         
         # Return as dictionary
         return {
-            "technical_skills": list(set(technical_skills_found)),
-            "soft_skills": list(set(soft_skills_found))
+            "technical_skills": list(technical_skills_found),
+            "soft_skills": list(soft_skills_found)
         }
     
     def _preprocess_text(self, text: str) -> str:
         """
         Preprocess text by removing punctuation and extra spaces
         """
-        # Remove special characters and replace with spaces
-        text = re.sub(r'[\-_/]', ' ', text)
-        # Remove other special characters but keep spaces
-        text = re.sub(r'[^a-zA-Z0-9\s]', ' ', text)
-        # Normalize whitespace
-        text = ' '.join(text.split())
-        return text
-    
-    def _find_skills(self, text: str, skill_set: Set[str]) -> List[str]:
-        """
-        Find skills from a given skill set in the text
-        """
-        found_skills = []
-        for skill in skill_set:
-            # Use word boundaries to match whole words
-            pattern = r'\b' + re.escape(skill) + r'\b'
-            if re.search(pattern, text, re.IGNORECASE):
-                found_skills.append(skill)
-        return found_skills
+        return normalize_skill_text(text)
     
     def extract_entities_with_spacy(self, text: str) -> Dict[str, List[str]]:
         """
@@ -97,8 +77,57 @@ class SkillExtractor:
         if not self.nlp:
             return {"entities": [], "organizations": [], "dates": [], "locations": []}
         
-        doc = self.nlp(text)
+        doc = self.spacy_pipeline.parse(text, analyses=("entities",))
+        return self._entities_from_doc(doc)
+    
+    def extract_entities_bulk(self, texts: List[str], batch_size: int = None,
+                              n_process: int = None) -> List[Dict[str, List[str]]]:
+        """
+        Extract named entities from many texts with one nlp.pipe run
+        """
+        if not self.nlp:
+            return [self.extract_entities_with_spacy(text) for text in texts]
+        
+        docs = self.spacy_pipeline.pipe(texts, analyses=("entities",), batch_size=batch_size, n_process=n_process)
+        return [self._entities_from_doc(doc) for doc in docs]
+    
+    def extract_keywords(self, text: str, num_keywords: int = 10) -> List[str]:
+        """
+        Extract top keywords from text using TF-IDF approach
+        """
+        # Tokenize text
+        doc = self.spacy_pipeline.parse(text, analyses=("keywords",)) if self.nlp else None
+        return self._keywords_from_doc(doc, text, num_keywords)
+    
+    def extract_keywords_bulk(self, texts: List[str], num_keywords: int = 10, batch_size: int = None,
+                              n_process: int = None) -> List[List[str]]:
+        """
+        Extract top keywords from many texts with one nlp.pipe run
+        """
+        if not self.nlp:
+            return [self.extract_keywords(text, num_keywords) for text in texts]
+        
+        docs = self.spacy_pipeline.pipe(texts, analyses=("keywords",), batch_size=batch_size, n_process=n_process)
+        return [self._keywords_from_doc(doc, text, num_keywords) for doc, text in zip(docs, texts)]
+    
+    def analyze_bulk(self, texts: List[str], num_keywords: int = 10, batch_size: int = None,
+                     n_process: int = None) -> List[Dict[str, List]]:
+        """
+        Extract named entities and keywords from many texts, parsing them with one nlp.pipe run
+        """
+        if not self.nlp:
+            return [{**self.extract_entities_with_spacy(text), "keywords": self.extract_keywords(text, num_keywords)}
+                    for text in texts]
         
+        docs = self.spacy_pipeline.pipe(texts, analyses=("entities", "keywords"),
+                                        batch_size=batch_size, n_process=n_process)
+        return [{**self._entities_from_doc(doc), "keywords": self._keywords_from_doc(doc, text, num_keywords)}
+                for doc, text in zip(docs, texts)]
+    
+    def _entities_from_doc(self, doc) -> Dict[str, List[str]]:
+        """
+        Group the named entities of a parsed document
+        """
         entities = {
             "entities": [(ent.text, ent.label_) for ent in doc.ents],
             "organizations": [ent.text for ent in doc.ents if ent.label_ in ["ORG", "NORP"]],
@@ -108,13 +137,10 @@ class SkillExtractor:
         
         return entities
     
-    def extract_keywords(self, text: str, num_keywords: int = 10) -> List[str]:
+    def _keywords_from_doc(self, doc, text: str, num_keywords: int) -> List[str]:
         """
-        Extract top keywords from text using TF-IDF approach
+        Count keywords from a parsed document, or from raw text when spaCy is unavailable
         """
-        # Tokenize text
-        doc = self.nlp(text) if self.nlp else None
-        
         if doc:
             # Filter tokens: remove stop words, punctuations, and get nouns/adjectives
             tokens = [token.lemma_.lower() for token in doc 
@@ -0,0 +1,77 @@
+from typing import Any, Dict, List, Tuple
+import re
+
+# Precompiled text normalization patterns
+SEPARATOR_PATTERN = re.compile(r'[\-_/]')
+NON_ALPHANUMERIC_PATTERN = re.compile(r'[^a-zA-Z0-9\s]')
+
+# Key under which a trie node stores the value of the phrase ending there (tokens are never None)
+_TERMINAL = None
+
+def normalize_skill_text(text: str) -> str:
+    """
+    Normalize text into lowercase alphanumeric tokens separated by single spaces
+    """
+    # Remove special characters and replace with spaces
+    text = SEPARATOR_PATTERN.sub(' ', text.lower())
+    # Remove other special characters but keep spaces
+    text = NON_ALPHANUMERIC_PATTERN.sub(' ', text)
+    # Normalize whitespace
+    return ' '.join(text.split())
+
+class SkillMatcher:
+    def __init__(self, phrases: Dict[str, Any] = None):
+        # Token trie: each node maps the next token to a child node
+        self._root: Dict[Any, Any] = {}
+        self.max_phrase_tokens = 0
+        self.size = 0
+        for phrase, value in (phrases or {}).items():
+            self.add(phrase, value)
+
+    def add(self, phrase: str, value: Any) -> None:
+        """
+        Add a phrase of space-separated tokens. Text is matched on whole tokens only,
+        which is the same as wrapping the phrase in regex word boundaries when the text
+        consists of alphanumeric tokens separated by single spaces.
+        """
+        tokens = phrase.split()
+        if not tokens:
+            return
+
+        node = self._root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        if _TERMINAL not in node:
+            self.size += 1
+        node[_TERMINAL] = value
+        self.max_phrase_tokens = max(self.max_phrase_tokens, len(tokens))
+
+    def find_all(self, text: str) -> List[Tuple[int, Any]]:
+        """
+        Find every phrase occurrence in one left-to-right pass, returning (token offset, value)
+        pairs. The work per token is bounded by the longest phrase, so this is linear in the
+        length of the text and independent of the number of phrases.
+        """
+        tokens = text.split()
+        root = self._root
+        matches = []
+        for start in range(len(tokens)):
+            node = root.get(tokens[start])
+            position = start
+            while node is not None:
+                if _TERMINAL in node:
+                    matches.append((start, node[_TERMINAL]))
+                position += 1
+                if position == len(tokens):
+                    break
+                node = node.get(tokens[position])
+        return matches
+
+    def find_values(self, text: str) -> List[Any]:
+        """
+        Get the distinct values of all phrases found in the text, in order of first occurrence
+        """
+        seen = {}
+        for _, value in self.find_all(text):
+            seen.setdefault(value, None)
+        return list(seen)
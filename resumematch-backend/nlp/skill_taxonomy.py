@@ -0,0 +1,155 @@
+from typing import Any, Dict, List, Optional, Set
+from pathlib import Path
+import json
+import logging
+import os
+import threading
+import time
+from nlp.skill_matcher import SkillMatcher, normalize_skill_text
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TAXONOMY_PATH = Path(__file__).with_name("skill_taxonomy.json")
+
+class CompiledTaxonomy:
+    # Immutable snapshot of a loaded taxonomy; a reload builds a new one and swaps it in
+    def __init__(self, entries: List[Dict[str, Any]], mtime: float = 0.0):
+        self.mtime = mtime
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.technical_skills: Set[str] = set()
+        self.soft_skills: Set[str] = set()
+        # Lowercased surface form (name or alias) -> canonical name
+        self.forms: Dict[str, str] = {}
+        # Normalized surface form -> canonical name, only where the form is unambiguous
+        self.aliases: Dict[str, str] = {}
+        self.matcher = SkillMatcher()
+
+        normalized_targets: Dict[str, Set[str]] = {}
+        for entry in entries:
+            name = entry["name"].lower().strip()
+            category = entry.get("category", "technical")
+            if category not in ("technical", "soft"):
+                raise ValueError(f"Unknown category '{category}' for skill '{name}'")
+
+            self.entries[name] = entry
+            (self.technical_skills if category == "technical" else self.soft_skills).add(name)
+
+            for form in [name] + [alias.lower().strip() for alias in entry.get("aliases", [])]:
+                if self.forms.setdefault(form, name) != name:
+                    logger.warning(f"Skill form '{form}' of '{name}' is already used by '{self.forms[form]}'")
+                normalized = normalize_skill_text(form)
+                if normalized:
+                    normalized_targets.setdefault(normalized, set()).add(name)
+                # Text is normalized before matching, so only forms that survive normalization
+                # unchanged can match as whole words (e.g. "node.js" needs an alias "node js")
+                if normalized != form:
+                    logger.debug(f"Skill form '{form}' is not matchable as-is; add a normalized alias")
+                    continue
+                self.matcher.add(form, (name, category))
+
+        # A normalized form shared by several skills ("c++" and "c#" both become "c"), or equal
+        # to another skill's own form, would rewrite one skill into another, so it is dropped
+        for normalized, names in normalized_targets.items():
+            owner = self.forms.get(normalized)
+            if len(names) == 1 and owner in (None, *names):
+                self.aliases[normalized] = next(iter(names))
+            elif owner is None:
+                logger.warning(f"Normalized skill form '{normalized}' is ambiguous between {sorted(names)}; ignoring it")
+            else:
+                self.aliases[normalized] = owner
+
+    def canonicalize(self, skill: str) -> str:
+        """
+        Map a skill name or alias to its canonical name, or return it lowercased if unknown
+        """
+        lowered = skill.lower().strip()
+        if lowered in self.entries:
+            return lowered
+        if lowered in self.forms:
+            return self.forms[lowered]
+        return self.aliases.get(normalize_skill_text(lowered), lowered)
+
+    def category_of(self, skill: str) -> Optional[str]:
+        """
+        Get the category of a canonical skill name
+        """
+        entry = self.entries.get(skill)
+        return entry.get("category", "technical") if entry else None
+
+
+class SkillTaxonomy:
+    def __init__(self, path: str = None, reload_interval: float = 30.0):
+        self.path = Path(path) if path else DEFAULT_TAXONOMY_PATH
+        self.reload_interval = reload_interval
+        self._reload_lock = threading.Lock()
+        self._last_check = time.monotonic()
+        self._compiled = self._compile()
+
+    @property
+    def compiled(self) -> CompiledTaxonomy:
+        """
+        Get the current compiled taxonomy, reloading it first if the file changed.
+        Callers should hold on to the returned snapshot for the duration of one extraction.
+        """
+        self.maybe_reload()
+        return self._compiled
+
+    def canonicalize(self, skill: str) -> str:
+        """
+        Map a skill name or alias to its canonical name
+        """
+        return self.compiled.canonicalize(skill)
+
+    def maybe_reload(self) -> bool:
+        """
+        Reload the taxonomy if the file changed, checking at most once per reload interval
+        """
+        if self.reload_interval <= 0 or time.monotonic() - self._last_check < self.reload_interval:
+            return False
+
+        # Another thread is already checking or reloading; keep serving the current snapshot
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+        try:
+            self._last_check = time.monotonic()
+            try:
+                mtime = os.path.getmtime(self.path)
+            except OSError as e:
+                logger.warning(f"Cannot stat skill taxonomy {self.path}: {str(e)}")
+                return False
+            if mtime == self._compiled.mtime:
+                return False
+            return self._reload_locked()
+        finally:
+            self._reload_lock.release()
+
+    def reload(self) -> bool:
+        """
+        Reload the taxonomy from disk now
+        """
+        with self._reload_lock:
+            return self._reload_locked()
+
+    def _reload_locked(self) -> bool:
+        """
+        Compile the file into a new snapshot and swap it in. A broken file keeps the old snapshot.
+        """
+        try:
+            compiled = self._compile()
+        except Exception as e:
+            logger.error(f"Failed to reload skill taxonomy {self.path}: {str(e)}")
+            return False
+
+        # Single reference assignment: in-flight extractions keep using the snapshot they hold
+        self._compiled = compiled
+        logger.info(f"Reloaded skill taxonomy with {len(compiled.entries)} skills")
+        return True
+
+    def _compile(self) -> CompiledTaxonomy:
+        """
+        Load and compile the taxonomy file
+        """
+        mtime = os.path.getmtime(self.path)
+        with open(self.path) as taxonomy_file:
+            data = json.load(taxonomy_file)
+        return CompiledTaxonomy(data["skills"], mtime=mtime)
@@ -0,0 +1,126 @@
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+import hashlib
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Pipeline components each kind of analysis needs (names from the en_core_web_* pipelines)
+ANALYSIS_COMPONENTS = {
+    "entities": ("ner",),
+    "keywords": ("tok2vec", "tagger", "attribute_ruler", "lemmatizer"),
+}
+
+class SpacyPipeline:
+    def __init__(self, nlp, cache_size: int = 512, batch_size: int = 64, n_process: int = 1):
+        self.nlp = nlp
+        self.cache_size = cache_size
+        self.batch_size = batch_size
+        self.n_process = n_process
+
+        # Content hash -> (components the Doc was parsed with, Doc)
+        self._cache: "OrderedDict[str, Tuple[FrozenSet[str], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+
+    def parse(self, text: str, analyses: Sequence[str] = ("entities", "keywords")):
+        """
+        Get a Doc that supports the given analyses, parsing only if no cached Doc for the
+        same text was produced with the components they need
+        """
+        key = self._key(text)
+        needed = self._components_for(analyses)
+
+        doc, cached_components = self._lookup(key, needed)
+        if doc is not None:
+            return doc
+
+        # Parse once with everything needed now and everything the cached Doc already had
+        components = needed | cached_components
+        doc = self.nlp(text, disable=self._disabled_for(components))
+        self._store(key, components, doc)
+        return doc
+
+    def pipe(self, texts: Sequence[str], analyses: Sequence[str] = ("entities", "keywords"),
+             batch_size: int = None, n_process: int = None) -> List[Any]:
+        """
+        Parse many texts with nlp.pipe, reusing cached Docs and disabling unneeded components
+        """
+        needed = self._components_for(analyses)
+        keys = [self._key(text) for text in texts]
+        docs: Dict[str, Any] = {}
+        pending: Dict[str, str] = {}
+        # Keep what partially cached Docs already had so re-parsing them loses nothing
+        components = needed
+
+        for key, text in zip(keys, texts):
+            if key in docs or key in pending:
+                continue
+            doc, cached_components = self._lookup(key, needed)
+            if doc is not None:
+                docs[key] = doc
+            else:
+                pending[key] = text
+                components = components | cached_components
+
+        if pending:
+            parsed = self.nlp.pipe(
+                pending.values(),
+                disable=self._disabled_for(components),
+                batch_size=batch_size or self.batch_size,
+                n_process=n_process or self.n_process
+            )
+            for key, doc in zip(pending.keys(), parsed):
+                self._store(key, components, doc)
+                docs[key] = doc
+
+        return [docs[key] for key in keys]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get Doc cache counters
+        """
+        with self._lock:
+            return {"entries": len(self._cache), "hits": self.hits, "misses": self.misses}
+
+    def _key(self, text: str) -> str:
+        # Docs keep character offsets, so the key is the exact text rather than a normalized form
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _components_for(self, analyses: Iterable[str]) -> FrozenSet[str]:
+        """
+        Get the components needed for the analyses that this pipeline actually has
+        """
+        components = set()
+        for analysis in analyses:
+            if analysis not in ANALYSIS_COMPONENTS:
+                raise ValueError(f"Unknown spaCy analysis: {analysis}")
+            components.update(ANALYSIS_COMPONENTS[analysis])
+        return frozenset(components) & frozenset(self.nlp.pipe_names)
+
+    def _disabled_for(self, components: FrozenSet[str]) -> List[str]:
+        return [name for name in self.nlp.pipe_names if name not in components]
+
+    def _lookup(self, key: str, needed: FrozenSet[str]) -> Tuple[Optional[Any], FrozenSet[str]]:
+        """
+        Get (Doc, components) for a usable cache hit, or (None, components of any cached Doc)
+        """
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and needed <= cached[0]:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return cached[1], cached[0]
+            self.misses += 1
+            return None, cached[0] if cached is not None else frozenset()
+
+    def _store(self, key: str, components: FrozenSet[str], doc) -> None:
+        with self._lock:
+            self._cache[key] = (components, doc)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
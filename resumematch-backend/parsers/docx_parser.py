@@ -1,5 +1,5 @@
 from docx import Document
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
 import io
 import logging
 
@@ -63,16 +63,43 @@ class DocxParser:
         """
         try:
             doc = Document(file_path)
-            core_props = doc.core_properties
-            return {
-                "title": core_props.title or "",
-                "subject": core_props.subject or "",
-                "author": core_props.author or "",
-                "keywords": core_props.keywords or "",
-                "comments": core_props.comments or "",
-                "last_modified_by": core_props.last_modified_by or "",
-                "revision": core_props.revision or 0,
-            }
+            return DocxParser._properties_of(doc)
         except Exception as e:
             logger.error(f"Error extracting DOCX properties: {str(e)}")
-            return {}
\ No newline at end of file
+            return {}
+    
+    @staticmethod
+    def extract_text_and_properties_from_bytes(docx_bytes: bytes) -> Tuple[str, Dict[str, Any]]:
+        """
+        Extract text and document properties from DOCX bytes, loading the document once
+        """
+        try:
+            doc = Document(io.BytesIO(docx_bytes))
+            paragraphs = [paragraph.text for paragraph in doc.paragraphs]
+            text = "\n".join(paragraphs).strip()
+        except Exception as e:
+            logger.error(f"Error extracting text from DOCX bytes: {str(e)}")
+            raise
+        
+        try:
+            properties = DocxParser._properties_of(doc)
+        except Exception as e:
+            logger.error(f"Error extracting DOCX properties: {str(e)}")
+            properties = {}
+        return text, properties
+    
+    @staticmethod
+    def _properties_of(doc) -> Dict[str, Any]:
+        """
+        Read core properties from a loaded DOCX document
+        """
+        core_props = doc.core_properties
+        return {
+            "title": core_props.title or "",
+            "subject": core_props.subject or "",
+            "author": core_props.author or "",
+            "keywords": core_props.keywords or "",
+            "comments": core_props.comments or "",
+            "last_modified_by": core_props.last_modified_by or "",
+            "revision": core_props.revision or 0,
+        }
@@ -1,6 +1,6 @@
 import fitz  # PyMuPDF
 import io
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -48,16 +48,49 @@ class PDFParser:
         """
         try:
             doc = fitz.open(file_path)
-            metadata = doc.metadata
+            metadata = PDFParser._metadata_of(doc)
             doc.close()
-            return {
-                "title": metadata.get("title", ""),
-                "author": metadata.get("author", ""),
-                "subject": metadata.get("subject", ""),
-                "creator": metadata.get("creator", ""),
-                "producer": metadata.get("producer", ""),
-                "pages": len(doc),
-            }
+            return metadata
         except Exception as e:
             logger.error(f"Error extracting PDF metadata: {str(e)}")
-            return {}
\ No newline at end of file
+            return {}
+    
+    @staticmethod
+    def extract_text_and_metadata_from_bytes(pdf_bytes: bytes) -> Tuple[str, Dict[str, Any]]:
+        """
+        Extract text and metadata from PDF bytes, opening the document once
+        """
+        try:
+            doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+        except Exception as e:
+            logger.error(f"Error opening PDF bytes: {str(e)}")
+            raise
+        
+        try:
+            text = "".join(page.get_text() for page in doc).strip()
+            try:
+                metadata = PDFParser._metadata_of(doc)
+            except Exception as e:
+                logger.error(f"Error extracting PDF metadata: {str(e)}")
+                metadata = {}
+            return text, metadata
+        except Exception as e:
+            logger.error(f"Error extracting text from PDF bytes: {str(e)}")
+            raise
+        finally:
+            doc.close()
+    
+    @staticmethod
+    def _metadata_of(doc) -> Dict[str, Any]:
+        """
+        Read metadata from an open PDF document
+        """
+        metadata = doc.metadata or {}
+        return {
+            "title": metadata.get("title", ""),
+            "author": metadata.get("author", ""),
+            "subject": metadata.get("subject", ""),
+            "creator": metadata.get("creator", ""),
+            "producer": metadata.get("producer", ""),
+            "pages": len(doc),
+        }
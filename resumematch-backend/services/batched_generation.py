@@ -0,0 +1,77 @@
+from typing import List, Sequence
+import logging
+import torch
+
+logger = logging.getLogger(__name__)
+
+def plan_batches(prompt_lengths: Sequence[int], max_new_tokens: int, token_budget: int,
+                 max_batch_size: int) -> List[List[int]]:
+    """
+    Split prompts into batches of similar length whose padded size, batch size times
+    (longest prompt + new tokens), stays within the token budget. Returns prompt indices.
+    """
+    order = sorted(range(len(prompt_lengths)), key=lambda i: prompt_lengths[i])
+    batches = []
+    current = []
+    longest = 0
+    for i in order:
+        candidate_longest = max(longest, prompt_lengths[i])
+        cost = (len(current) + 1) * (candidate_longest + max_new_tokens)
+        if current and (cost > token_budget or len(current) >= max_batch_size):
+            batches.append(current)
+            current, candidate_longest = [], prompt_lengths[i]
+        current.append(i)
+        longest = candidate_longest
+    if current:
+        batches.append(current)
+    return batches
+
+def pad_prompts(suffixes: List[List[int]], pad_token_id: int, prefix: List[int] = None):
+    """
+    Build input ids and attention mask for [prefix][padding][suffix] rows. Without a prefix this
+    is plain left padding; with one, the prefix stays at the same positions in every row so its
+    cached key/value states can be shared by the batch. Padding is masked out either way.
+    """
+    prefix = prefix or []
+    width = len(prefix) + max(len(suffix) for suffix in suffixes)
+    input_ids = torch.full((len(suffixes), width), pad_token_id, dtype=torch.long)
+    attention_mask = torch.zeros((len(suffixes), width), dtype=torch.long)
+    for row, suffix in enumerate(suffixes):
+        input_ids[row, :len(prefix)] = torch.tensor(prefix, dtype=torch.long)
+        attention_mask[row, :len(prefix)] = 1
+        input_ids[row, width - len(suffix):] = torch.tensor(suffix, dtype=torch.long)
+        attention_mask[row, width - len(suffix):] = 1
+    return input_ids, attention_mask
+
+def generate_batch(model, tokenizer, suffixes: List[List[int]], max_new_tokens: int, temperature: float,
+                   prefix: List[int] = None, past_key_values=None, do_sample: bool = True) -> List[str]:
+    """
+    Run one generate() call over a batch of tokenized prompts and decode only the new
+    tokens of each row, in input order. With do_sample=False decoding is greedy and the
+    temperature is unused.
+    """
+    pad_token_id = tokenizer.pad_token_id
+    if pad_token_id is None:
+        pad_token_id = tokenizer.eos_token_id
+    input_ids, attention_mask = pad_prompts(suffixes, pad_token_id, prefix)
+
+    generate_kwargs = {}
+    if do_sample:
+        generate_kwargs["temperature"] = temperature
+    if past_key_values is not None:
+        generate_kwargs["past_key_values"] = past_key_values
+
+    with torch.no_grad():
+        outputs = model.generate(
+            input_ids,
+            attention_mask=attention_mask,
+            max_new_tokens=max_new_tokens,
+            pad_token_id=pad_token_id,
+            do_sample=do_sample,
+            num_return_sequences=1,
+            **generate_kwargs
+        )
+
+    # Rows that stop early are padded after EOS, which skip_special_tokens drops
+    new_tokens = outputs[:, input_ids.shape[1]:]
+    return [tokenizer.decode(row, skip_special_tokens=True).strip() for row in new_tokens]
@@ -0,0 +1,176 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import PurePosixPath
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import io
+import itertools
+import logging
+import multiprocessing
+import sys
+import threading
+import zipfile
+from services.parsing_service import ParsingService
+from services.resume_analyzer import ResumeAnalyzer
+
+logger = logging.getLogger(__name__)
+
+# Per-process analyzer, created once when a pool worker starts
+_analyzer: Optional[ResumeAnalyzer] = None
+
+def _workers_reimport_main() -> bool:
+    """
+    Check whether spawned workers will re-run the parent's __main__ module. Spawn skips it
+    only for package entry points (python -m pkg, uvicorn's CLI) and for scripts without a file.
+    """
+    main_module = sys.modules["__main__"]
+    main_name = getattr(getattr(main_module, "__spec__", None), "name", None)
+    if main_name is not None:
+        return not (main_name == "__main__" or main_name.endswith(".__main__"))
+    return getattr(main_module, "__file__", None) is not None
+
+def _init_worker() -> None:
+    global _analyzer
+    _analyzer = ResumeAnalyzer()
+
+def analyze_chunk(documents: List[Tuple[str, bytes, str]]) -> List[Dict[str, Any]]:
+    """
+    Parse and analyze a chunk of (filename, bytes, file hash) resumes in a pool worker, with
+    spaCy run over the whole chunk at once. Top-level so it can be pickled; failures are
+    returned rather than raised so one bad file does not fail the batch. File hashes are
+    passed through so results can be deduplicated as they arrive.
+    """
+    global _analyzer
+    try:
+        if _analyzer is None:
+            _analyzer = ResumeAnalyzer()
+        analyses = _analyzer.analyze_many([(filename, file_bytes) for filename, file_bytes, _ in documents])
+    except Exception as e:
+        logger.error(f"Error analyzing {len(documents)} documents: {str(e)}")
+        analyses = [{"filename": filename, "error": str(e)} for filename, _, _ in documents]
+    for analysis, (_, _, byte_hash) in zip(analyses, documents):
+        analysis["byte_hash"] = byte_hash
+    return analyses
+
+class BulkIngestionService:
+    def __init__(self, parsing_service: ParsingService, max_workers: int = 1,
+                 max_file_size: int = 16 * 1024 * 1024, max_files: int = 1000, chunk_size: int = 16):
+        self.parsing_service = parsing_service
+        self.max_workers = max(max_workers, 1)
+        self.chunk_size = max(chunk_size, 1)
+        self.max_file_size = max_file_size
+        self.max_files = max_files
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def expand_archive(self, archive_bytes: bytes,
+                       max_files: int = None) -> Tuple[List[Tuple[str, bytes]], List[Dict[str, Any]]]:
+        """
+        Get (filename, bytes) for up to max_files resumes in a ZIP archive (default: the service
+        limit), plus an error entry for each member that was skipped. Members past the limit
+        are not read. Raises ValueError if the archive cannot be read.
+        """
+        if max_files is None:
+            max_files = self.max_files
+        try:
+            archive = zipfile.ZipFile(io.BytesIO(archive_bytes))
+        except zipfile.BadZipFile as e:
+            raise ValueError(f"Invalid ZIP archive: {str(e)}")
+
+        documents = []
+        errors = []
+        with archive:
+            for info in archive.infolist():
+                path = PurePosixPath(info.filename)
+                if info.is_dir() or path.parts[0] == "__MACOSX" or path.name.startswith("."):
+                    continue
+
+                if not self.parsing_service.validate_file_type(path.name):
+                    errors.append({"filename": info.filename, "error": "Invalid file type"})
+                    continue
+                if len(documents) >= max_files:
+                    errors.append({"filename": info.filename, "error": f"More than {self.max_files} files"})
+                    continue
+
+                # The declared size can lie, so the read itself is bounded too
+                with archive.open(info) as member:
+                    file_bytes = member.read(self.max_file_size + 1)
+                if info.file_size > self.max_file_size or len(file_bytes) > self.max_file_size:
+                    errors.append({"filename": info.filename, "error": "File size exceeds maximum allowed size"})
+                    continue
+                documents.append((path.name, file_bytes))
+        return documents, errors
+
+    async def analyze_documents(self, documents: Iterable[Tuple[str, bytes, str]]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Analyze (filename, bytes, file hash) documents in the process pool in chunks of chunk_size,
+        yielding each chunk's results as soon as it is ready. At most two chunks per worker are in
+        flight, which bounds memory on large uploads.
+        """
+        loop = asyncio.get_running_loop()
+        documents = iter(documents)
+        # Future -> (chunk, executor it was submitted to)
+        pending: Dict[asyncio.Future, Tuple[List[Tuple[str, bytes, str]], ProcessPoolExecutor]] = {}
+
+        def submit_next() -> None:
+            chunk = list(itertools.islice(documents, self.chunk_size))
+            if chunk:
+                executor = self._get_executor()
+                future = loop.run_in_executor(executor, analyze_chunk, chunk)
+                pending[future] = (chunk, executor)
+
+        for _ in range(self.max_workers * 2):
+            submit_next()
+
+        while pending:
+            done, _ = await asyncio.wait(pending.keys(), return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                chunk, executor = pending.pop(future)
+                filenames = ", ".join(filename for filename, _, _ in chunk)
+                try:
+                    results = future.result()
+                except BrokenProcessPool as e:
+                    # A worker process died (e.g. a parser crash); the pool is rebuilt for the next files
+                    logger.error(f"Bulk ingestion worker failed on {filenames}: {str(e)}")
+                    self._reset_executor(executor)
+                    results = [{"filename": filename, "error": "Worker process failed", "byte_hash": byte_hash}
+                               for filename, _, byte_hash in chunk]
+                except Exception as e:
+                    logger.error(f"Bulk ingestion failed on {filenames}: {str(e)}")
+                    results = [{"filename": filename, "error": str(e), "byte_hash": byte_hash}
+                               for filename, _, byte_hash in chunk]
+                submit_next()
+                for result in results:
+                    yield result
+
+    def shutdown(self) -> None:
+        """
+        Stop the worker processes
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                if _workers_reimport_main():
+                    logger.warning(
+                        f"Bulk ingestion workers will re-run {sys.modules['__main__'].__file__} on start; "
+                        "serve the API with `uvicorn main:app` so workers only import the analyzer"
+                    )
+                # Spawned rather than forked: the parent holds model weights and inference threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker
+                )
+            return self._executor
+
+    def _reset_executor(self, broken: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is broken:
+                self._executor = None
+        broken.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,86 @@
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime
+import hashlib
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# How a duplicate upload was recognised
+DUPLICATE_BYTES = "bytes"
+DUPLICATE_TEXT = "text"
+
+class DuplicateIndex:
+    def __init__(self):
+        # SHA-256 of the uploaded file / of the normalized parsed text -> resume id
+        self._byte_hashes: Dict[str, str] = {}
+        self._text_hashes: Dict[str, str] = {}
+        # Resume id -> uploads that turned out to be the same document
+        self._duplicates: Dict[str, List[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def hash_bytes(file_bytes: bytes) -> str:
+        return hashlib.sha256(file_bytes).hexdigest()
+
+    def find_by_bytes(self, byte_hash: str) -> Optional[str]:
+        """
+        Get the resume already stored for an identical file
+        """
+        with self._lock:
+            return self._byte_hashes.get(byte_hash)
+
+    def register(self, resume_id: str, byte_hash: Optional[str],
+                 text_hash: Optional[str]) -> Tuple[str, Optional[str]]:
+        """
+        Register a new resume and get (resume_id, None), or get (existing id, DUPLICATE_BYTES or
+        DUPLICATE_TEXT) if a resume with the same file or text is already stored. Check-and-insert
+        is atomic, so concurrent uploads of one document store it once. Without a text hash
+        (no extractable text) only identical files count as duplicates.
+        """
+        with self._lock:
+            existing = self._byte_hashes.get(byte_hash) if byte_hash else None
+            if existing is not None:
+                return existing, DUPLICATE_BYTES
+
+            existing = self._text_hashes.get(text_hash) if text_hash else None
+            if existing is not None:
+                # A new file with known text: later uploads of these exact bytes skip parsing
+                if byte_hash:
+                    self._byte_hashes[byte_hash] = existing
+                return existing, DUPLICATE_TEXT
+
+            if byte_hash:
+                self._byte_hashes[byte_hash] = resume_id
+            if text_hash:
+                self._text_hashes[text_hash] = resume_id
+            return resume_id, None
+
+    def record_duplicate(self, resume_id: str, filename: str, kind: str) -> None:
+        """
+        Record that an upload was recognised as a copy of a stored resume
+        """
+        with self._lock:
+            self._duplicates.setdefault(resume_id, []).append({
+                "filename": filename,
+                "matched_on": kind,
+                "uploaded_at": datetime.utcnow(),
+            })
+
+    def duplicates_of(self, resume_id: str) -> List[Dict[str, Any]]:
+        """
+        Get the duplicate uploads recorded for a resume
+        """
+        with self._lock:
+            return list(self._duplicates.get(resume_id, []))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get counts of known documents and recorded duplicates
+        """
+        with self._lock:
+            return {
+                "documents": len(self._text_hashes),
+                "file_hashes": len(self._byte_hashes),
+                "duplicate_uploads": sum(len(uploads) for uploads in self._duplicates.values()),
+            }
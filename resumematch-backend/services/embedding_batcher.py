@@ -0,0 +1,161 @@
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
+import asyncio
+import logging
+import numpy as np
+from services.embedding_service import EmbeddingService
+
+logger = logging.getLogger(__name__)
+
+class EmbeddingBatcher:
+    def __init__(self, embedding_service: EmbeddingService, max_batch_size: int = 32,
+                 max_wait_ms: float = 5.0):
+        self.embedding_service = embedding_service
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+
+        self._queue: asyncio.Queue = None
+        self._worker: asyncio.Task = None
+        # One inference thread: batches run back to back while the next one fills up
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding-batcher")
+
+        # Metrics
+        self.batches = 0
+        self.requests = 0
+        self.total_wait_seconds = 0.0
+        self.batch_sizes = Counter()
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    async def start(self) -> None:
+        """
+        Start the dispatcher on the running event loop
+        """
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stop the dispatcher, failing any requests that are still queued
+        """
+        if not self.running:
+            return
+
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+        while not self._queue.empty():
+            _, future, _ = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Embedding batcher stopped"))
+
+    async def encode(self, text: str) -> np.ndarray:
+        """
+        Encode a text, sharing a forward pass with other concurrent callers
+        """
+        loop = asyncio.get_running_loop()
+        if not self.running:
+            # Not started (e.g. outside the app lifecycle): encode on its own
+            return await loop.run_in_executor(self._executor, self.embedding_service.encode_text_array, text)
+
+        future = loop.create_future()
+        await self._queue.put((text, future, loop.time()))
+        return await future
+
+    async def encode_many(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode a caller-assembled batch (e.g. a bulk upload) on the inference thread,
+        without splitting it across the request queue
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.embedding_service.encode_texts_array, texts)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get batch fill metrics
+        """
+        average_batch_size = self.requests / self.batches if self.batches else 0.0
+        return {
+            "running": self.running,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "batches": self.batches,
+            "requests": self.requests,
+            "average_batch_size": average_batch_size,
+            "average_fill_ratio": average_batch_size / self.max_batch_size,
+            "average_queue_wait_ms": 1000 * self.total_wait_seconds / self.requests if self.requests else 0.0,
+            "batch_size_histogram": dict(sorted(self.batch_sizes.items())),
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+        }
+
+    async def _run(self) -> None:
+        """
+        Gather queued requests into batches and run one forward pass per batch
+        """
+        loop = asyncio.get_running_loop()
+        batch = []
+        try:
+            while True:
+                batch = []
+                batch.append(await self._queue.get())
+                deadline = loop.time() + self.max_wait_ms / 1000.0
+
+                # Collect more requests until the batch is full or the wait budget is spent
+                while len(batch) < self.max_batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+                # Skip callers that gave up while waiting
+                batch = [item for item in batch if not item[1].done()]
+                if not batch:
+                    continue
+
+                await self._dispatch(loop, batch)
+        except asyncio.CancelledError:
+            # Requests already taken off the queue would otherwise never be resolved
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(RuntimeError("Embedding batcher stopped"))
+            raise
+
+    async def _dispatch(self, loop: asyncio.AbstractEventLoop,
+                        batch: List[Tuple[str, asyncio.Future, float]]) -> None:
+        """
+        Run one batched forward pass and resolve every caller's future
+        """
+        started = loop.time()
+        texts = [text for text, _, _ in batch]
+
+        self.batches += 1
+        self.requests += len(batch)
+        self.batch_sizes[len(batch)] += 1
+        self.total_wait_seconds += sum(started - enqueued for _, _, enqueued in batch)
+
+        try:
+            embeddings = await loop.run_in_executor(
+                self._executor, self.embedding_service.encode_texts_array, texts
+            )
+        except Exception as e:
+            logger.error(f"Error encoding batch of {len(texts)} texts: {str(e)}")
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future, _), embedding in zip(batch, embeddings):
+            if not future.done():
+                future.set_result(embedding)
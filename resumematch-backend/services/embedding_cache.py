@@ -0,0 +1,166 @@
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Any
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import numpy as np
+from utils.helpers import normalize_text
+
+logger = logging.getLogger(__name__)
+
+class EmbeddingCache:
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, cache_dir: Optional[str] = None):
+        self.max_bytes = max_bytes
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        # In-process LRU tier: key -> float32 vector
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._current_bytes = 0
+        self._lock = threading.Lock()
+
+        # Counters
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(text: str, model_name: str, model_type: str) -> str:
+        """
+        Build a content-addressed cache key from the normalized text and the model identity
+        """
+        digest = hashlib.sha256()
+        digest.update(model_type.encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(model_name.encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(normalize_text(text).encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """
+        Look up an embedding, checking the memory tier first and then the disk tier
+        """
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return vector
+
+        vector = self._read_from_disk(key)
+        with self._lock:
+            if vector is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._store_in_memory(key, vector)
+        return vector
+
+    def put(self, key: str, vector: np.ndarray) -> None:
+        """
+        Store an embedding in both cache tiers
+        """
+        vector = np.ascontiguousarray(vector, dtype=np.float32)
+        # Cached vectors are shared between callers, so they must not be mutated
+        vector.setflags(write=False)
+        with self._lock:
+            self._store_in_memory(key, vector)
+        self._write_to_disk(key, vector)
+
+    def clear(self) -> None:
+        """
+        Drop every entry from the memory tier
+        """
+        with self._lock:
+            self._entries.clear()
+            self._current_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get hit/miss counters and memory usage of the cache
+        """
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._current_bytes,
+                "max_bytes": self.max_bytes,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "disk_enabled": self.cache_dir is not None,
+            }
+
+    def _store_in_memory(self, key: str, vector: np.ndarray) -> None:
+        """
+        Insert into the LRU tier and evict the least recently used entries over budget.
+        Must be called with the lock held.
+        """
+        if vector.nbytes > self.max_bytes:
+            return
+
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._current_bytes -= previous.nbytes
+
+        self._entries[key] = vector
+        self._current_bytes += vector.nbytes
+
+        while self._current_bytes > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._current_bytes -= evicted.nbytes
+            self.evictions += 1
+
+    def _disk_path(self, key: str) -> Path:
+        """
+        Get the on-disk location for a key, sharded by prefix to keep directories small
+        """
+        return self.cache_dir / key[:2] / f"{key}.npy"
+
+    def _read_from_disk(self, key: str) -> Optional[np.ndarray]:
+        """
+        Read an embedding from the disk tier if enabled
+        """
+        if self.cache_dir is None:
+            return None
+
+        path = self._disk_path(key)
+        if not path.exists():
+            return None
+
+        try:
+            vector = np.load(path, allow_pickle=False)
+            vector.setflags(write=False)
+            return vector
+        except Exception as e:
+            logger.warning(f"Discarding unreadable embedding cache entry {path}: {str(e)}")
+            return None
+
+    def _write_to_disk(self, key: str, vector: np.ndarray) -> None:
+        """
+        Persist an embedding to the disk tier if enabled, using an atomic rename
+        """
+        if self.cache_dir is None:
+            return
+
+        path = self._disk_path(key)
+        if path.exists():
+            return
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as temp_file:
+                np.save(temp_file, vector, allow_pickle=False)
+            os.replace(temp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to write embedding cache entry {path}: {str(e)}")
@@ -1,126 +1,219 @@
-from transformers import AutoTokenizer, AutoModelForCausalLM
-from sentence_transformers import SentenceTransformer
 import torch
 import numpy as np
 from typing import List, Union
 import logging
 from config import config
+from services.embedding_cache import EmbeddingCache
+from services.similarity_engine import SimilarityEngine
+from services.model_registry import model_registry, CAUSAL_LM, SENTENCE_TRANSFORMER
 
 logger = logging.getLogger(__name__)
 
 class EmbeddingService:
-    def __init__(self, model_name: str = None, model_type: str = "gpt2"):
+    def __init__(self, model_name: str = None, model_type: str = "gpt2",
+                 cache: EmbeddingCache = None, batch_size: int = None):
         self.model_type = model_type
+        self.batch_size = batch_size or config.EMBEDDING_BATCH_SIZE
+        
+        # Content-addressed cache in front of the model
+        if cache is None and config.EMBEDDING_CACHE_ENABLED:
+            cache = EmbeddingCache(
+                max_bytes=config.EMBEDDING_CACHE_MAX_BYTES,
+                cache_dir=config.EMBEDDING_CACHE_DIR or None
+            )
+        self.cache = cache
         
         if model_type == "gpt2":
             self.model_name = model_name or "openai-community/gpt2"
-            self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-            # Add padding token if it doesn't exist
-            if self.tokenizer.pad_token is None:
-                self.tokenizer.pad_token = self.tokenizer.eos_token
-            
-            self.model = AutoModelForCausalLM.from_pretrained(self.model_name)
-            # Set model to evaluation mode
-            self.model.eval()
+            kind = CAUSAL_LM
         elif model_type == "sentence_transformer":
             self.model_name = model_name or config.EMBEDDING_MODEL
-            self.model = SentenceTransformer(self.model_name)
+            kind = SENTENCE_TRANSFORMER
         elif model_type == "qwen":
             self.model_name = model_name or "Qwen/Qwen2.5-3B-Instruct"
-            self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-            self.model = AutoModelForCausalLM.from_pretrained(self.model_name)
-            # Set model to evaluation mode
-            self.model.eval()
+            kind = CAUSAL_LM
         else:
             raise ValueError(f"Unsupported model type: {model_type}")
+        
+        # Weights are shared with any other service using the same model and load on first use
+        self._handle = model_registry.acquire(kind, self.model_name)
+    
+    def close(self) -> None:
+        """
+        Release this service's reference to the shared model
+        """
+        self._handle.release()
     
     def encode_text(self, text: str) -> List[float]:
         """
         Encode a single text string into an embedding vector
         """
+        return self.encode_text_array(text).tolist()
+    
+    def encode_texts(self, texts: List[str]) -> List[List[float]]:
+        """
+        Encode multiple text strings into embedding vectors
+        """
+        return self.encode_texts_array(texts).tolist()
+    
+    def encode_text_array(self, text: str) -> np.ndarray:
+        """
+        Encode a single text string into a float32 embedding vector, using the cache when enabled
+        """
         try:
+            if self.cache is None:
+                return self._encode_uncached([text])[0]
+            
+            key = self.cache.make_key(text, self.model_name, self.model_type)
+            embedding = self.cache.get(key)
+            if embedding is None:
+                embedding = self._encode_uncached([text])[0]
+                self.cache.put(key, embedding)
+            return embedding
+        except Exception as e:
+            logger.error(f"Error encoding text: {str(e)}")
+            raise
+    
+    def encode_texts_array(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode multiple text strings into a float32 embedding matrix, only running
+        the model for texts that are not already cached
+        """
+        try:
+            if not texts:
+                return np.empty((0, 0), dtype=np.float32)
+            if self.cache is None:
+                return self._encode_uncached(texts)
+            
+            keys = [self.cache.make_key(text, self.model_name, self.model_type) for text in texts]
+            found = {}
+            pending = {}
+            for key, text in zip(keys, texts):
+                if key in found or key in pending:
+                    continue
+                embedding = self.cache.get(key)
+                if embedding is None:
+                    pending[key] = text
+                else:
+                    found[key] = embedding
+            
+            if pending:
+                encoded = self._encode_uncached(list(pending.values()))
+                for key, embedding in zip(pending.keys(), encoded):
+                    self.cache.put(key, embedding)
+                    found[key] = embedding
+            
+            return np.stack([found[key] for key in keys])
+        except Exception as e:
+            logger.error(f"Error encoding texts: {str(e)}")
+            raise
+    
+    def _encode_uncached(self, texts: List[str]) -> np.ndarray:
+        """
+        Run the model over the given texts and return a float32 embedding matrix
+        """
+        if self.model_type == "sentence_transformer":
+            with self._handle.use() as (model, _):
+                embeddings = model.encode(texts)
+            return np.asarray(embeddings, dtype=np.float32)
+        
+        # For GPT-2 and Qwen, run padded batches through the transformer
+        return self._encode_causal_lm_batch(texts)
+    
+    def _encode_causal_lm_batch(self, texts: List[str], batch_size: int = None) -> np.ndarray:
+        """
+        Encode texts with a causal language model backend in length-bucketed batches,
+        mean pooling the last hidden states over real (non-padding) tokens only
+        """
+        batch_size = batch_size or self.batch_size
+        with self._handle.use() as (model, tokenizer):
+            input_ids = tokenizer(texts, truncation=True, max_length=512)["input_ids"]
+            pad_token_id = tokenizer.pad_token_id
+            if pad_token_id is None:
+                pad_token_id = tokenizer.eos_token_id
+            
+            # Sort by token length so each batch holds similarly sized inputs and little padding
+            order = sorted(range(len(texts)), key=lambda i: len(input_ids[i]))
+            embeddings = [None] * len(texts)
+            
+            for start in range(0, len(order), batch_size):
+                indices = order[start:start + batch_size]
+                max_length = max(len(input_ids[i]) for i in indices)
+                
+                # Right-pad so positions of real tokens are the same as in an unpadded pass
+                batch_ids = torch.full((len(indices), max_length), pad_token_id, dtype=torch.long)
+                attention_mask = torch.zeros((len(indices), max_length), dtype=torch.long)
+                for row, i in enumerate(indices):
+                    length = len(input_ids[i])
+                    batch_ids[row, :length] = torch.tensor(input_ids[i], dtype=torch.long)
+                    attention_mask[row, :length] = 1
+                
+                with torch.no_grad():
+                    # base_model is the transformer stack without the LM head
+                    outputs = model.base_model(input_ids=batch_ids, attention_mask=attention_mask)
+                    hidden_states = outputs.last_hidden_state
+                    mask = attention_mask.unsqueeze(-1).to(hidden_states.dtype)
+                    summed = (hidden_states * mask).sum(dim=1)
+                    counts = mask.sum(dim=1).clamp(min=1)
+                    pooled = (summed / counts).float().numpy()
+                
+                for row, i in enumerate(indices):
+                    embeddings[i] = pooled[row]
+        
+        return np.stack(embeddings).astype(np.float32)
+    
+    def _encode_single(self, text: str) -> np.ndarray:
+        """
+        Encode a single text string with a causal language model backend, one forward pass per text.
+        Kept as the reference path for benchmarks/embedding_batching.py.
+        """
+        with self._handle.use() as (model, tokenizer):
             if self.model_type == "gpt2":
                 # Tokenize the input text
-                inputs = self.tokenizer(text, return_tensors="pt", truncation=True, padding=True, max_length=512)
+                inputs = tokenizer(text, return_tensors="pt", truncation=True, padding=True, max_length=512)
                 
                 # Get model outputs (using the transformer layers, not the LM head)
                 with torch.no_grad():
-                    outputs = self.model.transformer(**inputs)
+                    outputs = model.transformer(**inputs)
                     # Use the mean of the last hidden states as the embedding
                     hidden_states = outputs.last_hidden_state
                     embedding = torch.mean(hidden_states, dim=1).squeeze().numpy()
                 
-                return embedding.tolist()
-            elif self.model_type == "sentence_transformer":
-                embedding = self.model.encode(text)
-                return embedding.tolist()
+                return embedding
             elif self.model_type == "qwen":
                 # For Qwen, we can use the transformer layers for embeddings
-                inputs = self.tokenizer(text, return_tensors="pt", truncation=True, padding=True, max_length=512)
+                inputs = tokenizer(text, return_tensors="pt", truncation=True, padding=True, max_length=512)
                 
                 with torch.no_grad():
-                    outputs = self.model(**inputs, output_hidden_states=True)
+                    outputs = model(**inputs, output_hidden_states=True)
                     # Use the last hidden state as the embedding
                     hidden_states = outputs.hidden_states[-1]  # Last layer
                     # Average over sequence length
                     embedding = torch.mean(hidden_states, dim=1).squeeze().numpy()
                 
-                return embedding.tolist()
-        except Exception as e:
-            logger.error(f"Error encoding text: {str(e)}")
-            raise
-    
-    def encode_texts(self, texts: List[str]) -> List[List[float]]:
-        """
-        Encode multiple text strings into embedding vectors
-        """
-        try:
-            if self.model_type == "gpt2":
-                # For GPT-2, encode texts one by one
-                embeddings = []
-                for text in texts:
-                    embedding = self.encode_text(text)
-                    embeddings.append(embedding)
-                return embeddings
-            elif self.model_type == "sentence_transformer":
-                embeddings = self.model.encode(texts)
-                return [embedding.tolist() for embedding in embeddings]
-            elif self.model_type == "qwen":
-                # For Qwen, encode texts one by one
-                embeddings = []
-                for text in texts:
-                    embedding = self.encode_text(text)
-                    embeddings.append(embedding)
-                return embeddings
-        except Exception as e:
-            logger.error(f"Error encoding texts: {str(e)}")
-            raise
+                return embedding
+        raise ValueError(f"Unsupported model type: {self.model_type}")
     
     def cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
         """
         Calculate cosine similarity between two embedding vectors
         """
-        v1 = np.array(vec1)
-        v2 = np.array(vec2)
-        
-        # Normalize the vectors
-        v1_norm = v1 / np.linalg.norm(v1)
-        v2_norm = v2 / np.linalg.norm(v2)
+        v1 = np.asarray(vec1, dtype=np.float32)
+        v2 = np.asarray(vec2, dtype=np.float32)
         
         # Calculate cosine similarity
-        similarity = np.dot(v1_norm, v2_norm)
-        return float(similarity)
+        denominator = np.linalg.norm(v1) * np.linalg.norm(v2)
+        if denominator == 0:
+            return 0.0
+        return float(np.dot(v1, v2) / denominator)
     
     def calculate_similarity_matrix(self, query_embedding: List[float], 
-                                  candidate_embeddings: List[List[float]]) -> List[float]:
+                                  engine: SimilarityEngine) -> List[float]:
         """
-        Calculate similarity between a query embedding and multiple candidate embeddings
+        Calculate similarity between a query embedding and every candidate held by a
+        caller-owned similarity engine, in the engine's candidate order
         """
-        similarities = []
-        for candidate_embedding in candidate_embeddings:
-            similarity = self.cosine_similarity(query_embedding, candidate_embedding)
-            similarities.append(similarity)
-        return similarities
+        return engine.score(query_embedding).tolist()
     
     def get_embedding_dimension(self) -> int:
         """
@@ -0,0 +1,128 @@
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class ExplanationCache:
+    # Generated explanations on local disk, keyed by a fingerprint of everything that
+    # determines the prompt and the decoding, so repeat match runs skip generation
+    def __init__(self, path: str, max_entries: int = 100000, ttl_seconds: float = 0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        # 0 keeps entries until they are evicted for space
+        self.ttl_seconds = ttl_seconds
+
+        # One connection shared by all threads, serialized by the lock
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS explanations ("
+                "key TEXT PRIMARY KEY, explanation TEXT NOT NULL, "
+                "created_at REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS explanations_last_used ON explanations (last_used)"
+            )
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(prompt: str, model_name: str, generation_params: Dict[str, Any]) -> str:
+        """
+        Build the fingerprint of one explanation from the exact prompt text, so matches that
+        produce the same prompt share an entry and any difference in it gets a new one
+        """
+        fingerprint = json.dumps([prompt, model_name, generation_params], sort_keys=True)
+        return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, str]:
+        """
+        Look up explanations for the given keys, returning only those found and not expired
+        """
+        if not keys:
+            return {}
+
+        now = time.time()
+        found = {}
+        with self._lock, self._connection:
+            # Stay below SQLite's limit on bound parameters
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._connection.execute(
+                    f"SELECT key, explanation, created_at FROM explanations WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                for key, explanation, created_at in rows:
+                    if self.ttl_seconds <= 0 or now - created_at <= self.ttl_seconds:
+                        found[key] = explanation
+
+            if found:
+                self._connection.executemany(
+                    "UPDATE explanations SET last_used = ? WHERE key = ?", [(now, key) for key in found]
+                )
+            self.hits += len(found)
+            self.misses += len(set(keys)) - len(found)
+        return found
+
+    def put_many(self, items: List[Tuple[str, str]]) -> None:
+        """
+        Store (key, explanation) pairs, then drop expired entries and the least recently
+        used ones beyond the size limit
+        """
+        if not items:
+            return
+
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO explanations (key, explanation, created_at, last_used) VALUES (?, ?, ?, ?)",
+                [(key, explanation, now, now) for key, explanation in items]
+            )
+
+            evicted = 0
+            if self.ttl_seconds > 0:
+                evicted += self._connection.execute(
+                    "DELETE FROM explanations WHERE created_at < ?", (now - self.ttl_seconds,)
+                ).rowcount
+            count = self._connection.execute("SELECT COUNT(*) FROM explanations").fetchone()[0]
+            if count > self.max_entries:
+                evicted += self._connection.execute(
+                    "DELETE FROM explanations WHERE key IN "
+                    "(SELECT key FROM explanations ORDER BY last_used LIMIT ?)",
+                    (count - self.max_entries,)
+                ).rowcount
+            self.evictions += evicted
+
+    def clear(self) -> None:
+        """
+        Drop every cached explanation
+        """
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM explanations")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get hit, miss and size counters
+        """
+        with self._lock:
+            entries = self._connection.execute("SELECT COUNT(*) FROM explanations").fetchone()[0]
+            return {
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
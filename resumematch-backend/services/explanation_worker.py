@@ -0,0 +1,137 @@
+from typing import Any, Dict, List, Optional
+import logging
+import queue
+import threading
+from models.candidate import MatchAnalysis
+from services.matching_service import MatchingService
+
+logger = logging.getLogger(__name__)
+
+# Explanation status values carried on MatchAnalysis.explanation_status
+EXPLANATION_PENDING = "pending"
+EXPLANATION_READY = "ready"
+EXPLANATION_FAILED = "failed"
+
+class ExplanationWorker:
+    def __init__(self, matching_service: MatchingService, num_workers: int = 1, batch_size: int = 16):
+        self.matching_service = matching_service
+        self.num_workers = num_workers
+        # Most queued explanations handed to one batched generation call
+        self.batch_size = batch_size
+
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self._threads = []
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.batches = 0
+
+    def start(self) -> None:
+        """
+        Start the worker threads if they are not running yet
+        """
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.num_workers):
+                thread = threading.Thread(target=self._run, name=f"explanation-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self) -> None:
+        """
+        Stop the worker threads after the explanation they are currently generating
+        """
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(None)
+        for thread in threads:
+            thread.join()
+
+    def submit(self, match_analysis: MatchAnalysis, resume_content: str, job_description: str,
+               followers: List[MatchAnalysis] = None) -> None:
+        """
+        Queue an LLM explanation for a scored match. The match is marked pending and
+        updated in place when the explanation is ready or has failed. Followers (matches
+        of near-duplicate resumes) receive the same explanation without another LLM call.
+        """
+        self.start()
+        followers = followers or []
+        for analysis in [match_analysis] + followers:
+            analysis.explanation_status = EXPLANATION_PENDING
+        self.submitted += 1
+        self._queue.put({
+            "match_analysis": match_analysis,
+            "followers": followers,
+            "resume_content": resume_content,
+            "job_description": job_description,
+        })
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get queue depth and completion counters
+        """
+        return {
+            "workers": len(self._threads),
+            "queued": self._queue.qsize(),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "batches": self.batches,
+        }
+
+    def _run(self) -> None:
+        """
+        Generate explanations for queued matches until a stop sentinel is received, taking
+        everything already queued (up to the batch size) into one batched generation call
+        """
+        while True:
+            tasks = [self._queue.get()]
+            while tasks[-1] is not None and len(tasks) < self.batch_size:
+                try:
+                    tasks.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stopping = tasks[-1] is None
+            if stopping:
+                tasks.pop()
+            if tasks:
+                self._explain(tasks)
+            if stopping:
+                return
+
+    def _explain(self, tasks: List[Dict[str, Any]]) -> None:
+        """
+        Generate and store the explanations for a batch of queued matches
+        """
+        try:
+            explanations = self.matching_service.explain_matches([
+                (task["resume_content"], task["job_description"], task["match_analysis"].match_score.overall_score)
+                for task in tasks
+            ])
+            status = EXPLANATION_READY
+        except Exception as e:
+            # The rule-based explanations set at scoring time stay in place
+            logger.error(f"Error generating match explanations: {str(e)}")
+            explanations = [None] * len(tasks)
+            status = EXPLANATION_FAILED
+
+        self.batches += 1
+        for task, explanation in zip(tasks, explanations):
+            match_analysis = task["match_analysis"]
+            if explanation is not None:
+                match_analysis.explanation = explanation
+            match_analysis.explanation_status = status
+            if status == EXPLANATION_READY:
+                self.completed += 1
+            else:
+                self.failed += 1
+
+            for follower in task["followers"]:
+                follower.explanation = match_analysis.explanation
+                follower.explanation_status = match_analysis.explanation_status
@@ -1,20 +1,24 @@
-from transformers import AutoTokenizer, AutoModelForCausalLM
 import torch
-from typing import Dict, List
+from typing import Dict, List, Tuple
 import logging
 import re
+from services.model_registry import model_registry, CAUSAL_LM
+from services.batched_generation import plan_batches, generate_batch
+from config import config
 
 logger = logging.getLogger(__name__)
 
 class LLMService:
     def __init__(self, model_name: str = "openai-community/gpt2"):
-        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-        # Add padding token if it doesn't exist
-        if self.tokenizer.pad_token is None:
-            self.tokenizer.pad_token = self.tokenizer.eos_token
-        
-        self.model = AutoModelForCausalLM.from_pretrained(model_name)
-        self.model.eval()
+        self.model_name = model_name
+        # Shares weights with the embedding backend when it uses the same model
+        self._handle = model_registry.acquire(CAUSAL_LM, model_name)
+    
+    def close(self) -> None:
+        """
+        Release this service's reference to the shared model
+        """
+        self._handle.release()
     
     def generate_match_explanation(self, resume_content: str, job_description: str, match_score: float) -> str:
         """
@@ -31,19 +35,20 @@ Match Score: {match_score:.2f}/1.0
 Explanation:"""
         
         try:
-            inputs = self.tokenizer.encode(prompt, return_tensors="pt", truncation=True, max_length=1024)
-            
-            with torch.no_grad():
-                outputs = self.model.generate(
-                    inputs, 
-                    max_length=len(inputs[0]) + 100,
-                    temperature=0.7,
-                    pad_token_id=self.tokenizer.eos_token_id,
-                    do_sample=True,
-                    num_return_sequences=1
-                )
-            
-            response = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
+            with self._handle.use() as (model, tokenizer):
+                inputs = tokenizer.encode(prompt, return_tensors="pt", truncation=True, max_length=1024)
+                
+                with torch.no_grad():
+                    outputs = model.generate(
+                        inputs, 
+                        max_length=len(inputs[0]) + 100,
+                        temperature=0.7,
+                        pad_token_id=tokenizer.eos_token_id,
+                        do_sample=True,
+                        num_return_sequences=1
+                    )
+                
+                response = tokenizer.decode(outputs[0], skip_special_tokens=True)
             # Extract just the generated part (after the prompt)
             explanation = response[len(prompt):].strip()
             # Clean up the response to get a coherent explanation
@@ -59,39 +64,36 @@ Explanation:"""
         """
         Analyze skill gaps between resume and job requirements
         """
-        resume_skills_str = ", ".join(resume_skills)
-        required_skills_str = ", ".join(required_skills)
-        
-        prompt = f"""Analyze the skill gaps for this candidate.
+        return self.generate_skill_gap_analyses([(resume_skills, required_skills)])[0]
+    
+    def generate_skill_gap_analyses(self, skill_pairs: List[Tuple[List[str], List[str]]]) -> List[str]:
+        """
+        Analyze skill gaps for many (resume skills, required skills) pairs in batched
+        generate calls, returned in input order
+        """
+        prompts = []
+        for resume_skills, required_skills in skill_pairs:
+            resume_skills_str = ", ".join(resume_skills)
+            required_skills_str = ", ".join(required_skills)
+            
+            prompts.append(f"""Analyze the skill gaps for this candidate.
         
 Candidate Skills: {resume_skills_str}
         
 Required Skills: {required_skills_str}
         
-Gap Analysis:"""
+Gap Analysis:""")
         
         try:
-            inputs = self.tokenizer.encode(prompt, return_tensors="pt", truncation=True, max_length=1024)
-            
-            with torch.no_grad():
-                outputs = self.model.generate(
-                    inputs, 
-                    max_length=len(inputs[0]) + 100,
-                    temperature=0.7,
-                    pad_token_id=self.tokenizer.eos_token_id,
-                    do_sample=True,
-                    num_return_sequences=1
-                )
-            
-            response = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
-            analysis = response[len(prompt):].strip()
-            analysis = self._clean_generated_text(analysis)
-            
-            return analysis
+            analyses = self._generate_many(prompts, max_new_tokens=100, temperature=0.7)
+            return [self._clean_generated_text(analysis) for analysis in analyses]
         except Exception as e:
             logger.error(f"Error generating skill gap analysis: {str(e)}")
-            missing_skills = set(required_skills) - set(resume_skills)
-            return f"The candidate is missing these required skills: {', '.join(missing_skills)}. Consider upskilling in these areas."
+            fallbacks = []
+            for resume_skills, required_skills in skill_pairs:
+                missing_skills = set(required_skills) - set(resume_skills)
+                fallbacks.append(f"The candidate is missing these required skills: {', '.join(missing_skills)}. Consider upskilling in these areas.")
+            return fallbacks
     
     def generate_hiring_recommendation(self, match_score: float, experience_years: float = None) -> str:
         """
@@ -105,19 +107,20 @@ Match Score: {match_score:.2f}/1.0
 Recommendation:"""
         
         try:
-            inputs = self.tokenizer.encode(prompt, return_tensors="pt", truncation=True, max_length=1024)
-            
-            with torch.no_grad():
-                outputs = self.model.generate(
-                    inputs, 
-                    max_length=len(inputs[0]) + 80,
-                    temperature=0.6,
-                    pad_token_id=self.tokenizer.eos_token_id,
-                    do_sample=True,
-                    num_return_sequences=1
-                )
-            
-            response = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
+            with self._handle.use() as (model, tokenizer):
+                inputs = tokenizer.encode(prompt, return_tensors="pt", truncation=True, max_length=1024)
+                
+                with torch.no_grad():
+                    outputs = model.generate(
+                        inputs, 
+                        max_length=len(inputs[0]) + 80,
+                        temperature=0.6,
+                        pad_token_id=tokenizer.eos_token_id,
+                        do_sample=True,
+                        num_return_sequences=1
+                    )
+                
+                response = tokenizer.decode(outputs[0], skip_special_tokens=True)
             recommendation = response[len(prompt):].strip()
             recommendation = self._clean_generated_text(recommendation)
             
@@ -133,6 +136,28 @@ Recommendation:"""
             else:
                 return "Not recommended for this position."
     
+    def _generate_many(self, prompts: List[str], max_new_tokens: int, temperature: float) -> List[str]:
+        """
+        Generate a continuation of every prompt in left-padded, length-sorted batches sized
+        to the token budget, returning only the new text in input order
+        """
+        if not prompts:
+            return []
+        
+        with self._handle.use() as (model, tokenizer):
+            input_ids = tokenizer(prompts, truncation=True, max_length=1024)["input_ids"]
+            
+            results = [None] * len(prompts)
+            batches = plan_batches(
+                [len(ids) for ids in input_ids], max_new_tokens,
+                config.GENERATION_TOKEN_BUDGET, config.GENERATION_MAX_BATCH_SIZE
+            )
+            for indices in batches:
+                texts = generate_batch(model, tokenizer, [input_ids[i] for i in indices], max_new_tokens, temperature)
+                for i, text in zip(indices, texts):
+                    results[i] = text
+        return results
+    
     def _clean_generated_text(self, text: str) -> str:
         """
         Clean up generated text to remove artifacts and make it more coherent
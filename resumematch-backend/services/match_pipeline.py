@@ -0,0 +1,180 @@
+from typing import Dict, List, Optional, Tuple
+import logging
+import numpy as np
+from models.candidate import MatchAnalysis
+from models.job import Job
+from models.resume import Resume
+from services.matching_service import MatchingService
+from services.vector_index import VectorIndex
+from services.similarity_engine import SimilarityEngine
+from services.skill_matrix import SkillMatrix
+from services.explanation_worker import ExplanationWorker
+from services.near_duplicate_index import NearDuplicateIndex
+from config import config
+
+logger = logging.getLogger(__name__)
+
+class MatchPipeline:
+    def __init__(self, matching_service: MatchingService, resume_index: VectorIndex,
+                 skill_matrix: SkillMatrix, explanation_worker: ExplanationWorker,
+                 near_duplicate_index: Optional[NearDuplicateIndex] = None):
+        self.matching_service = matching_service
+        self.resume_index = resume_index
+        self.skill_matrix = skill_matrix
+        self.explanation_worker = explanation_worker
+        self.near_duplicate_index = near_duplicate_index
+
+    def run(self, job: Job, resumes: Dict[str, Resume], shortlist_size: int,
+            explain_top_k: int) -> Tuple[List[Tuple[str, MatchAnalysis]], Dict[str, int]]:
+        """
+        Match resumes to a job in three stages: cheap retrieval keeps the top shortlist_size,
+        full scoring runs on the shortlist only, and LLM explanations are queued for the
+        top explain_top_k. Returns (resume id, analysis) pairs sorted by overall score and
+        the number of candidates each stage considered. Explanations are filled in by the
+        explanation worker after this returns. Near-duplicate resumes are represented by one
+        member of their cluster; the others get a copy of its analysis and explanation.
+        """
+        pool_size = len(resumes)
+        resumes = self._unique(resumes)
+        unique_count = len(resumes)
+
+        # Only one resume per near-duplicate cluster goes through the stages
+        groups = self._near_duplicate_groups(resumes)
+        resumes = {resume_id: resumes[resume_id] for resume_id in groups}
+
+        # Stage 1: nearest vectors plus best skills scores for the whole pool from the skill matrix
+        shortlist, retrieved = self._retrieve(job, resumes, shortlist_size)
+
+        # Stage 2: full scoring on the shortlist, without LLM calls
+        scored = []
+        for resume_id in shortlist:
+            resume = resumes[resume_id]
+            match_analysis = self.matching_service.calculate_match_score(
+                resume_content=resume.content,
+                job_description=job.description,
+                resume_skills=resume.extracted_skills,
+                job_required_skills=job.required_skills,
+                job_preferred_skills=job.preferred_skills,
+                resume_experience=resume.extracted_experience,
+                resume_embedding=resume.embedding,
+                job_embedding=job.embedding,
+                generate_explanation=False,
+                job_profile=job.profile,
+                resume_signal_mask=resume.bonus_signal_mask
+            )
+            scored.append((resume_id, match_analysis))
+        scored.sort(key=lambda item: item[1].match_score.overall_score, reverse=True)
+
+        # Cluster members reuse their representative's analysis
+        results = []
+        followers: Dict[str, List[MatchAnalysis]] = {}
+        for resume_id, match_analysis in scored:
+            results.append((resume_id, match_analysis))
+            for member_id in groups[resume_id][1:]:
+                member_analysis = match_analysis.model_copy(update={"near_duplicate_of": resume_id})
+                followers.setdefault(resume_id, []).append(member_analysis)
+                results.append((member_id, member_analysis))
+
+        # Stage 3: LLM explanations for the best candidates only, generated in the background
+        explained = scored[:max(explain_top_k, 0)]
+        for resume_id, match_analysis in explained:
+            self.explanation_worker.submit(
+                match_analysis, resumes[resume_id].content, job.description,
+                followers=followers.get(resume_id)
+            )
+
+        stages = {
+            "pool": pool_size,
+            "unique": unique_count,
+            "clusters": len(groups),
+            "retrieved": retrieved,
+            "shortlisted": len(shortlist),
+            "scored": len(scored),
+            "explained": len(explained),
+            "reused": len(results) - len(scored),
+        }
+        return results, stages
+
+    def _unique(self, resumes: Dict[str, Resume]) -> Dict[str, Resume]:
+        """
+        Keep the first resume of each content hash, so each distinct document is scored once.
+        Resumes without a content hash (no extractable text) are never collapsed.
+        """
+        unique = {}
+        seen_hashes = set()
+        for resume_id, resume in resumes.items():
+            if resume.content_hash is not None:
+                if resume.content_hash in seen_hashes:
+                    continue
+                seen_hashes.add(resume.content_hash)
+            unique[resume_id] = resume
+        return unique
+
+    def _near_duplicate_groups(self, resumes: Dict[str, Resume]) -> Dict[str, List[str]]:
+        """
+        Group resumes into near-duplicate clusters keyed by the member to score
+        """
+        if self.near_duplicate_index is None:
+            return {resume_id: [resume_id] for resume_id in resumes}
+        return self.near_duplicate_index.group(list(resumes.keys()))
+
+    def _retrieve(self, job: Job, resumes: Dict[str, Resume], shortlist_size: int) -> Tuple[List[str], int]:
+        """
+        Rank resumes with a cheap first-stage score and keep the top shortlist_size. Candidates
+        are the nearest resumes in the vector index together with the best skills scores in the
+        pool, so a strong skills match is considered even when its vector is not a neighbour.
+        A shortlist_size of 0 or less keeps every resume.
+        """
+        if shortlist_size <= 0 or shortlist_size >= len(resumes):
+            return list(resumes.keys()), len(resumes)
+
+        # Over-fetch from both sources so the combined score can reorder them
+        depth = shortlist_size * config.MATCH_RETRIEVAL_MULTIPLIER
+        similarities = {
+            resume_id: similarity
+            for resume_id, similarity in self.resume_index.search(job.embedding, depth)
+            if resume_id in resumes
+        }
+
+        # Skills scores for every registered resume in one sparse product; matched and
+        # missing skill lists are only built in stage 2 for the shortlist
+        skills_scores = self.matching_service.calculate_skills_scores(self.skill_matrix, job.profile)
+        resume_ids = list(resumes.keys())
+        pool_scores = np.zeros(len(resume_ids), dtype=np.float32)
+        for i, resume_id in enumerate(resume_ids):
+            row = self.skill_matrix.row_index(resume_id)
+            if row is not None and row < len(skills_scores):
+                pool_scores[i] = skills_scores[row]
+
+        unindexed = sum(1 for resume_id in resume_ids if resume_id not in self.resume_index)
+        if unindexed:
+            logger.warning(f"{unindexed} resumes are not in the vector index; they are retrieved by skills score only")
+
+        # Resumes found by skills alone get their similarity from the stored vectors
+        for i in SimilarityEngine.top_indices(pool_scores, depth):
+            resume_id = resume_ids[i]
+            if resume_id not in similarities:
+                similarities[resume_id] = self._similarity(job, resumes[resume_id])
+
+        # Combine the two signals with the same relative weights as the full score
+        total_weight = config.SKILLS_WEIGHT + config.ROLE_FIT_WEIGHT
+        skill_weight = config.SKILLS_WEIGHT / total_weight if total_weight else 0.5
+        skills_by_id = dict(zip(resume_ids, pool_scores.tolist()))
+
+        ranked = []
+        for resume_id, similarity in similarities.items():
+            first_stage_score = skill_weight * skills_by_id[resume_id] + (1 - skill_weight) * similarity
+            ranked.append((first_stage_score, resume_id))
+
+        ranked.sort(key=lambda item: item[0], reverse=True)
+        return [resume_id for _, resume_id in ranked[:shortlist_size]], len(similarities)
+
+    @staticmethod
+    def _similarity(job: Job, resume: Resume) -> float:
+        """
+        Cosine similarity of the stored job and resume vectors, 0 when either is missing
+        """
+        if job.embedding is None or resume.embedding is None:
+            return 0.0
+        vectors = SimilarityEngine.normalize([job.embedding, resume.embedding])
+        return float(vectors[0] @ vectors[1])
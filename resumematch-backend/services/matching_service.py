@@ -1,57 +1,103 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from models.candidate import MatchScore, MatchAnalysis
+from models.job import JobProfile
 from nlp.skill_extractor import SkillExtractor
 from nlp.embedding_extractor import EmbeddingExtractor
+from nlp.bonus_signals import BonusSignalEngine
+from nlp.profile_extractor import ProfileExtractor, parse_duration_years
 from services.embedding_service import EmbeddingService
 from services.qwen_service import QwenService
+from services.skill_matrix import SkillMatrix
+from services.skill_similarity import SkillSimilarityTable
 from config import config
+import numpy as np
 import logging
+import re
+import threading
 
 logger = logging.getLogger(__name__)
 
+# Matches requirements like "3+ years", "5-7 yrs", "2 years of experience"
+EXPERIENCE_REQUIREMENT_PATTERN = re.compile(
+    r'(\d+(?:\.\d+)?)\s*(?:\+|(?:-|to)\s*\d+(?:\.\d+)?)?\s*(?:years?|yrs?)', re.IGNORECASE
+)
+ENTRY_LEVEL_PATTERN = re.compile(r'\b(?:entry[\s-]level|graduate|junior|no experience)\b', re.IGNORECASE)
+
 class MatchingService:
+    REQUIRED_SKILLS_WEIGHT = 0.7
+    PREFERRED_SKILLS_WEIGHT = 0.3
+    
     def __init__(self, model_type: str = "sentence_transformer"):
         self.embedding_service = EmbeddingService(model_type=model_type)
         self.embedding_extractor = EmbeddingExtractor(self.embedding_service)
         self.skill_extractor = SkillExtractor()
+        self.bonus_signals = BonusSignalEngine()
+        self.profile_extractor = ProfileExtractor()
+        self.skill_similarity = SkillSimilarityTable(
+            self.embedding_service, self.skill_extractor.taxonomy, config.TRANSFERABLE_SKILL_THRESHOLD
+        )
         self.model_type = model_type
         # Initialize Qwen service only when needed to avoid startup issues
         self._qwen_service = None
+        self._qwen_lock = threading.Lock()
     
     @property
     def qwen_service(self):
         if self._qwen_service is None:
-            from services.qwen_service import QwenService
-            self._qwen_service = QwenService()
+            # Explanation workers may race to load the model
+            with self._qwen_lock:
+                if self._qwen_service is None:
+                    from services.qwen_service import QwenService
+                    self._qwen_service = QwenService()
         return self._qwen_service
     
     def calculate_match_score(self, resume_content: str, job_description: str, 
                              resume_skills: List[str], job_required_skills: List[str],
                              job_preferred_skills: List[str], 
-                             resume_experience: List[dict] = None) -> MatchAnalysis:
-        """
-        Calculate comprehensive match score between resume and job description
-        """
+                             resume_experience: List[dict] = None,
+                             resume_embedding: np.ndarray = None,
+                             job_embedding: np.ndarray = None,
+                             generate_explanation: bool = True,
+                             job_profile: JobProfile = None,
+                             resume_signal_mask: int = None) -> MatchAnalysis:
+        """
+        Calculate comprehensive match score between resume and job description.
+        Embeddings and bonus-signal masks stored at ingest time are used when given,
+        otherwise they are computed here.
+        A compiled job profile should be passed when scoring many resumes against one job.
+        With generate_explanation=False the LLM is skipped and a rule-based explanation is used.
+        """
+        if job_profile is None:
+            job_profile = self.compile_job_profile(
+                job_description, job_required_skills, job_preferred_skills, job_embedding=job_embedding
+            )
+        
         # Extract embeddings
-        resume_embedding = self.embedding_extractor.extract_embeddings_from_resume(resume_content)
-        job_embedding = self.embedding_extractor.extract_embeddings_from_job_description(job_description)
+        if resume_embedding is None:
+            resume_embedding = self.embedding_extractor.extract_embeddings_from_resume(resume_content)
+        if job_embedding is None:
+            if job_profile.embedding is None:
+                job_profile.embedding = self.embedding_extractor.extract_embeddings_from_job_description(job_description)
+            job_embedding = job_profile.embedding
         
         # Calculate base semantic similarity
         semantic_similarity = self.embedding_extractor.compute_similarity(resume_embedding, job_embedding)
         
         # Calculate skills score
-        skills_match_result = self._calculate_skills_score(
-            resume_skills, job_required_skills, job_preferred_skills
-        )
+        skills_match_result = self._calculate_skills_score(resume_skills, job_profile)
         
         # Calculate experience score
-        experience_score = self._calculate_experience_score(resume_experience, job_description)
+        experience_score = self._calculate_experience_score(resume_experience, job_profile)
         
         # Calculate role fit score
-        role_fit_score = self._calculate_role_fit_score(resume_content, job_description)
+        role_fit_score = self._calculate_role_fit_score(
+            resume_content, job_description, resume_embedding, job_embedding
+        )
         
         # Calculate bonus signals score
-        bonus_signals_score = self._calculate_bonus_signals_score(resume_content, job_description)
+        if resume_signal_mask is None:
+            resume_signal_mask = self.bonus_signals.scan(resume_content)
+        bonus_signals_score = self._calculate_bonus_signals_score(resume_signal_mask, job_profile)
         
         # Calculate weighted overall score
         overall_score = (
@@ -70,6 +116,13 @@ class MatchingService:
             overall_score=overall_score
         )
         
+        if generate_explanation:
+            explanation = self._generate_explanation_with_qwen(
+                resume_content, job_description, overall_score
+            )
+        else:
+            explanation = self._generate_rule_based_explanation(overall_score)
+        
         # Generate match analysis with Qwen explanations
         match_analysis = MatchAnalysis(
             match_score=match_score,
@@ -78,38 +131,75 @@ class MatchingService:
             transferable_skills=skills_match_result['transferable_skills'],
             experience_summary=skills_match_result['experience_summary'],
             role_recommendation=self._generate_role_recommendation(overall_score),
-            explanation=self._generate_explanation_with_qwen(
-                resume_content, job_description, overall_score
-            )
+            explanation=explanation
         )
         
         return match_analysis
     
-    def _calculate_skills_score(self, resume_skills: List[str], 
-                               job_required_skills: List[str], 
-                               job_preferred_skills: List[str]) -> Dict[str, Any]:
+    def compile_job_profile(self, job_description: str, job_required_skills: List[str],
+                            job_preferred_skills: List[str], experience_required: str = None,
+                            job_embedding: np.ndarray = None) -> JobProfile:
+        """
+        Precompute everything that depends only on the job, so it is done once per job
+        instead of once per resume
+        """
+        normalized_description = job_description.lower()
+        certification_mask = self.bonus_signals.job_certification_mask(normalized_description)
+        # Map aliases (e.g. "k8s") to the canonical names used for extracted resume skills
+        taxonomy = self.skill_extractor.taxonomy.compiled
+        required_skills = [taxonomy.canonicalize(skill) for skill in job_required_skills]
+        preferred_skills = [taxonomy.canonicalize(skill) for skill in job_preferred_skills]
+        
+        return JobProfile(
+            normalized_description=normalized_description,
+            required_skills=required_skills,
+            preferred_skills=preferred_skills,
+            required_skill_set=set(required_skills),
+            preferred_skill_set=set(preferred_skills),
+            certification_keywords=set(self.bonus_signals.keywords_in(certification_mask)),
+            certification_mask=certification_mask,
+            experience_years=self._parse_experience_requirement(experience_required),
+            embedding=job_embedding
+        )
+    
+    def _parse_experience_requirement(self, experience_required: Optional[str]) -> Optional[float]:
+        """
+        Parse a requirement such as "3+ years" or "Entry level" into years
+        """
+        if not experience_required:
+            return None
+        
+        match = EXPERIENCE_REQUIREMENT_PATTERN.search(experience_required)
+        if match:
+            return float(match.group(1))
+        if ENTRY_LEVEL_PATTERN.search(experience_required):
+            return 0.0
+        return None
+    
+    def _calculate_skills_score(self, resume_skills: List[str], job_profile: JobProfile) -> Dict[str, Any]:
         """
         Calculate skills match score
         """
         resume_skills_lower = [skill.lower() for skill in resume_skills]
-        job_required_skills_lower = [skill.lower() for skill in job_required_skills]
-        job_preferred_skills_lower = [skill.lower() for skill in job_preferred_skills]
+        resume_skill_set = set(resume_skills_lower)
+        job_required_skills_lower = job_profile.required_skills
+        job_preferred_skills_lower = job_profile.preferred_skills
         
         # Find matched required skills
-        matched_required = [skill for skill in job_required_skills_lower if skill in resume_skills_lower]
+        matched_required = [skill for skill in job_required_skills_lower if skill in resume_skill_set]
         
         # Find matched preferred skills
-        matched_preferred = [skill for skill in job_preferred_skills_lower if skill in resume_skills_lower]
+        matched_preferred = [skill for skill in job_preferred_skills_lower if skill in resume_skill_set]
         
         # Find missing required skills
-        missing_required = [skill for skill in job_required_skills_lower if skill not in resume_skills_lower]
+        missing_required = [skill for skill in job_required_skills_lower if skill not in resume_skill_set]
         
         # Calculate scores
-        required_skills_score = len(matched_required) / len(job_required_skills) if job_required_skills else 1.0
-        preferred_skills_score = len(matched_preferred) / len(job_preferred_skills) if job_preferred_skills else 0.0
+        required_skills_score = len(matched_required) / len(job_required_skills_lower) if job_required_skills_lower else 1.0
+        preferred_skills_score = len(matched_preferred) / len(job_preferred_skills_lower) if job_preferred_skills_lower else 0.0
         
         # Weighted skills score (70% required, 30% preferred)
-        skills_score = (required_skills_score * 0.7) + (preferred_skills_score * 0.3)
+        skills_score = (required_skills_score * self.REQUIRED_SKILLS_WEIGHT) + (preferred_skills_score * self.PREFERRED_SKILLS_WEIGHT)
         
         # Identify potential transferable skills (not exact matches but related)
         transferable_skills = self._identify_transferable_skills(resume_skills_lower, job_required_skills_lower)
@@ -119,10 +209,25 @@ class MatchingService:
             "matched_skills": matched_required + matched_preferred,
             "missing_skills": missing_required,
             "transferable_skills": transferable_skills,
-            "experience_summary": f"Matched {len(matched_required)}/{len(job_required_skills)} required skills and {len(matched_preferred)}/{len(job_preferred_skills)} preferred skills"
+            "experience_summary": f"Matched {len(matched_required)}/{len(job_required_skills_lower)} required skills and {len(matched_preferred)}/{len(job_preferred_skills_lower)} preferred skills"
         }
     
-    def _calculate_experience_score(self, resume_experience: List[dict], job_description: str) -> float:
+    def calculate_skills_scores(self, skill_matrix: SkillMatrix, job_profile: JobProfile) -> np.ndarray:
+        """
+        Calculate the skills score of every resume in the skill matrix at once, indexed by
+        matrix row. Gives the same scores as _calculate_skills_score without building the
+        matched and missing skill lists.
+        """
+        required = job_profile.required_skills
+        preferred = job_profile.preferred_skills
+        counts = skill_matrix.match_counts_many([required, preferred])
+        
+        required_scores = counts[:, 0] / len(required) if required else np.ones(len(counts), dtype=np.float32)
+        preferred_scores = counts[:, 1] / len(preferred) if preferred else np.zeros(len(counts), dtype=np.float32)
+        
+        return required_scores * self.REQUIRED_SKILLS_WEIGHT + preferred_scores * self.PREFERRED_SKILLS_WEIGHT
+    
+    def _calculate_experience_score(self, resume_experience: List[dict], job_profile: JobProfile) -> float:
         """
         Calculate experience match score
         """
@@ -134,13 +239,16 @@ class MatchingService:
         total_years = 0
         
         for exp in resume_experience:
-            if 'duration' in exp and exp['duration']:
+            if exp.get('years') is not None:
+                # Parsed once at ingest by the profile extractor
+                total_years += exp['years']
+            elif 'duration' in exp and exp['duration']:
                 # Extract years from duration string
                 years = self._extract_years_from_duration(exp['duration'])
                 total_years += years
             
             # Check if experience is relevant to job
-            if self._is_experience_relevant(exp, job_description):
+            if self._is_experience_relevant(exp, job_profile):
                 relevant_experience_count += 1
         
         # Normalize experience score
@@ -154,19 +262,23 @@ class MatchingService:
         
         return experience_score
     
-    def _calculate_role_fit_score(self, resume_content: str, job_description: str) -> float:
+    def _calculate_role_fit_score(self, resume_content: str, job_description: str,
+                                  resume_embedding: np.ndarray = None,
+                                  job_embedding: np.ndarray = None) -> float:
         """
         Calculate how well the resume fits the role
         """
         # Use embedding similarity as primary measure
-        resume_embedding = self.embedding_extractor.extract_embeddings_from_resume(resume_content)
-        job_embedding = self.embedding_extractor.extract_embeddings_from_job_description(job_description)
+        if resume_embedding is None:
+            resume_embedding = self.embedding_extractor.extract_embeddings_from_resume(resume_content)
+        if job_embedding is None:
+            job_embedding = self.embedding_extractor.extract_embeddings_from_job_description(job_description)
         
         similarity = self.embedding_extractor.compute_similarity(resume_embedding, job_embedding)
         
         return similarity
     
-    def _calculate_bonus_signals_score(self, resume_content: str, job_description: str) -> float:
+    def _calculate_bonus_signals_score(self, resume_signal_mask: int, job_profile: JobProfile) -> float:
         """
         Calculate bonus signals that indicate strong fit
         """
@@ -174,27 +286,27 @@ class MatchingService:
         max_bonus_points = 5
         
         # Check for relevant certifications
-        cert_matches = self._check_certifications(resume_content, job_description)
+        cert_matches = self._check_certifications(resume_signal_mask, job_profile)
         if cert_matches:
             bonus_points += 1
         
         # Check for specific company experience
-        company_matches = self._check_company_experience(resume_content, job_description)
+        company_matches = self._check_company_experience(resume_signal_mask)
         if company_matches:
             bonus_points += 1
         
         # Check for advanced education
-        education_matches = self._check_advanced_education(resume_content)
+        education_matches = self._check_advanced_education(resume_signal_mask)
         if education_matches:
             bonus_points += 1
         
         # Check for leadership experience
-        leadership_matches = self._check_leadership_experience(resume_content)
+        leadership_matches = self._check_leadership_experience(resume_signal_mask)
         if leadership_matches:
             bonus_points += 1
         
         # Check for specific achievements
-        achievement_matches = self._check_achievements(resume_content)
+        achievement_matches = self._check_achievements(resume_signal_mask)
         if achievement_matches:
             bonus_points += 1
         
@@ -204,41 +316,43 @@ class MatchingService:
         """
         Extract years from duration string
         """
-        import re
-        # Look for patterns like "2 years", "3 months", "1.5 years", etc.
-        year_patterns = [r'(\d+(?:\.\d+)?)\s*(?:years?|yrs?)', r'(\d+(?:\.\d+)?)\s*(?:months?)']
-        
-        for pattern in year_patterns:
-            matches = re.findall(pattern, duration_str, re.IGNORECASE)
-            if matches:
-                value = float(matches[0])
-                if 'month' in pattern:
-                    return value / 12.0  # Convert months to years
-                return value
-        
-        return 0.0
+        # Handles "2 years", "18 months", "2 years 6 months" and "Jan 2019 - Present"
+        return parse_duration_years(duration_str)
     
-    def _is_experience_relevant(self, experience: dict, job_description: str) -> bool:
+    def _is_experience_relevant(self, experience: dict, job_profile: JobProfile) -> bool:
         """
         Check if experience is relevant to job description
         """
         # Check if role title or company is mentioned in job description
-        role_title = experience.get('role', '').lower()
-        company = experience.get('company', '').lower()
+        role_title = (experience.get('role') or '').lower()
+        company = (experience.get('company') or '').lower()
         
-        job_desc_lower = job_description.lower()
+        job_desc_lower = job_profile.normalized_description
         
-        return role_title in job_desc_lower or company in job_desc_lower
+        # An empty string is a substring of every description, so missing fields never count
+        return bool(role_title and role_title in job_desc_lower) or bool(company and company in job_desc_lower)
     
     def _identify_transferable_skills(self, resume_skills: List[str], job_skills: List[str]) -> List[str]:
         """
         Identify skills that may be transferable even if not exact matches
         """
         transferable = []
+        resume_skill_set = set(resume_skills)
         
         for job_skill in job_skills:
+            if job_skill in resume_skill_set:
+                continue
+            
+            # Table read: resume skills whose embeddings are close to the job skill
+            similar = self.skill_similarity.neighbours(job_skill)
+            if similar is not None:
+                candidates = [(similar[skill], skill) for skill in resume_skills if skill in similar]
+                if candidates:
+                    transferable.append(max(candidates)[1])
+                continue
+            
+            # Table not built yet, or a skill outside the taxonomy
             for resume_skill in resume_skills:
-                # Simple similarity check (could be enhanced with NLP)
                 if self._strings_are_similar(job_skill, resume_skill):
                     transferable.append(resume_skill)
                     break
@@ -257,54 +371,39 @@ class MatchingService:
         # Additional checks could include fuzzy matching
         return False
     
-    def _check_certifications(self, resume_content: str, job_description: str) -> bool:
+    def _check_certifications(self, resume_signal_mask: int, job_profile: JobProfile) -> bool:
         """
         Check for relevant certifications
         """
-        cert_keywords = ['certified', 'certification', 'certificate', 'aws', 'azure', 'gcp', 'ccna', 'pmp', 'scrum', 'saas']
-        resume_lower = resume_content.lower()
-        job_lower = job_description.lower()
-        
-        return any(keyword in resume_lower and keyword in job_lower for keyword in cert_keywords)
+        # Only keywords that the job mentions are in the profile's certification mask
+        return bool(resume_signal_mask & job_profile.certification_mask)
     
-    def _check_company_experience(self, resume_content: str, job_description: str) -> bool:
+    def _check_company_experience(self, resume_signal_mask: int) -> bool:
         """
         Check for experience at companies mentioned in job description
         """
         # This would require more sophisticated entity extraction
         # For now, a simple keyword match
-        resume_lower = resume_content.lower()
-        job_lower = job_description.lower()
-        
-        # Look for common company indicators
-        return 'experience' in resume_lower and ('previous company' in resume_lower or 'worked at' in resume_lower)
+        return bool(resume_signal_mask & self.bonus_signals.company_experience_mask) and \
+            bool(resume_signal_mask & self.bonus_signals.company_indicator_mask)
     
-    def _check_advanced_education(self, resume_content: str) -> bool:
+    def _check_advanced_education(self, resume_signal_mask: int) -> bool:
         """
         Check for advanced education
         """
-        advanced_edu_keywords = ['master', 'phd', 'doctorate', 'mba', 'advanced degree']
-        resume_lower = resume_content.lower()
-        
-        return any(keyword in resume_lower for keyword in advanced_edu_keywords)
+        return bool(resume_signal_mask & self.bonus_signals.advanced_education_mask)
     
-    def _check_leadership_experience(self, resume_content: str) -> bool:
+    def _check_leadership_experience(self, resume_signal_mask: int) -> bool:
         """
         Check for leadership experience
         """
-        leadership_keywords = ['lead', 'managed', 'manager', 'supervisor', 'director', 'head of', 'team lead', 'senior']
-        resume_lower = resume_content.lower()
-        
-        return any(keyword in resume_lower for keyword in leadership_keywords)
+        return bool(resume_signal_mask & self.bonus_signals.leadership_mask)
     
-    def _check_achievements(self, resume_content: str) -> bool:
+    def _check_achievements(self, resume_signal_mask: int) -> bool:
         """
         Check for achievements
         """
-        achievement_keywords = ['achieved', 'improved', 'increased', 'reduced', 'saved', 'generated', 'awarded', 'recognized']
-        resume_lower = resume_content.lower()
-        
-        return any(keyword in resume_lower for keyword in achievement_keywords)
+        return bool(resume_signal_mask & self.bonus_signals.achievement_mask)
     
     def _generate_role_recommendation(self, overall_score: float) -> str:
         """
@@ -319,19 +418,48 @@ class MatchingService:
         else:
             return "Not Recommended - Poor Fit"
     
+    def explain_match(self, resume_content: str, job_description: str, overall_score: float) -> str:
+        """
+        Generate an LLM explanation for an already scored match
+        """
+        return self._generate_explanation_with_qwen(resume_content, job_description, overall_score)
+    
+    def explain_matches(self, matches: List[Tuple[str, str, float]]) -> List[str]:
+        """
+        Generate LLM explanations for many (resume content, job description, overall score)
+        triples in batched generation, returned in input order. Generation errors are raised.
+        """
+        qwen_explanations = self.qwen_service.generate_match_explanations(matches)
+        
+        # Fall back to the rule-based explanation wherever generation came back empty
+        return [
+            qwen_explanation or self._generate_rule_based_explanation(overall_score)
+            for qwen_explanation, (_, _, overall_score) in zip(qwen_explanations, matches)
+        ]
+    
     def _generate_explanation_with_qwen(self, resume_content: str, job_description: str, overall_score: float) -> str:
         """
         Generate explanation using Qwen model for better analysis
         """
         # Use Qwen service to generate a more detailed explanation
-        qwen_explanation = self.qwen_service.generate_match_explanation(
-            resume_content, job_description, overall_score
-        )
+        try:
+            qwen_explanation = self.qwen_service.generate_match_explanation(
+                resume_content, job_description, overall_score
+            )
+        except Exception as e:
+            logger.error(f"Error generating match explanation with Qwen: {str(e)}")
+            qwen_explanation = None
         
         if qwen_explanation:
             return qwen_explanation
         
         # Fallback to rule-based explanation
+        return self._generate_rule_based_explanation(overall_score)
+    
+    def _generate_rule_based_explanation(self, overall_score: float) -> str:
+        """
+        Generate a rule-based explanation from the overall score
+        """
         explanation_parts = []
         
         # Since we can't call _calculate_skills_score without all parameters here,
@@ -0,0 +1,275 @@
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+import logging
+import threading
+import time
+from config import config
+
+logger = logging.getLogger(__name__)
+
+# Kinds of models the registry can load
+CAUSAL_LM = "causal_lm"
+SENTENCE_TRANSFORMER = "sentence_transformer"
+
+ModelKey = Tuple[str, str, str, str]  # (kind, name, dtype, device)
+
+class ModelMemoryBudgetError(RuntimeError):
+    # Raised when a model cannot be loaded without exceeding the memory budget
+    pass
+
+
+class _Entry:
+    def __init__(self, key: ModelKey):
+        self.key = key
+        self.model = None
+        self.tokenizer = None
+        self.resident_bytes = 0
+        # Measured size from the last load, used to budget a reload
+        self.size_hint = 0
+        self.refcount = 0
+        # Operations currently running on the weights; only models with none can be unloaded
+        self.in_use = 0
+        self.loads = 0
+        self.last_used = 0.0
+        # Serializes loading of this model without blocking other models
+        self.load_lock = threading.Lock()
+
+
+class ModelHandle:
+    # Shared reference to a registry model. Weights load on first use and stay resident while an
+    # operation is using them; between operations an idle model may be unloaded to make room.
+    def __init__(self, registry: "ModelRegistry", key: ModelKey):
+        self._registry = registry
+        self.key = key
+        self._released = False
+
+    @contextmanager
+    def use(self) -> Iterator[Tuple[Any, Any]]:
+        """
+        Get (model, tokenizer) for one operation, loading the weights if needed. They are not
+        unloaded until the block exits, so references must not be kept beyond it.
+        """
+        if self._released:
+            raise RuntimeError(f"Model handle for {self.key[1]} was released")
+        try:
+            yield self._registry._begin_use(self.key)
+        finally:
+            self._registry._end_use(self.key)
+
+    def release(self) -> None:
+        """
+        Drop this reference; the registry forgets the model once no handles remain and it is unloaded
+        """
+        if not self._released:
+            self._released = True
+            self._registry._release(self.key)
+
+    def __enter__(self) -> "ModelHandle":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+class ModelRegistry:
+    def __init__(self, memory_budget_bytes: int = 0):
+        # 0 means no budget
+        self.memory_budget_bytes = memory_budget_bytes
+        # Key -> entry, least recently used first
+        self._entries: "OrderedDict[ModelKey, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bytes set aside for models currently being loaded
+        self._reserved_bytes = 0
+        self.evictions = 0
+
+    def acquire(self, kind: str, name: str, dtype: Optional[str] = None, device: str = "cpu") -> ModelHandle:
+        """
+        Get a handle to a shared model and tokenizer, without loading anything yet
+        """
+        if kind not in (CAUSAL_LM, SENTENCE_TRANSFORMER):
+            raise ValueError(f"Unsupported model kind: {kind}")
+
+        key = (kind, name, dtype or "default", device)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry(key)
+            entry.refcount += 1
+        return ModelHandle(self, key)
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Get resident bytes, reference counts and load counts per model
+        """
+        with self._lock:
+            models = [
+                {
+                    "kind": entry.key[0],
+                    "name": entry.key[1],
+                    "dtype": entry.key[2],
+                    "device": entry.key[3],
+                    "loaded": entry.model is not None,
+                    "resident_bytes": entry.resident_bytes,
+                    "refcount": entry.refcount,
+                    "in_use": entry.in_use,
+                    "loads": entry.loads,
+                }
+                for entry in self._entries.values()
+            ]
+        return {
+            "memory_budget_bytes": self.memory_budget_bytes,
+            "resident_bytes": sum(model["resident_bytes"] for model in models),
+            "reserved_bytes": self._reserved_bytes,
+            "evictions": self.evictions,
+            "models": models,
+        }
+
+    def _begin_use(self, key: ModelKey) -> Tuple[Any, Any]:
+        """
+        Mark a model in use and get (model, tokenizer), loading the weights if they are not
+        resident. Room is made before loading, so peak memory never holds an evicted model and
+        its replacement. Every call must be paired with _end_use, including when this raises.
+        """
+        with self._lock:
+            entry = self._entries[key]
+            self._entries.move_to_end(key)
+            entry.last_used = time.monotonic()
+            entry.in_use += 1
+            if entry.model is not None:
+                return entry.model, entry.tokenizer
+
+        with entry.load_lock:
+            if entry.model is None:
+                estimated_bytes = entry.size_hint or self._estimate(key)
+                with self._lock:
+                    self._evict_for(estimated_bytes, exclude=key)
+                    self._reserved_bytes += estimated_bytes
+                try:
+                    model, tokenizer = self._load(key)
+                    resident_bytes = self._measure(model)
+                    with self._lock:
+                        entry.model, entry.tokenizer = model, tokenizer
+                        entry.resident_bytes = entry.size_hint = resident_bytes
+                        entry.loads += 1
+                finally:
+                    with self._lock:
+                        self._reserved_bytes -= estimated_bytes
+                logger.info(f"Loaded {key[1]} ({resident_bytes / 1e6:.0f} MB)")
+                if resident_bytes > estimated_bytes and self._over_budget(0):
+                    logger.warning(f"{key[1]} is larger than estimated; model memory budget exceeded")
+            return entry.model, entry.tokenizer
+
+    def _end_use(self, key: ModelKey) -> None:
+        with self._lock:
+            entry = self._entries[key]
+            entry.in_use = max(entry.in_use - 1, 0)
+            entry.last_used = time.monotonic()
+
+    def _release(self, key: ModelKey) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.refcount = max(entry.refcount - 1, 0)
+
+    def _over_budget(self, incoming_bytes: int) -> bool:
+        """
+        Check whether resident and reserved memory plus incoming bytes exceed the budget
+        """
+        if self.memory_budget_bytes <= 0:
+            return False
+        resident = sum(entry.resident_bytes for entry in self._entries.values())
+        return resident + self._reserved_bytes + incoming_bytes > self.memory_budget_bytes
+
+    def _evict_for(self, incoming_bytes: int, exclude: ModelKey) -> None:
+        """
+        Unload least recently used models until the incoming one fits in the budget. Only models
+        no operation is using are unloaded; if that is not enough, the load is refused.
+        Must be called with the lock held.
+        """
+        if self.memory_budget_bytes <= 0:
+            return
+
+        for key, entry in list(self._entries.items()):
+            if not self._over_budget(incoming_bytes):
+                break
+            if key == exclude or entry.model is None or entry.in_use > 0:
+                continue
+            logger.info(f"Evicting {key[1]} to stay within the model memory budget")
+            entry.model = entry.tokenizer = None
+            entry.resident_bytes = 0
+            self.evictions += 1
+
+        # Entries without handles or weights are just bookkeeping
+        for key in [key for key, entry in self._entries.items() if entry.refcount == 0 and entry.in_use == 0 and entry.model is None and key != exclude]:
+            del self._entries[key]
+
+        if self._over_budget(incoming_bytes):
+            raise ModelMemoryBudgetError(
+                f"Loading {exclude[1]} (~{incoming_bytes / 1e6:.0f} MB) would exceed the model memory budget "
+                f"of {self.memory_budget_bytes / 1e6:.0f} MB; every resident model is in use"
+            )
+
+    def _estimate(self, key: ModelKey) -> int:
+        """
+        Estimate the bytes a model will take once loaded, without loading its weights: causal LMs
+        are instantiated on the meta device from their config, other models are sized by their
+        weight files in the local Hugging Face cache
+        """
+        kind, name, dtype, device = key
+        try:
+            if kind == CAUSAL_LM:
+                import torch
+                from transformers import AutoConfig, AutoModelForCausalLM
+                torch_dtype = getattr(torch, dtype) if dtype != "default" else None
+                with torch.device("meta"):
+                    model = AutoModelForCausalLM.from_config(AutoConfig.from_pretrained(name), torch_dtype=torch_dtype)
+                return self._measure(model)
+
+            from huggingface_hub import snapshot_download
+            from pathlib import Path
+            path = Path(snapshot_download(name, local_files_only=True))
+            return sum(
+                weights.stat().st_size
+                for pattern in ("*.safetensors", "*.bin")
+                for weights in path.rglob(pattern)
+            )
+        except Exception as e:
+            logger.warning(f"Cannot estimate size of {name} before loading: {str(e)}")
+            return 0
+
+    def _load(self, key: ModelKey) -> Tuple[Any, Any]:
+        kind, name, dtype, device = key
+        if kind == SENTENCE_TRANSFORMER:
+            from sentence_transformers import SentenceTransformer
+            return SentenceTransformer(name, device=device), None
+
+        import torch
+        from transformers import AutoTokenizer, AutoModelForCausalLM
+        tokenizer = AutoTokenizer.from_pretrained(name)
+        # Add padding token if it doesn't exist
+        if tokenizer.pad_token is None:
+            tokenizer.pad_token = tokenizer.eos_token
+
+        torch_dtype = getattr(torch, dtype) if dtype != "default" else None
+        model = AutoModelForCausalLM.from_pretrained(name, torch_dtype=torch_dtype)
+        model.to(device)
+        # Set model to evaluation mode
+        model.eval()
+        return model, tokenizer
+
+    @staticmethod
+    def _measure(model) -> int:
+        """
+        Count the bytes held by a model's parameters and buffers
+        """
+        try:
+            tensors = list(model.parameters()) + list(model.buffers())
+            return sum(tensor.numel() * tensor.element_size() for tensor in tensors)
+        except Exception as e:
+            logger.warning(f"Cannot measure model size: {str(e)}")
+            return 0
+
+
+# Process-wide registry shared by every service
+model_registry = ModelRegistry(config.MODEL_MEMORY_BUDGET_BYTES)
@@ -0,0 +1,133 @@
+from typing import Dict, List, Optional, Set, Tuple
+import logging
+import threading
+import numpy as np
+from nlp.minhash import MinHasher
+
+logger = logging.getLogger(__name__)
+
+def optimal_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """
+    Pick (bands, rows per band) whose LSH S-curve crosses 50% closest to the threshold
+    """
+    best = (1, num_perm)
+    best_error = float("inf")
+    for bands in range(1, num_perm + 1):
+        rows = num_perm // bands
+        # Similarity at which two documents become candidates with probability ~1/2
+        error = abs((1.0 / bands) ** (1.0 / rows) - threshold)
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+class NearDuplicateIndex:
+    def __init__(self, threshold: float = 0.85, num_perm: int = 128, shingle_size: int = 5):
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm=num_perm, shingle_size=shingle_size)
+        self.bands, self.rows = optimal_bands(threshold, num_perm)
+
+        self._signatures: Dict[str, np.ndarray] = {}
+        # One bucket table per band: band bytes -> resume ids
+        self._buckets: List[Dict[bytes, Set[str]]] = [{} for _ in range(self.bands)]
+        # Resume id -> cluster root, the earliest added resume of the cluster; roots point to themselves
+        self._parent: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def add(self, resume_id: str, text: str = None, signature: np.ndarray = None) -> Optional[str]:
+        """
+        Index a resume by its text or precomputed signature and add it to the cluster whose
+        representative it is most similar to, at or above the threshold. Returns the cluster
+        representative, or None for a text without shingles, which is not indexed.
+        """
+        if signature is None:
+            signature = self.hasher.signature(text or "")
+        # Every text-less resume has the same signature; they are not duplicates of each other
+        if MinHasher.is_empty(signature):
+            return None
+
+        with self._lock:
+            if resume_id in self._signatures:
+                return self._find(resume_id)
+
+            candidates = set()
+            band_keys = self._band_keys(signature)
+            for band, key in enumerate(band_keys):
+                candidates |= self._buckets[band].get(key, set())
+
+            # Banding only proposes candidates; confirm against each candidate cluster's
+            # representative, so every member is within the threshold of the resume scored
+            # for it, and never bridge two clusters through the new resume
+            best_root, best_similarity = None, self.threshold
+            for root in {self._find(candidate) for candidate in candidates}:
+                similarity = MinHasher.jaccard(signature, self._signatures[root])
+                if similarity >= best_similarity:
+                    best_root, best_similarity = root, similarity
+
+            self._signatures[resume_id] = signature
+            self._parent[resume_id] = best_root or resume_id
+            for band, key in enumerate(band_keys):
+                self._buckets[band].setdefault(key, set()).add(resume_id)
+            return self._parent[resume_id]
+
+    def representative(self, resume_id: str) -> Optional[str]:
+        """
+        Get the representative of the cluster a resume belongs to
+        """
+        with self._lock:
+            if resume_id not in self._parent:
+                return None
+            return self._find(resume_id)
+
+    def group(self, resume_ids: List[str]) -> Dict[str, List[str]]:
+        """
+        Group resumes by cluster, keyed by the resume to score for each group: the cluster
+        representative if it is among the given ids. Otherwise members are regrouped around
+        the first given member within the threshold of it, so a member is never keyed by a
+        resume it is not a near duplicate of. The key is also the first member of its group.
+        """
+        members_by_root: Dict[str, List[str]] = {}
+        with self._lock:
+            for resume_id in resume_ids:
+                root = self._find(resume_id) if resume_id in self._parent else resume_id
+                members_by_root.setdefault(root, []).append(resume_id)
+
+            groups = {}
+            for root, members in members_by_root.items():
+                if root in members:
+                    groups[root] = [root] + [member for member in members if member != root]
+                    continue
+                remaining = members
+                while remaining:
+                    representative = remaining[0]
+                    signature = self._signatures[representative]
+                    close = [
+                        member for member in remaining
+                        if member == representative
+                        or MinHasher.jaccard(signature, self._signatures[member]) >= self.threshold
+                    ]
+                    groups[representative] = close
+                    remaining = [member for member in remaining if member not in close]
+        return groups
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            roots = [self._find(resume_id) for resume_id in self._parent]
+        return {
+            "documents": len(roots),
+            "clusters": len(set(roots)),
+            "bands": self.bands,
+            "rows_per_band": self.rows,
+        }
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def _find(self, resume_id: str) -> str:
+        """
+        Find the cluster root with path halving. Must be called with the lock held.
+        """
+        parent = self._parent
+        while parent[resume_id] != resume_id:
+            parent[resume_id] = parent[parent[resume_id]]
+            resume_id = parent[resume_id]
+        return resume_id
@@ -1,6 +1,5 @@
 from typing import Dict, Any, Tuple
 from pathlib import Path
-import tempfile
 import os
 from parsers.pdf_parser import PDFParser
 from parsers.docx_parser import DocxParser
@@ -36,20 +35,22 @@ class ParsingService:
     
     def parse_resume_from_bytes(self, file_bytes: bytes, filename: str) -> Dict[str, Any]:
         """
-        Parse a resume file from bytes and extract its content
+        Parse a resume file from bytes and extract its content, without touching the disk
         """
         file_extension = Path(filename).suffix.lower()
         
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as temp_file:
-            temp_file.write(file_bytes)
-            temp_file_path = temp_file.name
-        
-        try:
-            parsed_data = self.parse_resume(temp_file_path)
-        finally:
-            os.unlink(temp_file_path)  # Clean up temporary file
+        if file_extension == '.pdf':
+            content, metadata = self.pdf_parser.extract_text_and_metadata_from_bytes(file_bytes)
+        elif file_extension in ['.docx', '.doc']:
+            content, metadata = self.docx_parser.extract_text_and_properties_from_bytes(file_bytes)
+        else:
+            raise ValueError(f"Unsupported file type: {file_extension}")
         
-        return parsed_data
+        return {
+            "content": content,
+            "metadata": metadata,
+            "file_type": file_extension,
+        }
     
     def validate_file_type(self, filename: str) -> bool:
         """
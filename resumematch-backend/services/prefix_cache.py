@@ -0,0 +1,115 @@
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+import copy
+import logging
+import threading
+import torch
+
+logger = logging.getLogger(__name__)
+
+PrefixKey = Tuple[str, Tuple[int, ...]]  # (model name, prefix token ids)
+
+class PrefixKVCache:
+    # Attention key/value states of shared prompt prefixes, so a prompt that starts with a
+    # known preamble only prefills its variable suffix. Bounded by total tensor bytes, LRU.
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[PrefixKey, Tuple[Any, int]]" = OrderedDict()
+        self._current_bytes = 0
+        self._lock = threading.Lock()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, model, model_name: str, prefix_ids: torch.Tensor, batch_size: int = 1):
+        """
+        Get a private copy of the key/value cache for a prefix, prefilling it on a miss, repeated
+        for each row of a batch. generate() appends to the cache it is given, so the stored one
+        is never handed out.
+        """
+        key = (model_name, tuple(prefix_ids[0].tolist()))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if entry is None:
+            # Prefill outside the lock; concurrent misses on one prefix just compute it twice
+            with torch.no_grad():
+                outputs = model(input_ids=prefix_ids, attention_mask=torch.ones_like(prefix_ids), use_cache=True)
+            entry = (outputs.past_key_values, self._measure(outputs.past_key_values))
+            self._store(key, entry)
+
+        return self._expand(copy.deepcopy(entry[0]), batch_size)
+
+    def clear(self) -> None:
+        """
+        Drop every cached prefix
+        """
+        with self._lock:
+            self._entries.clear()
+            self._current_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get hit, miss and size counters
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _store(self, key: PrefixKey, entry: Tuple[Any, int]) -> None:
+        size = entry[1]
+        if size > self.max_bytes:
+            logger.warning("Prompt prefix is larger than the prefix cache; not caching it")
+            return
+
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = entry
+            self._current_bytes += size
+            # Evict least recently used prefixes until within budget
+            while self._current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._current_bytes -= evicted_size
+                self.evictions += 1
+
+    @staticmethod
+    def _expand(past_key_values, batch_size: int):
+        """
+        Repeat a single-row key/value cache along the batch dimension
+        """
+        if batch_size == 1:
+            return past_key_values
+        if hasattr(past_key_values, "batch_repeat_interleave"):
+            past_key_values.batch_repeat_interleave(batch_size)
+            return past_key_values
+        return tuple(
+            tuple(tensor.repeat_interleave(batch_size, dim=0) for tensor in layer)
+            for layer in past_key_values
+        )
+
+    @staticmethod
+    def _measure(past_key_values) -> int:
+        """
+        Count the bytes held by a key/value cache, either a Cache object or legacy nested tuples
+        """
+        if hasattr(past_key_values, "to_legacy_cache"):
+            past_key_values = past_key_values.to_legacy_cache()
+        return sum(
+            tensor.numel() * tensor.element_size()
+            for layer in past_key_values
+            for tensor in layer
+        )
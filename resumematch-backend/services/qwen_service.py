@@ -1,31 +1,20 @@
-from transformers import AutoTokenizer, AutoModelForCausalLM
 import torch
-from typing import Dict, List
+from typing import Any, Dict, Iterator, List, Tuple
 import logging
 import re
+import threading
+from services.model_registry import model_registry, CAUSAL_LM
+from services.prefix_cache import PrefixKVCache
+from services.batched_generation import plan_batches, generate_batch
+from services.explanation_cache import ExplanationCache
+from services.streaming_generation import stream_generate, SentenceLimiter
+from config import config
 
 logger = logging.getLogger(__name__)
 
-class QwenService:
-    def __init__(self, model_name: str = "Qwen/Qwen2.5-3B-Instruct"):
-        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-        if self.tokenizer.pad_token is None:
-            self.tokenizer.pad_token = self.tokenizer.eos_token
-        
-        self.model = AutoModelForCausalLM.from_pretrained(model_name)
-        self.model.eval()
-    
-    def generate_match_explanation(self, resume_content: str, job_description: str, match_score: float) -> str:
-        """
-        Generate an explanation for how well the resume matches the job description using Qwen
-        """
-        prompt = f"""You are an expert at analyzing resume-job matches. Explain how this resume matches the job description.
-
-Resume: {resume_content[:1000]}...
-
-Job Description: {job_description[:1000]}...
-
-Match Score: {match_score:.2f}/1.0
+# Prompts put the static instructions first and the per-candidate text last, so the
+# instruction prefix is prefilled once and its key/value states reused across calls
+EXPLANATION_PREFIX = """You are an expert at analyzing resume-job matches. Explain how this resume matches the job description.
 
 Provide a detailed explanation of:
 1. Which skills from the job description are present in the resume
@@ -33,42 +22,17 @@ Provide a detailed explanation of:
 3. How the candidate's experience aligns with the job requirements
 4. Specific recommendations for improving the match
 
-Explanation:"""
-        
-        try:
-            inputs = self.tokenizer.encode(prompt, return_tensors="pt", truncation=True, max_length=1024)
-            
-            with torch.no_grad():
-                outputs = self.model.generate(
-                    inputs, 
-                    max_length=len(inputs[0]) + 150,
-                    temperature=0.7,
-                    pad_token_id=self.tokenizer.eos_token_id,
-                    do_sample=True,
-                    num_return_sequences=1
-                )
-            
-            response = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
-            # Extract just the generated part (after the prompt)
-            explanation = response[len(prompt):].strip()
-            # Clean up the response to get a coherent explanation
-            explanation = self._clean_generated_text(explanation)
-            
-            return explanation
-        except Exception as e:
-            logger.error(f"Error generating match explanation with Qwen: {str(e)}")
-            # Fallback explanation
-            return f"The candidate shows a match score of {match_score:.2f}, indicating {'strong' if match_score > 0.7 else 'moderate' if match_score > 0.5 else 'weak'} alignment with the job requirements."
+"""
 
-    def generate_improvement_suggestions(self, resume_content: str, job_description: str) -> str:
-        """
-        Generate specific suggestions for improving the resume to better match the job
-        """
-        prompt = f"""As a career advisor, provide specific suggestions to improve this resume to better match the job description.
+EXPLANATION_SUFFIX = """Resume: {resume}...
+
+Job Description: {job}...
 
-Resume: {resume_content[:800]}...
+Match Score: {score:.2f}/1.0
+
+Explanation:"""
 
-Job Description: {job_description[:800]}...
+SUGGESTIONS_PREFIX = """As a career advisor, provide specific suggestions to improve this resume to better match the job description.
 
 Provide specific, actionable suggestions for:
 1. Skills to highlight or add
@@ -76,30 +40,225 @@ Provide specific, actionable suggestions for:
 3. Keywords to include
 4. Formatting improvements
 
+"""
+
+SUGGESTIONS_SUFFIX = """Resume: {resume}...
+
+Job Description: {job}...
+
 Suggestions:"""
+
+MAX_PROMPT_TOKENS = 1024
+# Generated text is cut at the last sentence boundary below this length
+MAX_GENERATED_CHARS = 300
+
+class QwenService:
+    def __init__(self, model_name: str = "Qwen/Qwen2.5-3B-Instruct", prefix_cache: PrefixKVCache = None,
+                 explanation_cache: ExplanationCache = None):
+        self.model_name = model_name
+        # Shares weights with the embedding backend when it uses the same model
+        self._handle = model_registry.acquire(CAUSAL_LM, model_name)
+        
+        if prefix_cache is None and config.QWEN_PREFIX_CACHE_ENABLED:
+            prefix_cache = PrefixKVCache(max_bytes=config.QWEN_PREFIX_CACHE_MAX_BYTES)
+        self.prefix_cache = prefix_cache
+        
+        if explanation_cache is None and config.EXPLANATION_CACHE_ENABLED:
+            explanation_cache = ExplanationCache(
+                config.EXPLANATION_CACHE_PATH,
+                max_entries=config.EXPLANATION_CACHE_MAX_ENTRIES,
+                ttl_seconds=config.EXPLANATION_CACHE_TTL
+            )
+        self.explanation_cache = explanation_cache
+        # Cached explanations must be what a fresh run would produce, so their decoding is greedy
+        # while caching; other generations still sample
+        self.explanation_do_sample = explanation_cache is None
+    
+    def close(self) -> None:
+        """
+        Release this service's reference to the shared model
+        """
+        self._handle.release()
+    
+    def generate_match_explanation(self, resume_content: str, job_description: str, match_score: float) -> str:
+        """
+        Generate an explanation for how well the resume matches the job description using Qwen.
+        Generation errors are raised to the caller.
+        """
+        return self.generate_match_explanations([(resume_content, job_description, match_score)])[0]
+
+    def generate_match_explanations(self, matches: List[Tuple[str, str, float]]) -> List[str]:
+        """
+        Generate explanations for many (resume content, job description, match score) triples
+        in batched generate calls, returned in input order. Pairs already in the explanation
+        cache are not generated again. Generation errors are raised, so callers can tell a
+        failure from an explanation.
+        """
+        explanations = [None] * len(matches)
+        keys = None
+        if self.explanation_cache is not None:
+            keys = [
+                self._explanation_key(resume_content, job_description, match_score)
+                for resume_content, job_description, match_score in matches
+            ]
+            cached = self.explanation_cache.get_many(keys)
+            explanations = [cached.get(key) for key in keys]
+        
+        pending = [i for i, explanation in enumerate(explanations) if explanation is None]
+        if not pending:
+            return explanations
+        
+        prompt_suffixes = [
+            self._explanation_suffix(*matches[i])
+            for i in pending
+        ]
+        
+        generated = self._generate_many(EXPLANATION_PREFIX, prompt_suffixes, max_new_tokens=150, temperature=0.7,
+                                       do_sample=self.explanation_do_sample)
+        for i, explanation in zip(pending, generated):
+            # Clean up the response to get a coherent explanation
+            explanations[i] = self._clean_generated_text(explanation)
+        
+        if keys is not None:
+            self.explanation_cache.put_many([(keys[i], explanations[i]) for i in pending if explanations[i]])
+        return explanations
+
+    def stream_match_explanation(self, resume_content: str, job_description: str, match_score: float,
+                                 cancel: threading.Event = None) -> Iterator[Dict[str, str]]:
+        """
+        Generate an explanation sentence by sentence. Yields {"event": "token", "text": ...} for
+        each complete sentence that fits the length limit, as soon as it is generated, then
+        {"event": "done", "explanation": ...} with the streamed text, or {"event": "error"} if
+        generation failed. Generation stops once the limit is reached or cancel is set.
+        """
+        key = None
+        if self.explanation_cache is not None:
+            key = self._explanation_key(resume_content, job_description, match_score)
+            cached = self.explanation_cache.get_many([key]).get(key)
+            if cached is not None:
+                yield {"event": "token", "text": cached}
+                yield {"event": "done", "explanation": cached}
+                return
+        
+        prompt_suffix = self._explanation_suffix(resume_content, job_description, match_score)
         
+        # Partial sentences are held back, so clients never see text the cleanup would drop
+        limiter = SentenceLimiter(MAX_GENERATED_CHARS)
         try:
-            inputs = self.tokenizer.encode(prompt, return_tensors="pt", truncation=True, max_length=1024)
-            
-            with torch.no_grad():
-                outputs = self.model.generate(
-                    inputs, 
-                    max_length=len(inputs[0]) + 120,
-                    temperature=0.6,
-                    pad_token_id=self.tokenizer.eos_token_id,
-                    do_sample=True,
-                    num_return_sequences=1
-                )
-            
-            response = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
-            suggestions = response[len(prompt):].strip()
-            suggestions = self._clean_generated_text(suggestions)
-            
-            return suggestions
+            with self._handle.use() as (model, tokenizer):
+                prefix_ids = tokenizer(EXPLANATION_PREFIX, return_tensors="pt")["input_ids"]
+                suffix_ids = tokenizer(
+                    prompt_suffix, return_tensors="pt", add_special_tokens=False,
+                    truncation=True, max_length=max(MAX_PROMPT_TOKENS - prefix_ids.shape[1], 1)
+                )["input_ids"]
+                input_ids = torch.cat([prefix_ids, suffix_ids], dim=1)
+                
+                past_key_values = None
+                if self.prefix_cache is not None:
+                    past_key_values = self.prefix_cache.get(model, self.model_name, prefix_ids)
+                
+                tokens = stream_generate(model, tokenizer, input_ids, max_new_tokens=150,
+                                         max_chars=MAX_GENERATED_CHARS, temperature=0.7,
+                                         do_sample=self.explanation_do_sample, past_key_values=past_key_values,
+                                         cancel=cancel)
+                for text in tokens:
+                    for sentence in limiter.feed(text):
+                        yield {"event": "token", "text": sentence}
+                    if limiter.full:
+                        # Closing the token stream stops generation
+                        tokens.close()
+                        break
+                if not limiter.full:
+                    for sentence in limiter.finish():
+                        yield {"event": "token", "text": sentence}
+        except Exception as e:
+            logger.error(f"Error streaming match explanation with Qwen: {str(e)}")
+            yield {"event": "error"}
+            return
+        
+        if cancel is not None and cancel.is_set():
+            return
+        explanation = limiter.text
+        if key is not None and explanation:
+            self.explanation_cache.put_many([(key, explanation)])
+        yield {"event": "done", "explanation": explanation}
+
+    def _explanation_key(self, resume_content: str, job_description: str, match_score: float) -> str:
+        """
+        Build the explanation cache key of one match from the prompt it is generated from
+        """
+        generation_params: Dict[str, Any] = {
+            "max_new_tokens": 150,
+            "do_sample": self.explanation_do_sample,
+            "max_prompt_tokens": MAX_PROMPT_TOKENS,
+        }
+        prompt = EXPLANATION_PREFIX + self._explanation_suffix(resume_content, job_description, match_score)
+        return ExplanationCache.make_key(prompt, self.model_name, generation_params)
+
+    @staticmethod
+    def _explanation_suffix(resume_content: str, job_description: str, match_score: float) -> str:
+        return EXPLANATION_SUFFIX.format(resume=resume_content[:1000], job=job_description[:1000], score=match_score)
+
+    def generate_improvement_suggestions(self, resume_content: str, job_description: str) -> str:
+        """
+        Generate specific suggestions for improving the resume to better match the job
+        """
+        return self.generate_improvement_suggestions_batch([(resume_content, job_description)])[0]
+
+    def generate_improvement_suggestions_batch(self, pairs: List[Tuple[str, str]]) -> List[str]:
+        """
+        Generate improvement suggestions for many (resume content, job description) pairs
+        in batched generate calls, returned in input order
+        """
+        prompt_suffixes = [
+            SUGGESTIONS_SUFFIX.format(resume=resume_content[:800], job=job_description[:800])
+            for resume_content, job_description in pairs
+        ]
+        
+        try:
+            suggestions = self._generate_many(SUGGESTIONS_PREFIX, prompt_suffixes, max_new_tokens=120, temperature=0.6)
+            return [self._clean_generated_text(suggestion) for suggestion in suggestions]
         except Exception as e:
             logger.error(f"Error generating improvement suggestions with Qwen: {str(e)}")
-            return "Consider highlighting relevant skills and experiences that directly match the job requirements."
+            return ["Consider highlighting relevant skills and experiences that directly match the job requirements."] * len(pairs)
 
+    def _generate_many(self, prompt_prefix: str, prompt_suffixes: List[str], max_new_tokens: int,
+                       temperature: float, do_sample: bool = True) -> List[str]:
+        """
+        Generate a continuation of prefix + suffix for every suffix and return only the new text,
+        in input order. Prompts are grouped into length-sorted batches sized to the token budget;
+        each batch shares the cached key/value states of the prefix and only prefills suffixes.
+        With do_sample=False decoding is greedy.
+        """
+        if not prompt_suffixes:
+            return []
+        
+        with self._handle.use() as (model, tokenizer):
+            # Tokenize the parts separately so the prefix tokens are identical on every call
+            prefix_ids = tokenizer(prompt_prefix, return_tensors="pt")["input_ids"]
+            suffix_ids = tokenizer(
+                prompt_suffixes, add_special_tokens=False,
+                truncation=True, max_length=max(MAX_PROMPT_TOKENS - prefix_ids.shape[1], 1)
+            )["input_ids"]
+            prefix = prefix_ids[0].tolist()
+            
+            results = [None] * len(prompt_suffixes)
+            batches = plan_batches(
+                [len(prefix) + len(ids) for ids in suffix_ids], max_new_tokens,
+                config.GENERATION_TOKEN_BUDGET, config.GENERATION_MAX_BATCH_SIZE
+            )
+            for indices in batches:
+                past_key_values = None
+                if self.prefix_cache is not None:
+                    past_key_values = self.prefix_cache.get(model, self.model_name, prefix_ids, batch_size=len(indices))
+                texts = generate_batch(
+                    model, tokenizer, [suffix_ids[i] for i in indices], max_new_tokens, temperature,
+                    prefix=prefix, past_key_values=past_key_values, do_sample=do_sample
+                )
+                for i, text in zip(indices, texts):
+                    results[i] = text
+        return results
+    
     def _clean_generated_text(self, text: str) -> str:
         """
         Clean up generated text to remove artifacts and make it more coherent
@@ -111,7 +270,7 @@ Suggestions:"""
         sentences = re.split(r'(?<=[.!?]) +', text)
         cleaned = ""
         for sentence in sentences:
-            if len(cleaned + sentence) < 300:  # Limit length
+            if len(cleaned + sentence) < MAX_GENERATED_CHARS:  # Limit length
                 cleaned += sentence + " "
             else:
                 break
@@ -0,0 +1,82 @@
+from typing import Any, Dict, List, Tuple
+import logging
+from services.parsing_service import ParsingService
+from nlp.skill_extractor import SkillExtractor
+from nlp.profile_extractor import ProfileExtractor
+from nlp.bonus_signals import BonusSignalEngine
+from nlp.minhash import MinHasher
+from utils.helpers import content_hash, normalize_text
+from config import config
+
+logger = logging.getLogger(__name__)
+
+class ResumeAnalyzer:
+    # Everything computed from an uploaded file before it is stored. Kept free of model imports
+    # so it can run in bulk-ingestion worker processes.
+    def __init__(self, parsing_service: ParsingService = None, skill_extractor: SkillExtractor = None,
+                 profile_extractor: ProfileExtractor = None, bonus_signals: BonusSignalEngine = None,
+                 minhasher: MinHasher = None):
+        self.parsing_service = parsing_service or ParsingService()
+        self.skill_extractor = skill_extractor or SkillExtractor()
+        self.profile_extractor = profile_extractor or ProfileExtractor()
+        self.bonus_signals = bonus_signals or BonusSignalEngine()
+        self.minhasher = minhasher or MinHasher(
+            num_perm=config.NEAR_DUPLICATE_NUM_PERM,
+            shingle_size=config.NEAR_DUPLICATE_SHINGLE_SIZE
+        )
+
+    def analyze(self, file_bytes: bytes, filename: str) -> Dict[str, Any]:
+        """
+        Parse a resume file and extract skills, the structured profile, spaCy entities and
+        keywords, bonus signals and the MinHash signature used for near-duplicate detection
+        """
+        parsed_data = self.parsing_service.parse_resume_from_bytes(file_bytes, filename)
+        return self._analyze_parsed([(filename, parsed_data)])[0]
+
+    def analyze_many(self, documents: List[Tuple[str, bytes]]) -> List[Dict[str, Any]]:
+        """
+        Analyze (filename, bytes) resume files, running spaCy over all of their texts in one
+        nlp.pipe pass. A file that fails to parse gets an error entry instead of failing the rest.
+        """
+        results: List[Dict[str, Any]] = [None] * len(documents)
+        parsed = []
+        for i, (filename, file_bytes) in enumerate(documents):
+            try:
+                parsed.append((i, filename, self.parsing_service.parse_resume_from_bytes(file_bytes, filename)))
+            except Exception as e:
+                logger.error(f"Error parsing {filename}: {str(e)}")
+                results[i] = {"filename": filename, "error": str(e)}
+
+        analyses = self._analyze_parsed([(filename, parsed_data) for _, filename, parsed_data in parsed])
+        for (i, _, _), analysis in zip(parsed, analyses):
+            results[i] = analysis
+        return results
+
+    def _analyze_parsed(self, parsed: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        contents = [parsed_data["content"] for _, parsed_data in parsed]
+        language = self.skill_extractor.analyze_bulk(contents) if contents else []
+
+        results = []
+        for (filename, parsed_data), content, language_data in zip(parsed, contents, language):
+            # Extract skills using NLP
+            skills_data = self.skill_extractor.extract_skills_from_text(content)
+
+            # Extract the structured profile once so scoring reads fields instead of raw text
+            profile = self.profile_extractor.extract(content)
+
+            results.append({
+                "filename": filename,
+                "content": content,
+                # Text-less documents (scanned or image-only PDFs) all share one hash, so they get none
+                "content_hash": content_hash(content) if normalize_text(content) else None,
+                "metadata": parsed_data["metadata"],
+                "extracted_skills": skills_data["technical_skills"] + skills_data["soft_skills"],
+                "extracted_experience": profile["experience"],
+                "extracted_education": profile["education"],
+                "extracted_certifications": profile["certifications"],
+                "extracted_keywords": language_data["keywords"],
+                "extracted_organizations": language_data["organizations"],
+                "bonus_signal_mask": self.bonus_signals.scan(content),
+                "minhash_signature": self.minhasher.signature(content),
+            })
+        return results
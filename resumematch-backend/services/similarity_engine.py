@@ -0,0 +1,148 @@
+from typing import Dict, List, Optional, Sequence, Tuple, Any
+import numpy as np
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+class SimilarityEngine:
+    # Candidates are held as one contiguous float32 matrix of pre-normalized rows,
+    # so cosine similarity reduces to a single matrix product. Meant to be kept by its
+    # owner and updated as candidates arrive, not rebuilt per query.
+    def __init__(self, candidate_embeddings: Any = None, candidate_ids: Optional[Sequence[Any]] = None):
+        # Rows [0, size) of the buffer are candidates; spare rows make appends amortized O(1)
+        self._buffer = np.empty((0, 0), dtype=np.float32)
+        self._matrix = self._buffer
+        self.candidate_ids: List[Any] = []
+        # Candidate id -> row
+        self._rows: Dict[Any, int] = {}
+        self._lock = threading.Lock()
+        if candidate_embeddings is not None:
+            self.set_candidates(candidate_embeddings, candidate_ids)
+
+    @staticmethod
+    def normalize(vectors: Any) -> np.ndarray:
+        """
+        Convert vectors to a C-contiguous float32 matrix with unit-length rows
+        """
+        matrix = np.array(vectors, dtype=np.float32, ndmin=2, order="C")
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        # Leave zero vectors as zeros instead of dividing by zero
+        norms[norms == 0] = 1.0
+        matrix /= norms
+        return matrix
+
+    @property
+    def size(self) -> int:
+        return self._matrix.shape[0]
+
+    @property
+    def matrix(self) -> np.ndarray:
+        return self._matrix
+
+    def set_candidates(self, candidate_embeddings: Any, candidate_ids: Optional[Sequence[Any]] = None) -> None:
+        """
+        Replace the candidate matrix
+        """
+        if len(candidate_embeddings) == 0:
+            with self._lock:
+                self._buffer = self._matrix = np.empty((0, 0), dtype=np.float32)
+                self.candidate_ids = []
+                self._rows = {}
+            return
+
+        matrix = self.normalize(candidate_embeddings)
+        candidate_ids = list(candidate_ids) if candidate_ids is not None else list(range(matrix.shape[0]))
+        if len(candidate_ids) != matrix.shape[0]:
+            raise ValueError("Number of candidate ids does not match number of candidate embeddings")
+        rows = {candidate_id: row for row, candidate_id in enumerate(candidate_ids)}
+        if len(rows) != len(candidate_ids):
+            raise ValueError("Candidate ids must be unique")
+        with self._lock:
+            self._buffer = self._matrix = matrix
+            self.candidate_ids = candidate_ids
+            self._rows = rows
+
+    def add_candidates(self, candidate_embeddings: Any, candidate_ids: Sequence[Any]) -> None:
+        """
+        Add candidates to the matrix, normalizing only the new rows. A candidate id that is
+        already present has its row replaced instead of being added twice.
+        """
+        vectors = self.normalize(candidate_embeddings)
+        if len(candidate_ids) != vectors.shape[0]:
+            raise ValueError("Number of candidate ids does not match number of candidate embeddings")
+
+        with self._lock:
+            size = self.size
+            if size and vectors.shape[1] != self._buffer.shape[1]:
+                raise ValueError(f"Expected embeddings of dimension {self._buffer.shape[1]}, got {vectors.shape[1]}")
+
+            # Last vector wins for ids repeated within the call
+            latest = {candidate_id: i for i, candidate_id in enumerate(candidate_ids)}
+            appended = [candidate_id for candidate_id in latest if candidate_id not in self._rows]
+            for candidate_id, i in latest.items():
+                if candidate_id in self._rows:
+                    self._buffer[self._rows[candidate_id]] = vectors[i]
+            if not appended:
+                return
+            new_rows = vectors[[latest[candidate_id] for candidate_id in appended]]
+
+            if size == 0:
+                self._buffer = new_rows
+            else:
+                if size + new_rows.shape[0] > self._buffer.shape[0]:
+                    # Grow geometrically so repeated single uploads do not copy the matrix each time
+                    capacity = max(2 * self._buffer.shape[0], size + new_rows.shape[0])
+                    buffer = np.empty((capacity, self._buffer.shape[1]), dtype=np.float32)
+                    buffer[:size] = self._matrix
+                    self._buffer = buffer
+                self._buffer[size:size + new_rows.shape[0]] = new_rows
+            # Ids go in before the rows are published, so every scored row has an id
+            for candidate_id in appended:
+                self._rows[candidate_id] = len(self.candidate_ids)
+                self.candidate_ids.append(candidate_id)
+            self._matrix = self._buffer[:len(self.candidate_ids)]
+
+    def score(self, query_embedding: Any) -> np.ndarray:
+        """
+        Score one query against every candidate with a single matrix-vector product
+        """
+        if self.size == 0:
+            return np.empty(0, dtype=np.float32)
+
+        query = self.normalize(query_embedding)[0]
+        return self._matrix @ query
+
+    def score_many(self, query_embeddings: Any) -> np.ndarray:
+        """
+        Score many queries against every candidate with a single matrix-matrix product.
+        Returns a (queries x candidates) matrix.
+        """
+        queries = self.normalize(query_embeddings)
+        if self.size == 0:
+            return np.empty((queries.shape[0], 0), dtype=np.float32)
+
+        return queries @ self._matrix.T
+
+    def top_k(self, query_embedding: Any, k: Optional[int] = None) -> List[Tuple[Any, float]]:
+        """
+        Get the k most similar candidates as (candidate id, similarity) pairs, best first
+        """
+        scores = self.score(query_embedding)
+        order = self.top_indices(scores, k)
+        return [(self.candidate_ids[i], float(scores[i])) for i in order]
+
+    @staticmethod
+    def top_indices(scores: np.ndarray, k: Optional[int] = None) -> np.ndarray:
+        """
+        Get indices of the k highest scores in descending order without a full sort
+        """
+        n = scores.shape[0]
+        if k is None or k >= n:
+            return np.argsort(-scores, kind="stable")
+
+        if k <= 0:
+            return np.empty(0, dtype=np.int64)
+
+        partition = np.argpartition(-scores, k - 1)[:k]
+        return partition[np.argsort(-scores[partition], kind="stable")]
@@ -0,0 +1,135 @@
+from typing import Dict, List, Optional, Sequence
+import logging
+import threading
+import numpy as np
+from scipy import sparse
+
+logger = logging.getLogger(__name__)
+
+class SkillMatrix:
+    def __init__(self):
+        # Canonical (lowercase) skill -> column
+        self._vocabulary: Dict[str, int] = {}
+        # Resume id -> row; removed rows are kept empty until compaction
+        self._rows: Dict[str, int] = {}
+        self._row_ids: List[Optional[str]] = []
+        self._row_columns: List[np.ndarray] = []
+        self._matrix: Optional[sparse.csr_matrix] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, resume_id: str) -> bool:
+        return resume_id in self._rows
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self._vocabulary)
+
+    def set_skills(self, resume_id: str, skills: Sequence[str]) -> None:
+        """
+        Add or replace the extracted skills of a resume
+        """
+        with self._lock:
+            columns = sorted({self._column(skill.lower()) for skill in skills})
+            row = self._rows.get(resume_id)
+            if row is None:
+                row = len(self._row_ids)
+                self._rows[resume_id] = row
+                self._row_ids.append(resume_id)
+                self._row_columns.append(np.array(columns, dtype=np.int32))
+            else:
+                self._row_columns[row] = np.array(columns, dtype=np.int32)
+            self._matrix = None
+
+    def remove(self, resume_id: str) -> bool:
+        """
+        Remove a resume from the matrix
+        """
+        with self._lock:
+            row = self._rows.pop(resume_id, None)
+            if row is None:
+                return False
+            self._row_ids[row] = None
+            self._row_columns[row] = np.empty(0, dtype=np.int32)
+            self._matrix = None
+            if len(self._row_ids) > 2 * max(len(self._rows), 1):
+                self._compact()
+            return True
+
+    def row_index(self, resume_id: str) -> Optional[int]:
+        """
+        Get the row of a resume in the arrays returned by match_counts
+        """
+        return self._rows.get(resume_id)
+
+    def match_counts(self, skills: Sequence[str]) -> np.ndarray:
+        """
+        Count, for every row at once, how many of the given skills the resume has.
+        Repeated skills count as many times as they are listed, matching per-resume scoring.
+        """
+        return self.match_counts_many([skills])[:, 0]
+
+    def match_counts_many(self, skill_lists: Sequence[Sequence[str]]) -> np.ndarray:
+        """
+        Count matches for several skill lists against one consistent snapshot of the
+        matrix, returning a (rows, len(skill_lists)) array
+        """
+        with self._lock:
+            matrix = self._build()
+            query = np.zeros((matrix.shape[1], len(skill_lists)), dtype=np.float32)
+            for i, skills in enumerate(skill_lists):
+                for skill in skills:
+                    column = self._vocabulary.get(skill.lower())
+                    if column is not None:
+                        query[column, i] += 1.0
+            # One sparse matrix product over the whole pool
+            return np.asarray(matrix @ query)
+
+    def resume_ids(self) -> List[Optional[str]]:
+        """
+        Get the resume id of each row (None for removed rows)
+        """
+        with self._lock:
+            return list(self._row_ids)
+
+    def _column(self, skill: str) -> int:
+        """
+        Get the column of a skill, growing the vocabulary for new skills. Must be called with the lock held.
+        """
+        column = self._vocabulary.get(skill)
+        if column is None:
+            column = len(self._vocabulary)
+            self._vocabulary[skill] = column
+        return column
+
+    def _build(self) -> sparse.csr_matrix:
+        """
+        Assemble the binary CSR matrix from the per-row columns. Must be called with the lock held.
+        """
+        if self._matrix is not None and self._matrix.shape[1] == len(self._vocabulary):
+            return self._matrix
+
+        lengths = np.fromiter((len(columns) for columns in self._row_columns), dtype=np.int64,
+                              count=len(self._row_columns))
+        indptr = np.zeros(len(self._row_columns) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        indices = (np.concatenate(self._row_columns) if self._row_columns
+                   else np.empty(0, dtype=np.int32))
+        data = np.ones(len(indices), dtype=np.float32)
+        self._matrix = sparse.csr_matrix(
+            (data, indices, indptr), shape=(len(self._row_columns), max(len(self._vocabulary), 1))
+        )
+        return self._matrix
+
+    def _compact(self) -> None:
+        """
+        Drop removed rows and renumber the remaining ones. Must be called with the lock held.
+        """
+        live = [(resume_id, columns) for resume_id, columns in zip(self._row_ids, self._row_columns)
+                if resume_id is not None]
+        self._row_ids = [resume_id for resume_id, _ in live]
+        self._row_columns = [columns for _, columns in live]
+        self._rows = {resume_id: row for row, resume_id in enumerate(self._row_ids)}
+        self._matrix = None
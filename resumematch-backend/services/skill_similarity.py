@@ -0,0 +1,91 @@
+from typing import Dict, Optional, Tuple
+import logging
+import threading
+import numpy as np
+from nlp.skill_taxonomy import SkillTaxonomy
+from services.embedding_service import EmbeddingService
+from services.similarity_engine import SimilarityEngine
+
+logger = logging.getLogger(__name__)
+
+class SkillSimilarityTable:
+    # Rows of the vocabulary similarity matrix computed per block, to bound peak memory
+    BLOCK_SIZE = 1024
+
+    def __init__(self, embedding_service: EmbeddingService, taxonomy: SkillTaxonomy, threshold: float = 0.75):
+        self.embedding_service = embedding_service
+        self.taxonomy = taxonomy
+        self.threshold = threshold
+
+        # (build key, skill -> {similar skill: similarity}); replaced as a whole on rebuild
+        self._snapshot: Optional[Tuple[Tuple, Dict[str, Dict[str, float]]]] = None
+        self._build_lock = threading.Lock()
+        self._build_thread: Optional[threading.Thread] = None
+        # Build key of the last failed build, so a broken model is not retried on every lookup
+        self._failed_key: Optional[Tuple] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._snapshot is not None
+
+    def neighbours(self, skill: str) -> Optional[Dict[str, float]]:
+        """
+        Get the skills similar to a canonical skill with their similarities (empty if none reach
+        the threshold), or None when the table is not built yet or the skill is not in the
+        vocabulary. Starts a background rebuild when the model or the taxonomy changed.
+        """
+        self.maybe_rebuild()
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        return snapshot[1].get(skill)
+
+    def maybe_rebuild(self) -> bool:
+        """
+        Start a background rebuild if the table is missing or stale and none is running
+        """
+        key = self._build_key()
+        snapshot = self._snapshot
+        if (snapshot is not None and snapshot[0] == key) or key == self._failed_key:
+            return False
+
+        with self._build_lock:
+            if self._build_thread is not None and self._build_thread.is_alive():
+                return False
+            self._build_thread = threading.Thread(target=self._rebuild, name="skill-similarity-build", daemon=True)
+            self._build_thread.start()
+            return True
+
+    def build(self) -> None:
+        """
+        Build the table in the calling thread
+        """
+        self._rebuild()
+
+    def _build_key(self) -> Tuple:
+        return (self.embedding_service.model_name, self.embedding_service.model_type,
+                self.taxonomy.compiled.mtime, self.threshold)
+
+    def _rebuild(self) -> None:
+        """
+        Embed the skill vocabulary and keep, for every skill, the other skills at or above the threshold
+        """
+        key = self._build_key()
+        vocabulary = sorted(self.taxonomy.compiled.entries)
+        try:
+            vectors = SimilarityEngine.normalize(self.embedding_service.encode_texts_array(vocabulary))
+        except Exception as e:
+            logger.error(f"Error building skill similarity table: {str(e)}")
+            self._failed_key = key
+            return
+
+        table: Dict[str, Dict[str, float]] = {skill: {} for skill in vocabulary}
+        for start in range(0, len(vocabulary), self.BLOCK_SIZE):
+            block = vectors[start:start + self.BLOCK_SIZE] @ vectors.T
+            rows, columns = np.nonzero(block >= self.threshold)
+            for row, column in zip(rows.tolist(), columns.tolist()):
+                if start + row != column:
+                    table[vocabulary[start + row]][vocabulary[column]] = float(block[row, column])
+
+        self._snapshot = (key, table)
+        logger.info(f"Built skill similarity table for {len(vocabulary)} skills")
@@ -0,0 +1,126 @@
+from typing import Iterator, List
+import logging
+import re
+import threading
+import torch
+from transformers import StoppingCriteria, StoppingCriteriaList, TextIteratorStreamer
+
+logger = logging.getLogger(__name__)
+
+def normalize_generated_text(text: str) -> str:
+    """
+    Apply the whitespace cleanup done before sentence truncation
+    """
+    return text.replace('\n\n', '\n').strip()
+
+class SentenceLimiter:
+    # Incremental version of the sentence-boundary truncation applied to generated text: text
+    # is fed as it is produced, and only complete sentences that fit within max_chars come out
+    def __init__(self, max_chars: int):
+        self.max_chars = max_chars
+        self.raw = ""
+        self.text = ""
+        self.full = False
+        self._sentences_seen = 0
+
+    def feed(self, chunk: str) -> List[str]:
+        """
+        Add generated text and get the sentences completed by it that fit, each prefixed
+        with its separator
+        """
+        self.raw += chunk
+        # The last piece may still grow, so it is held back until the next boundary
+        return self._take(self._split()[:-1])
+
+    def finish(self) -> List[str]:
+        """
+        Get the final sentence once generation has ended
+        """
+        return self._take(self._split())
+
+    def _split(self) -> List[str]:
+        return re.split(r'(?<=[.!?]) +', normalize_generated_text(self.raw))
+
+    def _take(self, sentences: List[str]) -> List[str]:
+        taken = []
+        for sentence in sentences[self._sentences_seen:]:
+            if self.full:
+                break
+            self._sentences_seen += 1
+            separator = " " if self.text else ""
+            # Same rule as the batch cleanup: a sentence is kept while the text stays below the limit
+            if len(self.text + separator + sentence) < self.max_chars:
+                taken.append(separator + sentence)
+                self.text += separator + sentence
+            else:
+                self.full = True
+        return taken
+
+
+class TextLimitCriteria(StoppingCriteria):
+    # Stops generation once the new text reaches the length past which sentence truncation
+    # would drop everything anyway, or when the consumer has gone away
+    def __init__(self, tokenizer, prompt_length: int, max_chars: int, cancel: threading.Event = None):
+        self.tokenizer = tokenizer
+        self.prompt_length = prompt_length
+        self.max_chars = max_chars
+        self.cancelled = threading.Event()
+        # Set by the caller, e.g. when the client disconnects
+        self.cancel = cancel
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs) -> torch.BoolTensor:
+        done = self.cancelled.is_set() or (self.cancel is not None and self.cancel.is_set())
+        if not done:
+            text = self.tokenizer.decode(input_ids[0, self.prompt_length:], skip_special_tokens=True)
+            done = len(normalize_generated_text(text)) >= self.max_chars
+        return torch.full((input_ids.shape[0],), done, dtype=torch.bool, device=input_ids.device)
+
+def stream_generate(model, tokenizer, input_ids: torch.Tensor, max_new_tokens: int, max_chars: int,
+                    temperature: float, do_sample: bool = True, past_key_values=None,
+                    cancel: threading.Event = None) -> Iterator[str]:
+    """
+    Run generate() for one prompt in a background thread and yield decoded text as tokens
+    are produced. Generation stops early at max_chars of new text, when the cancel event
+    is set, and when the caller stops iterating.
+    """
+    streamer = TextIteratorStreamer(tokenizer, skip_prompt=True, skip_special_tokens=True)
+    criteria = TextLimitCriteria(tokenizer, input_ids.shape[1], max_chars, cancel)
+
+    generate_kwargs = {}
+    if do_sample:
+        generate_kwargs["temperature"] = temperature
+    if past_key_values is not None:
+        generate_kwargs["past_key_values"] = past_key_values
+
+    errors = []
+
+    def run():
+        try:
+            with torch.no_grad():
+                model.generate(
+                    input_ids,
+                    attention_mask=torch.ones_like(input_ids),
+                    max_new_tokens=max_new_tokens,
+                    pad_token_id=tokenizer.eos_token_id,
+                    do_sample=do_sample,
+                    streamer=streamer,
+                    stopping_criteria=StoppingCriteriaList([criteria]),
+                    **generate_kwargs
+                )
+        except Exception as e:
+            errors.append(e)
+            # Unblock the consumer, which would otherwise wait for text that never comes
+            streamer.end()
+
+    thread = threading.Thread(target=run, name="streaming-generation", daemon=True)
+    thread.start()
+    try:
+        for text in streamer:
+            if text:
+                yield text
+    finally:
+        criteria.cancelled.set()
+        thread.join()
+
+    if errors:
+        raise errors[0]
@@ -0,0 +1,241 @@
+from typing import Any, Dict, List, Sequence, Tuple
+import json
+import logging
+import threading
+import faiss
+import numpy as np
+from services.similarity_engine import SimilarityEngine
+
+logger = logging.getLogger(__name__)
+
+# faiss warns when an IVF quantizer is trained on fewer points than this per list
+IVF_MIN_POINTS_PER_LIST = 39
+
+class VectorIndex:
+    def __init__(self, index_type: str = "flat", dimension: int = None, nlist: int = 100,
+                 nprobe: int = 10, hnsw_m: int = 32, ef_search: int = 64):
+        if index_type not in ("flat", "ivf", "hnsw"):
+            raise ValueError(f"Unsupported index type: {index_type}")
+
+        self.index_type = index_type
+        self.dimension = dimension
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.hnsw_m = hnsw_m
+        self.ef_search = ef_search
+
+        # faiss works with int64 labels, so resume ids are mapped to sequential labels
+        self._labels: Dict[str, int] = {}
+        self._ids: Dict[int, str] = {}
+        self._next_label = 0
+        # HNSW graphs cannot delete nodes, so removed labels are filtered out at search time
+        self._tombstones = set()
+        self._ivf_trained = False
+        self._index = None
+        self._lock = threading.RLock()
+
+        if dimension is not None:
+            self._index = self._create_index()
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def __contains__(self, resume_id: str) -> bool:
+        return resume_id in self._labels
+
+    def add(self, resume_id: str, embedding: Any) -> None:
+        """
+        Add or replace the embedding of a single resume
+        """
+        self.add_many([resume_id], [embedding])
+
+    def add_many(self, resume_ids: Sequence[str], embeddings: Any) -> None:
+        """
+        Add or replace the embeddings of several resumes
+        """
+        if len(resume_ids) == 0:
+            return
+
+        vectors = SimilarityEngine.normalize(embeddings)
+        if vectors.shape[0] != len(resume_ids):
+            raise ValueError("Number of resume ids does not match number of embeddings")
+
+        with self._lock:
+            if self._index is None:
+                self.dimension = vectors.shape[1]
+                self._index = self._create_index()
+            elif vectors.shape[1] != self.dimension:
+                raise ValueError(f"Expected embeddings of dimension {self.dimension}, got {vectors.shape[1]}")
+
+            for resume_id in resume_ids:
+                if resume_id in self._labels:
+                    self._remove_label(self._labels.pop(resume_id))
+
+            labels = np.arange(self._next_label, self._next_label + len(resume_ids), dtype=np.int64)
+            self._next_label += len(resume_ids)
+            for resume_id, label in zip(resume_ids, labels):
+                self._labels[resume_id] = int(label)
+                self._ids[int(label)] = resume_id
+
+            self._index.add_with_ids(vectors, labels)
+            self._maybe_train_ivf()
+
+    def remove(self, resume_id: str) -> bool:
+        """
+        Remove a resume from the index
+        """
+        with self._lock:
+            label = self._labels.pop(resume_id, None)
+            if label is None:
+                return False
+            self._remove_label(label)
+            return True
+
+    def search(self, query_embedding: Any, k: int = 10) -> List[Tuple[str, float]]:
+        """
+        Find the k nearest resumes as (resume id, cosine similarity) pairs, best first
+        """
+        with self._lock:
+            if self._index is None or not self._labels or k <= 0:
+                return []
+
+            query = SimilarityEngine.normalize(query_embedding)
+            # Over-fetch to make up for tombstoned entries that are still in the graph
+            fetch = min(k + len(self._tombstones), self._index.ntotal)
+            scores, labels = self._index.search(query, fetch)
+
+            results = []
+            for score, label in zip(scores[0], labels[0]):
+                if label < 0 or label in self._tombstones:
+                    continue
+                results.append((self._ids[int(label)], float(score)))
+                if len(results) == k:
+                    break
+            return results
+
+    def save(self, path: str) -> None:
+        """
+        Save the index to a local file, with the id mapping stored in a JSON sidecar
+        """
+        with self._lock:
+            if self._index is not None:
+                faiss.write_index(self._index, path)
+            metadata = {
+                "index_type": self.index_type,
+                "dimension": self.dimension,
+                "nlist": self.nlist,
+                "nprobe": self.nprobe,
+                "hnsw_m": self.hnsw_m,
+                "ef_search": self.ef_search,
+                "labels": self._labels,
+                "next_label": self._next_label,
+                "tombstones": sorted(self._tombstones),
+                "ivf_trained": self._ivf_trained,
+                "has_index": self._index is not None,
+            }
+            with open(f"{path}.meta.json", "w") as metadata_file:
+                json.dump(metadata, metadata_file)
+
+    @classmethod
+    def load(cls, path: str) -> "VectorIndex":
+        """
+        Load an index previously written with save()
+        """
+        with open(f"{path}.meta.json") as metadata_file:
+            metadata = json.load(metadata_file)
+
+        index = cls(
+            index_type=metadata["index_type"],
+            nlist=metadata["nlist"],
+            nprobe=metadata["nprobe"],
+            hnsw_m=metadata["hnsw_m"],
+            ef_search=metadata["ef_search"],
+        )
+        index.dimension = metadata["dimension"]
+        index._labels = {resume_id: int(label) for resume_id, label in metadata["labels"].items()}
+        index._ids = {label: resume_id for resume_id, label in index._labels.items()}
+        index._next_label = metadata["next_label"]
+        index._tombstones = set(metadata["tombstones"])
+        index._ivf_trained = metadata["ivf_trained"]
+        if metadata["has_index"]:
+            index._index = faiss.read_index(path)
+            index._apply_search_params()
+        return index
+
+    def _create_index(self, trained_ivf: bool = False):
+        """
+        Create an empty faiss index using inner product over normalized vectors (cosine)
+        """
+        if self.index_type == "ivf" and trained_ivf:
+            quantizer = faiss.IndexFlatIP(self.dimension)
+            index = faiss.IndexIVFFlat(quantizer, self.dimension, self.nlist, faiss.METRIC_INNER_PRODUCT)
+            # A hashtable direct map allows reconstruct and remove by arbitrary label
+            index.set_direct_map_type(faiss.DirectMap.Hashtable)
+        elif self.index_type == "hnsw":
+            index = faiss.IndexIDMap2(
+                faiss.IndexHNSWFlat(self.dimension, self.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+            )
+        else:
+            # Exact search; IVF also starts here until there is enough data to train it
+            index = faiss.IndexIDMap2(faiss.IndexFlatIP(self.dimension))
+
+        self._index = index
+        self._apply_search_params()
+        return index
+
+    def _apply_search_params(self) -> None:
+        """
+        Apply query-time parameters for approximate indexes
+        """
+        if isinstance(self._index, faiss.IndexIVF):
+            self._index.nprobe = self.nprobe
+        elif self.index_type == "hnsw":
+            faiss.downcast_index(self._index.index).hnsw.efSearch = self.ef_search
+
+    def _remove_label(self, label: int) -> None:
+        """
+        Remove a label from the underlying index. Must be called with the lock held.
+        """
+        del self._ids[label]
+        if self.index_type == "hnsw":
+            self._tombstones.add(label)
+            if len(self._tombstones) > max(len(self._labels), 1) // 4:
+                self._rebuild(self._index)
+        else:
+            self._index.remove_ids(np.array([label], dtype=np.int64))
+
+    def _all_vectors(self, index) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the labels and vectors of live entries. Must be called with the lock held.
+        """
+        labels = np.array(sorted(self._ids.keys()), dtype=np.int64)
+        vectors = np.empty((len(labels), self.dimension), dtype=np.float32)
+        for row, label in enumerate(labels):
+            vectors[row] = index.reconstruct(int(label))
+        return labels, vectors
+
+    def _rebuild(self, source_index, trained_ivf: bool = False) -> None:
+        """
+        Rebuild the index from the live entries of source_index. Must be called with the lock held.
+        """
+        labels, vectors = self._all_vectors(source_index)
+        index = self._create_index(trained_ivf=trained_ivf)
+        if trained_ivf:
+            index.train(vectors)
+        if len(labels):
+            index.add_with_ids(vectors, labels)
+        self._tombstones.clear()
+
+    def _maybe_train_ivf(self) -> None:
+        """
+        Switch from the exact staging index to a trained IVF index once there is enough data.
+        Must be called with the lock held.
+        """
+        if self.index_type != "ivf" or self._ivf_trained:
+            return
+        if len(self._labels) < self.nlist * IVF_MIN_POINTS_PER_LIST:
+            return
+
+        logger.info(f"Training IVF index with {self.nlist} lists on {len(self._labels)} vectors")
+        self._rebuild(self._index, trained_ivf=True)
+        self._ivf_trained = True
@@ -0,0 +1,78 @@
+import numpy as np
+from nlp.minhash import MinHasher
+from services.near_duplicate_index import NearDuplicateIndex
+
+# Single-word shingles make the Jaccard similarity of two windows easy to set:
+# windows of 100 words shifted by 20 share 80 (~0.67), shifted by 40 share 60 (~0.43)
+THRESHOLD = 0.55
+
+def window(start: int, length: int = 100) -> str:
+    return " ".join(f"w{i}" for i in range(start, start + length))
+
+def make_index() -> NearDuplicateIndex:
+    return NearDuplicateIndex(threshold=THRESHOLD, num_perm=128, shingle_size=1)
+
+
+def test_signature_of_empty_text_is_empty():
+    hasher = MinHasher(num_perm=64)
+    assert MinHasher.is_empty(hasher.signature(""))
+    assert MinHasher.is_empty(hasher.signature("  -- \n"))
+    assert not MinHasher.is_empty(hasher.signature("python developer"))
+
+def test_identical_text_has_identical_signature():
+    hasher = MinHasher(num_perm=64)
+    text = window(0)
+    assert MinHasher.jaccard(hasher.signature(text), hasher.signature(text)) == 1.0
+    # Signatures must be comparable across processes, so the permutations are seeded
+    assert np.array_equal(hasher.signature(text), MinHasher(num_perm=64).signature(text))
+
+def test_text_less_resumes_are_not_clustered():
+    index = make_index()
+    assert index.add("a", "") is None
+    assert index.add("b", "   ") is None
+    assert index.add("c", signature=index.hasher.signature("")) is None
+
+    assert index.representative("a") is None
+    assert index.stats()["documents"] == 0
+    assert index.group(["a", "b", "c"]) == {"a": ["a"], "b": ["b"], "c": ["c"]}
+
+def test_near_duplicates_share_a_cluster():
+    index = make_index()
+    assert index.add("a", window(20)) == "a"
+    assert index.add("b", window(40)) == "a"
+    assert index.add("unrelated", window(1000)) == "unrelated"
+
+    assert index.group(["a", "b", "unrelated"]) == {"a": ["a", "b"], "unrelated": ["unrelated"]}
+    assert index.stats()["clusters"] == 2
+
+def test_chain_does_not_bridge_clusters():
+    # a ~ b and b ~ c, but a is not similar to c
+    index = make_index()
+    index.add("a", window(20))
+    index.add("b", window(40))
+    index.add("c", window(60))
+
+    assert index.representative("b") == "a"
+    assert index.representative("c") == "c"
+    assert index.group(["a", "b", "c"]) == {"a": ["a", "b"], "c": ["c"]}
+
+def test_group_without_root_regroups_around_given_members():
+    # b and d are both near duplicates of a but not of each other
+    index = make_index()
+    index.add("a", window(20))
+    index.add("b", window(40))
+    index.add("d", window(0))
+    index.add("e", window(41))
+    assert {index.representative(resume_id) for resume_id in "bde"} == {"a"}
+
+    groups = index.group(["b", "d", "e"])
+    assert groups == {"b": ["b", "e"], "d": ["d"]}
+    # Every member is within the threshold of the resume its group is keyed by
+    for key, members in groups.items():
+        for member in members:
+            assert MinHasher.jaccard(index._signatures[key], index._signatures[member]) >= THRESHOLD
+
+def test_unknown_ids_are_their_own_group():
+    index = make_index()
+    index.add("a", window(20))
+    assert index.group(["a", "missing"]) == {"a": ["a"], "missing": ["missing"]}
@@ -0,0 +1,73 @@
+import numpy as np
+from services.skill_matrix import SkillMatrix
+
+def counts_by_id(matrix: SkillMatrix, skills):
+    counts = matrix.match_counts(skills)
+    return {resume_id: counts[matrix.row_index(resume_id)] for resume_id in matrix.resume_ids() if resume_id}
+
+
+def test_match_counts_per_resume():
+    matrix = SkillMatrix()
+    matrix.set_skills("a", ["Python", "SQL", "Docker"])
+    matrix.set_skills("b", ["python"])
+    matrix.set_skills("c", [])
+
+    assert counts_by_id(matrix, ["python", "sql"]) == {"a": 2, "b": 1, "c": 0}
+    # Skills are matched case-insensitively and unknown skills count for nothing
+    assert counts_by_id(matrix, ["DOCKER", "rust"]) == {"a": 1, "b": 0, "c": 0}
+
+def test_repeated_query_skills_count_each_time():
+    matrix = SkillMatrix()
+    matrix.set_skills("a", ["python", "python"])
+    assert counts_by_id(matrix, ["python", "python"]) == {"a": 2}
+
+def test_match_counts_many_uses_one_snapshot():
+    matrix = SkillMatrix()
+    matrix.set_skills("a", ["python", "sql"])
+    matrix.set_skills("b", ["java"])
+
+    counts = matrix.match_counts_many([["python", "java"], ["sql"], []])
+    assert counts.shape == (2, 3)
+    assert counts[matrix.row_index("a")].tolist() == [1, 1, 0]
+    assert counts[matrix.row_index("b")].tolist() == [1, 0, 0]
+
+def test_set_skills_replaces_previous_skills():
+    matrix = SkillMatrix()
+    matrix.set_skills("a", ["python"])
+    matrix.match_counts(["python"])
+    matrix.set_skills("a", ["go"])
+
+    assert len(matrix) == 1
+    assert counts_by_id(matrix, ["python"]) == {"a": 0}
+    assert counts_by_id(matrix, ["go"]) == {"a": 1}
+
+def test_removed_rows_match_nothing():
+    matrix = SkillMatrix()
+    matrix.set_skills("a", ["python"])
+    matrix.set_skills("b", ["python"])
+    matrix.set_skills("c", ["python"])
+
+    assert matrix.remove("b")
+    assert not matrix.remove("b")
+    assert "b" not in matrix
+    assert matrix.row_index("b") is None
+    assert counts_by_id(matrix, ["python"]) == {"a": 1, "c": 1}
+    assert matrix.match_counts(["python"]).sum() == 2
+
+def test_compaction_keeps_rows_consistent():
+    matrix = SkillMatrix()
+    for i in range(10):
+        matrix.set_skills(f"r{i}", [f"skill{i}", "shared"])
+    for i in range(8):
+        matrix.remove(f"r{i}")
+
+    # Removing most rows compacts the matrix and renumbers what is left
+    assert len(matrix.resume_ids()) < 10
+    assert {resume_id for resume_id in matrix.resume_ids() if resume_id is not None} == {"r8", "r9"}
+    assert counts_by_id(matrix, ["shared", "skill9"]) == {"r8": 1, "r9": 2}
+    assert np.asarray(matrix.match_counts(["skill0"])).sum() == 0
+
+def test_empty_matrix():
+    matrix = SkillMatrix()
+    assert matrix.match_counts(["python"]).shape == (0,)
+    assert matrix.match_counts_many([["python"], []]).shape == (0, 2)
@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("faiss")
+
+from services.vector_index import VectorIndex
+
+DIMENSION = 8
+
+def vectors(count: int, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).normal(size=(count, DIMENSION)).astype(np.float32)
+
+def brute_force(ids, embeddings, query, k):
+    matrix = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+    scores = matrix @ (query / np.linalg.norm(query))
+    order = np.argsort(-scores)[:k]
+    return [ids[i] for i in order], scores[order]
+
+
+@pytest.mark.parametrize("index_type", ["flat", "hnsw"])
+def test_search_returns_nearest_by_cosine(index_type):
+    ids = [f"r{i}" for i in range(50)]
+    embeddings = vectors(50)
+    index = VectorIndex(index_type=index_type)
+    index.add_many(ids, embeddings)
+    query = vectors(1, seed=1)[0]
+
+    results = index.search(query, 5)
+    expected_ids, expected_scores = brute_force(ids, embeddings, query, 5)
+    assert [resume_id for resume_id, _ in results] == expected_ids
+    assert np.allclose([score for _, score in results], expected_scores, atol=1e-5)
+
+def test_add_replaces_existing_embedding():
+    index = VectorIndex()
+    index.add("a", [1, 0, 0])
+    index.add("b", [0, 1, 0])
+    index.add("a", [0, 0, 1])
+
+    assert len(index) == 2
+    assert index.search([0, 0, 1], 1)[0][0] == "a"
+    assert index.search([1, 0, 0], 1)[0][0] != "a"
+
+@pytest.mark.parametrize("index_type", ["flat", "hnsw"])
+def test_removed_resumes_are_not_returned(index_type):
+    ids = [f"r{i}" for i in range(20)]
+    embeddings = vectors(20)
+    index = VectorIndex(index_type=index_type)
+    index.add_many(ids, embeddings)
+
+    nearest = index.search(embeddings[3], 1)[0][0]
+    assert nearest == "r3"
+    assert index.remove("r3")
+    assert not index.remove("r3")
+    assert "r3" not in index
+    assert "r3" not in [resume_id for resume_id, _ in index.search(embeddings[3], 20)]
+    assert len(index.search(embeddings[3], 20)) == 19
+
+def test_dimension_mismatch_is_rejected():
+    index = VectorIndex()
+    index.add("a", [1, 0, 0])
+    with pytest.raises(ValueError):
+        index.add("b", [1, 0])
+    with pytest.raises(ValueError):
+        index.add_many(["c", "d"], [[1, 0, 0]])
+
+def test_search_on_empty_index():
+    assert VectorIndex().search([1, 0, 0], 5) == []
+
+def test_ivf_trains_once_enough_vectors_are_added():
+    index = VectorIndex(index_type="ivf", nlist=2, nprobe=2)
+    ids = [f"r{i}" for i in range(100)]
+    embeddings = vectors(100)
+    index.add_many(ids[:50], embeddings[:50])
+    index.add_many(ids[50:], embeddings[50:])
+
+    assert index._ivf_trained
+    assert len(index) == 100
+    assert index.search(embeddings[70], 1)[0][0] == "r70"
+
+@pytest.mark.parametrize("index_type", ["flat", "hnsw"])
+def test_save_and_load_round_trip(tmp_path, index_type):
+    ids = [f"r{i}" for i in range(30)]
+    embeddings = vectors(30)
+    index = VectorIndex(index_type=index_type)
+    index.add_many(ids, embeddings)
+    index.remove("r7")
+    path = str(tmp_path / "resumes.index")
+    index.save(path)
+
+    loaded = VectorIndex.load(path)
+    query = vectors(1, seed=2)[0]
+    assert len(loaded) == 29
+    assert "r7" not in loaded
+    assert loaded.search(query, 10) == index.search(query, 10)
+
+    # Labels keep counting from where the saved index stopped
+    loaded.add("new", query)
+    assert loaded.search(query, 1)[0][0] == "new"
+
+def test_save_and_load_empty_index(tmp_path):
+    path = str(tmp_path / "empty.index")
+    VectorIndex().save(path)
+    loaded = VectorIndex.load(path)
+    assert len(loaded) == 0
+    assert loaded.search([1, 0, 0], 3) == []
@@ -1,5 +1,7 @@
 from typing import List, Dict, Any
+import hashlib
 import math
+import unicodedata
 
 
 def calculate_weighted_score(scores: Dict[str, float], weights: Dict[str, float]) -> float:
@@ -145,4 +147,19 @@ def calculate_composite_score(components: Dict[str, Dict[str, float]]) -> Dict[s
     return {
         "composite_score": raw_composite,
         "normalized_composite_score": normalized_composite
-    }
\ No newline at end of file
+    }
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text for content addressing (unicode form and whitespace)
+    """
+    text = unicodedata.normalize("NFKC", text or "")
+    return " ".join(text.split())
+
+
+def content_hash(text: str) -> str:
+    """
+    Calculate a SHA-256 hex digest of the normalized text
+    """
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()